@@ -0,0 +1,858 @@
+#!/usr/bin/env python3
+
+import argparse
+import json
+import os
+import pickle
+import platform
+import random
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import generate_docs as gd  # noqa: E402
+
+
+# --- Synthetic sources ---
+
+def read_seed(path: Path) -> str:
+    # Repo files used as benchmark seeds; a missing one falls back to synthetic input
+    try:
+        return path.read_text(encoding="utf-8", errors="replace")
+    except OSError:
+        return ""
+
+
+def synth_ts_exports(count: int) -> str:
+    parts: List[str] = []
+    for i in range(count):
+        variant = i % 4
+        if variant == 0:
+            parts.append(f"/**\n * Computes value {i}.\n */\nexport function compute{i}(a: number): number {{\n  return a + {i};\n}}\n")
+        elif variant == 1:
+            parts.append(f"// Constant {i}\nexport const value{i} = {i};\n")
+        elif variant == 2:
+            parts.append(f"export interface shape{i} {{\n  id: number;\n}}\n")
+        else:
+            parts.append(f"export type alias{i} = string | number;\n")
+    return "\n".join(parts)
+
+
+def scaled_repo_ts(target_bytes: int) -> str:
+    # The repo's own package entry points, repeated until the source reaches target_bytes
+    seed = "\n".join(
+        read_seed(p) for p in sorted(gd.REPO_ROOT.glob("packages/*/src/index.ts"))
+    )
+    if not seed:
+        seed = synth_ts_exports(100)
+    return seed * max(1, target_bytes // len(seed))
+
+
+# Pre-single-pass extraction: one finditer over the whole file per export form
+LEGACY_JS_EXPORT_PATTERNS = [
+    re.compile(r"^\s*export\s+(?:async\s+)?function\s+([A-Za-z0-9_$]+)\s*\(", re.MULTILINE),
+    re.compile(r"^\s*export\s+class\s+([A-Za-z0-9_$]+)\b", re.MULTILINE),
+    re.compile(r"^\s*export\s+const\s+([A-Za-z0-9_$]+)\s*=", re.MULTILINE),
+    re.compile(r"^\s*export\s+let\s+([A-Za-z0-9_$]+)\s*=", re.MULTILINE),
+    re.compile(r"^\s*export\s+var\s+([A-Za-z0-9_$]+)\s*=", re.MULTILINE),
+    re.compile(r"^\s*export\s+type\s+([A-Za-z0-9_$]+)\b", re.MULTILINE),
+    re.compile(r"^\s*export\s+interface\s+([A-Za-z0-9_$]+)\b", re.MULTILINE),
+    re.compile(r"^\s*export\s+enum\s+([A-Za-z0-9_$]+)\b", re.MULTILINE),
+    re.compile(r"^\s*export\s+default\s+(?:function\s+)?([A-Za-z0-9_$]*)", re.MULTILINE),
+    re.compile(r"^\s*export\s*\{([^}]+)\}\s*(?:from\s*['\"][^'\"]+['\"])?:?", re.MULTILINE),
+    re.compile(r"^\s*export\s+\*\s+from\s+['\"][^'\"]+['\"];?", re.MULTILINE),
+    re.compile(r"module\.exports\s*=\s*\{([^}]+)\}", re.MULTILINE),
+    re.compile(r"exports\.([A-Za-z0-9_$]+)\s*=", re.MULTILINE),
+]
+
+
+def legacy_scan(source: str) -> int:
+    return sum(1 for pattern in LEGACY_JS_EXPORT_PATTERNS for _ in pattern.finditer(source))
+
+
+def single_pass_scan(source: str) -> int:
+    return sum(1 for _ in gd._iter_js_export_matches(source))
+
+
+def scaled_studio_page(copies: int) -> Tuple[str, List[str]]:
+    # apps/web/app/studio/page.tsx repeated with a distinct component name per copy
+    page = read_seed(gd.REPO_ROOT / "apps/web/app/studio/page.tsx")
+    names = [f"StudioPage{i}" for i in range(copies)]
+    return "\n".join(page.replace("StudioPage", name) for name in names), names
+
+
+# Pre-index component detection: three fresh regexes and full-file lazy scans per export
+def legacy_is_react_component(source: str, name: str) -> bool:
+    if not name or not name[0].isupper():
+        return False
+    pattern_func = re.compile(rf"\bfunction\s+{re.escape(name)}\b[\s\S]*?return\s*\(\s*<", re.MULTILINE)
+    pattern_const_arrow = re.compile(rf"\b{re.escape(name)}\s*=\s*\(.*?\)\s*=>[\s\S]*?return\s*\(\s*<", re.MULTILINE)
+    pattern_type = re.compile(rf"\b{re.escape(name)}\s*:\s*React\.FC|JSX\.Element|ReactElement")
+    return bool(pattern_func.search(source) or pattern_const_arrow.search(source) or pattern_type.search(source))
+
+
+def synth_modules(count: int, items_per_module: int = 20) -> List[gd.ModuleDoc]:
+    # In-memory modules under a path inside the repo; rendering never touches the filesystem
+    modules: List[gd.ModuleDoc] = []
+    for m in range(count):
+        items = [
+            gd.ApiItem("function", f"fn{m}_{i}", f"export function fn{m}_{i}(a: number): number {{", i * 3 + 1, f"Does thing {i}.")
+            for i in range(items_per_module)
+        ]
+        modules.append(gd.ModuleDoc("typescript", gd.REPO_ROOT / "bench" / f"pkg{m % 50}" / f"mod{m}.ts", items))
+    return modules
+
+
+def legacy_render_single_file(modules: List[gd.ModuleDoc]) -> str:
+    # Pre-streaming API_FULL.md: one list of module strings joined into a single document
+    lines: List[str] = [gd.generate_index_markdown(modules, False, gd.REPO_ROOT)]
+    for mod in sorted(modules, key=lambda m: m.file_path.as_posix()):
+        lines.append("\n---\n")
+        lines.append(gd.generate_module_markdown(mod, gd.REPO_ROOT))
+    return "\n".join(lines)
+
+
+@dataclass
+class LegacyApiItem:
+    # Pre-compaction ApiItem: a __dict__ per item and the declaration line copied into signature
+    kind: str
+    name: str
+    signature: str
+    line_number: int
+    description: Optional[str] = None
+
+
+@dataclass
+class LegacyModuleDoc:
+    language: str
+    file_path: Path
+    items: List[LegacyApiItem]
+
+
+MARKDOWN_MODULE = re.compile(r"^# `(?P<module>[^`]+)`$")
+MARKDOWN_ITEM = re.compile(r"^## (?P<kind>[^:]+): `(?P<name>[^`]*)`$")
+
+
+def legacy_scrape_markdown(text: str) -> Dict[str, Dict[str, List[Dict]]]:
+    # What consumers had to do before --format json: walk API_FULL.md line by line
+    index: Dict[str, Dict[str, List[Dict]]] = {"by_name": {}, "by_module": {}, "by_kind": {}}
+    module = None
+    record: Optional[Dict] = None
+    state = ""
+    desc: List[str] = []
+    for line in text.split("\n"):
+        m = MARKDOWN_MODULE.match(line)
+        if m:
+            module = m.group("module")
+            continue
+        m = MARKDOWN_ITEM.match(line)
+        if m:
+            record = {"module": module, "kind": m.group("kind"), "name": m.group("name"), "signature": None}
+            index["by_name"].setdefault(record["name"], []).append(record)
+            index["by_module"].setdefault(module, []).append(record)
+            index["by_kind"].setdefault(record["kind"], []).append(record)
+            state, desc = "desc", []
+            continue
+        if record is None:
+            continue
+        if state == "desc":
+            if line == "Signature:":
+                record["description"] = "\n".join(desc).strip() or None
+                state = "sig"
+            else:
+                desc.append(line)
+        elif state == "sig" and line != "```":
+            record["signature"] = line
+            state = ""
+    return index
+
+
+def _peak_traced(fn: Callable[[], object]) -> int:
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+# --- Synthetic monorepo ---
+
+# Share of files per extension in a generated repo
+SYNTH_LANGUAGE_MIX = [(".ts", 40), (".tsx", 15), (".py", 15), (".go", 10), (".rs", 10), (".java", 10)]
+
+
+def _synth_ts(rng: random.Random, idx: int, imports: List[str], tsx: bool) -> str:
+    lines = [f"import {{ helper{i} }} from '{spec}';" for i, spec in enumerate(imports)]
+    if tsx:
+        lines.append("import React from 'react';")
+    lines.append("")
+    for e in range(rng.randint(5, 30)):
+        if rng.random() < 0.6:
+            lines += ["/**", f" * Entry {e} of module {idx}.", " *", " * @param input value to transform", " */"]
+        elif rng.random() < 0.3:
+            lines.append(f"// Entry {e} of module {idx}")
+        form = rng.randrange(6)
+        if tsx and e % 3 == 0:
+            lines += [f"export function Widget{idx}_{e}({{ label }}: {{ label: string }}) {{", "  return (", "    <div className=\"widget\">{label}</div>", "  );", "}"]
+        elif form == 0:
+            lines += [f"export function fn{idx}_{e}(input: number): number {{", f"  return input * {e};", "}"]
+        elif form == 1:
+            lines.append(f"export const value{idx}_{e} = {e};")
+        elif form == 2:
+            lines += [f"export interface Shape{idx}_{e} {{", "  id: string;", "  size: number;", "}"]
+        elif form == 3:
+            lines.append(f"export type Alias{idx}_{e} = string | number;")
+        elif form == 4:
+            lines += [f"export class Service{idx}_{e} {{", "  run(): void {}", "}"]
+        else:
+            lines.append(f"const local{e} = {e};")
+            lines.append(f"export {{ local{e} as exported{idx}_{e} }};")
+        lines.append("")
+    return "\n".join(lines) + "\n"
+
+
+def _synth_py(rng: random.Random, idx: int, imports: List[str]) -> str:
+    lines = [f"from {spec} import helper{i}" for i, spec in enumerate(imports)]
+    lines.append("")
+    for e in range(rng.randint(3, 15)):
+        if rng.random() < 0.5:
+            lines += [f"def func_{idx}_{e}(value: int, *, scale: float = 1.0) -> float:", f'    """Scale value for entry {e}."""', "    return value * scale", ""]
+        else:
+            lines += [f"class Model{idx}_{e}:", f'    """Model {e}."""', "", "    def method(self) -> None:", "        pass", ""]
+    return "\n".join(lines) + "\n"
+
+
+def _synth_go(rng: random.Random, idx: int) -> str:
+    lines = [f"package pkg{idx}", ""]
+    for e in range(rng.randint(3, 15)):
+        lines.append(f"// Func{e} does work number {e}.")
+        if e % 3 == 0:
+            lines += [f"type Record{e} struct {{", "\tID string", "}"]
+        else:
+            lines += [f"func Func{e}(x int) int {{", "\treturn x", "}"]
+        lines.append("")
+    return "\n".join(lines) + "\n"
+
+
+def _synth_rs(rng: random.Random, idx: int) -> str:
+    lines: List[str] = []
+    for e in range(rng.randint(3, 15)):
+        lines.append(f"/// Item {e} of crate module {idx}.")
+        lines += [f"pub fn item_{e}(x: u32) -> u32 {{", "    x", "}"] if e % 2 else [f"pub struct Item{e} {{", "    id: u32,", "}"]
+        lines.append("")
+    return "\n".join(lines) + "\n"
+
+
+def _synth_java(rng: random.Random, idx: int) -> str:
+    lines = [f"package bench.pkg{idx};", "", "/**", f" * Class {idx}.", " */", f"public class Class{idx} {{"]
+    for e in range(rng.randint(3, 15)):
+        lines += ["    /**", f"     * Method {e}.", "     */", f"    public int method{e}(int x) {{", "        return x;", "    }", ""]
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+
+def synth_monorepo(root: Path, files: int, packages: int = 20, seed: int = 1) -> int:
+    # Writes a repo of `files` sources spread over packages/pkgNN/src with a tsconfig `paths`
+    # alias. Each module imports up to four earlier modules of its language, which gives deep
+    # import chains. Returns the total source size in bytes.
+    rng = random.Random(seed)
+    root.mkdir(parents=True, exist_ok=True)
+    tsconfig = {"compilerOptions": {"baseUrl": ".", "paths": {"@bench/*": ["packages/*/src"]}}}
+    (root / "tsconfig.json").write_text(json.dumps(tsconfig, indent=2), encoding="utf-8")
+    extensions = [ext for ext, weight in SYNTH_LANGUAGE_MIX for _ in range(weight)]
+    previous: Dict[str, List[Tuple[str, int]]] = {}
+    index_dirs = set()
+    total = 0
+    for idx in range(files):
+        ext = rng.choice(extensions)
+        pkg = f"pkg{idx % packages:02d}"
+        depth = "/".join(f"d{rng.randrange(3)}" for _ in range(rng.randrange(3)))
+        rel_dir = f"packages/{pkg}/src" + (f"/{depth}" if depth else "")
+        family = "js" if ext in (".ts", ".tsx") else ext
+        earlier = previous.setdefault(family, [])
+        picks = rng.sample(earlier, min(len(earlier), rng.randint(0, 4)))
+        if family == "js":
+            specs = []
+            for target, _ in picks:
+                if target.startswith(f"packages/{pkg}/"):
+                    specs.append(os.path.relpath(target, rel_dir).replace(os.sep, "/"))
+                    if not specs[-1].startswith("."):
+                        specs[-1] = "./" + specs[-1]
+                else:
+                    target_pkg = target.split("/")[1]
+                    specs.append(f"@bench/{target_pkg}" if target.endswith("/src/index") else "../" * (rel_dir.count("/") + 1) + target)
+            name = f"mod{idx}"
+            if not depth and rel_dir not in index_dirs and rng.random() < 0.05:
+                name = "index"
+                index_dirs.add(rel_dir)
+            text = _synth_ts(rng, idx, specs, ext == ".tsx")
+        elif ext == ".py":
+            specs = [target.replace("/", ".") for target, _ in picks]
+            name, text = f"mod{idx}", _synth_py(rng, idx, specs)
+        elif ext == ".go":
+            name, text = f"mod{idx}", _synth_go(rng, idx)
+        elif ext == ".rs":
+            name, text = f"mod{idx}", _synth_rs(rng, idx)
+        else:
+            name, text = f"Class{idx}", _synth_java(rng, idx)
+        out = root / rel_dir / (name + ext)
+        out.parent.mkdir(parents=True, exist_ok=True)
+        data = text.encode("utf-8")
+        out.write_bytes(data)
+        total += len(data)
+        earlier.append((f"{rel_dir}/{name}", idx))
+    return total
+
+
+# --- Helpers ---
+
+def _time_call(fn: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _print_scaling(rows: List[Tuple[int, int, float]]) -> None:
+    print(f"{'exports':>10} {'bytes':>12} {'seconds':>10} {'us/export':>10}")
+    for count, size, secs in rows:
+        print(f"{count:>10} {size:>12} {secs:>10.4f} {secs / count * 1e6:>10.2f}")
+    if len(rows) > 1:
+        first, last = rows[0], rows[-1]
+        growth = (last[2] / first[2]) / (last[0] / first[0])
+        print(f"time growth relative to input growth: {growth:.2f}x (1.00x is linear)")
+
+
+# --- Benchmarks ---
+
+def bench_line_index(sizes: List[int], repeat: int) -> None:
+    rows: List[Tuple[int, int, float]] = []
+    for count in sizes:
+        source = synth_ts_exports(count)
+        secs = _time_call(lambda: gd.extract_js_ts_exports(source), repeat)
+        rows.append((count, len(source), secs))
+    _print_scaling(rows)
+
+
+def bench_c_style(files_list: List[int], repeat: int) -> None:
+    # Go/Rust/Java single-pass scanners on concatenations of synthetic files
+    for language, synth in (("go", _synth_go), ("rust", _synth_rs), ("java", _synth_java)):
+        print(language)
+        rows: List[Tuple[int, int, float]] = []
+        for files in files_list:
+            rng = random.Random(files)
+            source = "\n".join(synth(rng, idx) for idx in range(files))
+            extract = gd.LANGUAGES.get(language).extract
+            secs = _time_call(lambda: extract(source), repeat)
+            rows.append((len(extract(source)), len(source), secs))
+        _print_scaling(rows)
+
+
+# Imports the generator in a fresh interpreter, then loads the named backends; prints
+# "<import seconds> <load seconds>"
+_STARTUP_PROBE = """
+import sys, time
+sys.path.insert(0, sys.argv[1])
+t0 = time.perf_counter()
+import generate_docs as gd
+t1 = time.perf_counter()
+for name in sys.argv[2:]:
+    gd.LANGUAGES.get(name)
+print(t1 - t0, time.perf_counter() - t1)
+"""
+
+
+def bench_startup(repeat: int) -> None:
+    # Module import plus backend loading per language, each in a fresh process; "all" is what
+    # every run paid before backends were loaded lazily
+    names = sorted(gd.LANGUAGES.factories)
+    script_dir = str(Path(__file__).resolve().parent)
+    print(f"{'backends':>12} {'import ms':>10} {'load ms':>8} {'total ms':>9}")
+    for label, selected in [("none", [])] + [(n, [n]) for n in names] + [("all", names)]:
+        best: Optional[Tuple[float, float]] = None
+        for _ in range(repeat):
+            out = subprocess.run(
+                [sys.executable, "-c", _STARTUP_PROBE, script_dir, *selected], check=True, capture_output=True, text=True
+            ).stdout.split()
+            sample = (float(out[0]), float(out[1]))
+            if best is None or sum(sample) < sum(best):
+                best = sample
+        print(f"{label:>12} {best[0] * 1000:>10.1f} {best[1] * 1000:>8.1f} {sum(best) * 1000:>9.1f}")
+
+
+def bench_export_scan(sizes_kb: List[int], repeat: int) -> None:
+    print(f"{'KB':>8} {'matches':>9} {'legacy s':>10} {'single s':>10} {'speedup':>8}")
+    for kb in sizes_kb:
+        source = scaled_repo_ts(kb * 1024)
+        matches = single_pass_scan(source)
+        legacy = _time_call(lambda: legacy_scan(source), repeat)
+        single = _time_call(lambda: single_pass_scan(source), repeat)
+        print(f"{len(source) // 1024:>8} {matches:>9} {legacy:>10.4f} {single:>10.4f} {legacy / single:>7.1f}x")
+
+
+def _indexed_lookups(source: str, names: List[str]) -> List[bool]:
+    components = gd._react_component_index(source)
+    return [n in components for n in names]
+
+
+def bench_react_index(copies_list: List[int], repeat: int) -> None:
+    print(f"{'components':>10} {'KB':>8} {'legacy s':>10} {'index s':>10} {'speedup':>8}")
+    for copies in copies_list:
+        source, names = scaled_studio_page(copies)
+        legacy = _time_call(lambda: [legacy_is_react_component(source, n) for n in names], repeat)
+        indexed = _time_call(lambda: _indexed_lookups(source, names), repeat)
+        print(f"{copies:>10} {len(source) // 1024:>8} {legacy:>10.4f} {indexed:>10.4f} {legacy / indexed:>7.1f}x")
+
+
+def bench_render_memory(counts: List[int]) -> None:
+    print(f"{'modules':>8} {'output MB':>10} {'legacy peak MB':>15} {'stream peak MB':>15}")
+    with tempfile.TemporaryDirectory() as tmp:
+        out = Path(tmp) / "API_FULL.md"
+        for count in counts:
+            modules = synth_modules(count)
+            legacy = _peak_traced(lambda: legacy_render_single_file(modules))
+            streamed = _peak_traced(lambda: gd.write_single_file(modules, gd.REPO_ROOT, out))
+            size_mb = out.stat().st_size / 2**20
+            print(f"{count:>8} {size_mb:>10.1f} {legacy / 2**20:>15.1f} {streamed / 2**20:>15.1f}")
+
+
+def _retained_traced(fn: Callable[[], object]) -> Tuple[int, object]:
+    # Bytes still allocated once fn() returns, with its result kept alive
+    tracemalloc.start()
+    try:
+        kept = fn()
+        return tracemalloc.get_traced_memory()[0], kept
+    finally:
+        tracemalloc.stop()
+
+
+def bench_item_memory(files: int, jobs: int, seed: int) -> None:
+    # Extracts a synthetic monorepo, then loads the documented modules the way they arrive from
+    # worker processes (one pickle per chunk of files) in the legacy and the compact form
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "repo"
+        synth_monorepo(root, files, seed=seed)
+        paths = gd.discover_source_files(root)
+        modules = [
+            gd.ModuleDoc(r.language, r.file_path, r.items)
+            for r in gd.extract_files(paths, jobs)
+            if r is not None and r.items
+        ]
+        legacy = []
+        for mod in modules:
+            legacy.append(LegacyModuleDoc(mod.language, mod.file_path, [
+                LegacyApiItem(it.kind, it.name, it.signature, it.line_number, it.description)
+                for it in mod.items
+            ]))
+        chunk = 64
+        compact_blobs = [pickle.dumps(modules[i:i + chunk]) for i in range(0, len(modules), chunk)]
+        legacy_blobs = [pickle.dumps(legacy[i:i + chunk]) for i in range(0, len(legacy), chunk)]
+        del modules, legacy
+        items = 0
+        results = []
+        for name, blobs in (("legacy", legacy_blobs), ("compact", compact_blobs)):
+            size, kept = _retained_traced(lambda: [m for blob in blobs for m in pickle.loads(blob)])
+            items = sum(len(m.items) for m in kept)
+            results.append((name, size))
+            del kept
+    print(f"{len(paths)} files, {items} items")
+    print(f"{'storage':>8} {'retained MB':>12} {'bytes/item':>11}")
+    for name, size in results:
+        print(f"{name:>8} {size / 2**20:>12.1f} {size / max(items, 1):>11.0f}")
+    print(f"compact/legacy: {results[1][1] / results[0][1]:.2f}")
+
+
+def bench_json_load(counts: List[int], repeat: int) -> None:
+    print(f"{'items':>8} {'md MB':>7} {'ndjson MB':>10} {'scrape md s':>12} {'load json s':>12} {'load ndjson s':>14} {'speedup':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        md_path, json_path, ndjson_path = Path(tmp) / "API_FULL.md", Path(tmp) / "API.json", Path(tmp) / "API.ndjson"
+        for count in counts:
+            modules = synth_modules(count)
+            writer = gd.OutputWriter()
+            gd.write_single_file(modules, gd.REPO_ROOT, md_path, writer)
+            writer.write_chunks(json_path, gd.iter_json(modules, [], gd.REPO_ROOT))
+            writer.write_chunks(ndjson_path, gd.iter_ndjson(modules, [], gd.REPO_ROOT))
+            items = sum(len(m.items) for m in modules)
+            scrape = _time_call(lambda: legacy_scrape_markdown(md_path.read_text(encoding="utf-8")), repeat)
+            load_json = _time_call(lambda: gd.load_api_index(json_path), repeat)
+            load_ndjson = _time_call(lambda: gd.load_api_index(ndjson_path), repeat)
+            print(
+                f"{items:>8} {md_path.stat().st_size / 2**20:>7.1f} {ndjson_path.stat().st_size / 2**20:>10.1f} "
+                f"{scrape:>12.4f} {load_json:>12.4f} {load_ndjson:>14.4f} {scrape / load_json:>7.1f}x"
+            )
+
+
+def bench_search(counts: List[int], queries: int) -> None:
+    print(f"{'items':>8} {'index MB':>9} {'build s':>8} {'load s':>8} {'query ms':>9} {'hits/q':>7}")
+    rng = random.Random(7)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / gd.SEARCH_INDEX_FILE
+        for count in counts:
+            modules = synth_modules(count)
+            build = _time_call(lambda: gd.write_search_index(modules, gd.REPO_ROOT, path, gd.OutputWriter(), split=True), 1)
+            load = _time_call(lambda: gd.SearchIndex.load(path), 1)
+            index = gd.SearchIndex.load(path)
+            names = [it.name for m in modules for it in m.items]
+            # Exact names, name prefixes, substrings and description words
+            picks = [rng.choice(names) for _ in range(queries)]
+            terms = [p if i % 4 == 0 else p[:4] if i % 4 == 1 else p[2:-1] if i % 4 == 2 else "thing"
+                     for i, p in enumerate(picks)]
+            start = time.perf_counter()
+            hits = sum(len(index.search(q)) for q in terms)
+            per_query = (time.perf_counter() - start) / len(terms) * 1000
+            items = len(names)
+            print(f"{items:>8} {path.stat().st_size / 2**20:>9.1f} {build:>8.3f} {load:>8.3f} {per_query:>9.3f} {hits / len(terms):>7.1f}")
+
+
+@contextmanager
+def _io_latency(seconds: float) -> Iterator[None]:
+    # Emulates a network filesystem or cold cache: every source read and every page write
+    # blocks for `seconds` before touching the disk
+    read_source, write = gd.read_source, gd.OutputWriter.write
+
+    def slow_read(*args, **kwargs):
+        time.sleep(seconds)
+        return read_source(*args, **kwargs)
+
+    def slow_write(self, *args, **kwargs):
+        time.sleep(seconds)
+        return write(self, *args, **kwargs)
+
+    gd.read_source, gd.OutputWriter.write = slow_read, slow_write
+    try:
+        yield
+    finally:
+        gd.read_source, gd.OutputWriter.write = read_source, write
+
+
+STALL_MARKER = "docsgen-bench-stall"
+
+
+@contextmanager
+def _stalled_extractor(seconds: float) -> Iterator[None]:
+    # TypeScript files containing STALL_MARKER hold the extractor for `seconds`, like a regex
+    # that backtracks catastrophically. Forked workers inherit the patched backend.
+    backend = gd.LANGUAGES.get("typescript")
+    extract_module = backend.extract_module
+
+    def stalled(index: gd.SourceIndex):
+        if STALL_MARKER in index.source:
+            time.sleep(seconds)
+        return extract_module(index)
+
+    backend.extract_module = stalled
+    try:
+        yield
+    finally:
+        del backend.extract_module
+
+
+def bench_file_timeout(files: int, stalled: int, stall: float, budgets: List[float], jobs: int, seed: int) -> None:
+    # Extraction wall time of a clean repo and of the same repo plus `stalled` files, without
+    # a budget and under each --file-timeout budget
+    print(f"{'budget s':>8} {'clean s':>8} {'stalled s':>10} {'timeouts':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "repo"
+        synth_monorepo(root, files, seed=seed)
+        clean = gd.discover_source_files(root)
+        for i in range(stalled):
+            (root / f"stalled{i}.ts").write_text(f"// {STALL_MARKER}\nexport const stalled{i} = {i};\n", encoding="utf-8")
+        paths = gd.discover_source_files(root)
+        with _stalled_extractor(stall):
+            for budget in [0.0, *budgets]:
+                clean_secs = _time_call(lambda: gd.extract_files(clean, jobs, timeout=budget), 1)
+                start = time.perf_counter()
+                results = gd.extract_files(paths, jobs, timeout=budget)
+                stalled_secs = time.perf_counter() - start
+                timeouts = sum(1 for r in results if r is not None and r.skipped == "timeout")
+                label = f"{budget:g}" if budget else "none"
+                print(f"{label:>8} {clean_secs:>8.3f} {stalled_secs:>10.3f} {timeouts:>9}")
+
+
+def bench_pipeline(files: int, latencies_ms: List[float], queue: int, seed: int) -> None:
+    # Full runs (split pages only, no cache) in phases vs --pipeline under emulated I/O latency
+    print(f"{'latency ms':>10} {'phased s':>9} {'pipeline s':>11} {'speedup':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "repo"
+        synth_monorepo(root, files, seed=seed)
+        for latency in latencies_ms:
+            times = []
+            for extra in ([], ["--pipeline", "--pipeline-queue", str(queue)]):
+                output_dir = Path(tmp) / "docs"
+                shutil.rmtree(output_dir, ignore_errors=True)
+                argv = ["generate_docs.py", "--root", str(root), "--output-dir", str(output_dir), "--format", "split", "--no-cache", *extra]
+                saved_argv, sys.argv = sys.argv, argv
+                try:
+                    with _io_latency(latency / 1000):
+                        start = time.perf_counter()
+                        gd.main()
+                        times.append(time.perf_counter() - start)
+                finally:
+                    sys.argv = saved_argv
+            print(f"{latency:>10.1f} {times[0]:>9.3f} {times[1]:>11.3f} {times[0] / times[1]:>7.1f}x")
+
+
+def synth_barrels(root: Path) -> int:
+    # Adds a barrel (packages/pkgNN/src/api.ts) per package of a synth_monorepo tree: every
+    # other TS module is re-exported with `export *`, the rest by name (half of them aliased).
+    # A root index.ts re-exports every barrel. Returns the number of re-exported modules.
+    barrels: List[str] = []
+    count = 0
+    for src in sorted((root / "packages").glob("*/src")):
+        lines: List[str] = []
+        for i, fp in enumerate(sorted(src.rglob("*.ts*"))):
+            spec = "./" + fp.relative_to(src).with_suffix("").as_posix()
+            if i % 2 == 0:
+                lines.append(f"export * from '{spec}';")
+            else:
+                items = gd.extract_js_ts_exports(fp.read_text(encoding="utf-8"))
+                names = [it.name for it in items if it.kind not in ("default", "re-export")][:4]
+                if not names:
+                    continue
+                entries = [f"{n} as {n}Alias" if j % 2 else n for j, n in enumerate(names)]
+                lines.append(f"export {{ {', '.join(entries)} }} from '{spec}';")
+            count += 1
+        (src / "api.ts").write_text("\n".join(lines) + "\n", encoding="utf-8")
+        barrels.append(f"export * from './{src.relative_to(root).as_posix()}/api';")
+    (root / "index.ts").write_text("\n".join(barrels) + "\n", encoding="utf-8")
+    return count
+
+
+def bench_reexports(files: int, repeat: int, seed: int) -> None:
+    # Full single-file runs (no cache) of a monorepo with barrels, keeping re-exports as items
+    # vs linking them to their definitions
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "repo"
+        synth_monorepo(root, files, seed=seed)
+        linked = synth_barrels(root)
+        print(f"{files} files, {linked} modules re-exported from barrels")
+        print(f"{'mode':>8} {'seconds':>9} {'API_FULL bytes':>15} {'items':>8}")
+        for label, extra in (("items", ["--no-link-reexports"]), ("linked", [])):
+            output_dir = Path(tmp) / "docs"
+            argv = ["generate_docs.py", "--root", str(root), "--output-dir", str(output_dir), "--format", "single", "--no-cache", *extra]
+            saved_argv, sys.argv = sys.argv, argv
+            try:
+                secs = _time_call(gd.main, repeat)
+            finally:
+                sys.argv = saved_argv
+            full = output_dir / "API_FULL.md"
+            text = full.read_text(encoding="utf-8")
+            print(f"{label:>8} {secs:>9.3f} {full.stat().st_size:>15} {text.count(chr(10) + '## ') - text.count(chr(10) + '## Re-exports'):>8}")
+
+
+def run_suite(root: Path, total_bytes: int, jobs: int, repeat: int) -> Dict[str, Dict[str, float]]:
+    # Times each pipeline stage separately on an existing synthetic repo; best of `repeat`
+    output_dir = root.parent / (root.name + "-docs")
+    best: Dict[str, float] = {}
+    counts: Dict[str, int] = {}
+    for _ in range(repeat):
+        shutil.rmtree(output_dir, ignore_errors=True)
+        timings: Dict[str, float] = {}
+
+        start = time.perf_counter()
+        files = gd.discover_source_files(root)
+        timings["discover"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        results = gd.extract_files(files, jobs)
+        timings["extract"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        resolver = gd.ImportResolver(files, root)
+        modules: List[gd.ModuleDoc] = []
+        edges: List[Tuple[Path, Path]] = []
+        for res in results:
+            if res is None or not res.items:
+                continue
+            modules.append(gd.ModuleDoc(res.language, res.file_path, res.items))
+            edges.extend((res.file_path, t) for t in resolver.resolve_all(res.file_path, res.imports))
+        timings["resolve"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        gd.write_outputs(modules, edges, root, output_dir, "both", gd.OutputWriter())
+        timings["render"] = time.perf_counter() - start
+
+        for stage, secs in timings.items():
+            best[stage] = min(best.get(stage, float("inf")), secs)
+        counts = {"files": len(files), "modules": len(modules), "items": sum(len(m.items) for m in modules), "edges": len(edges)}
+    shutil.rmtree(output_dir, ignore_errors=True)
+    mb = total_bytes / 2**20
+    stages = {
+        stage: {"seconds": round(secs, 6), "files_per_sec": round(counts["files"] / secs, 1), "mb_per_sec": round(mb / secs, 3)}
+        for stage, secs in best.items()
+    }
+    stages["total"] = {
+        "seconds": round(sum(best.values()), 6),
+        "files_per_sec": round(counts["files"] / sum(best.values()), 1),
+        "mb_per_sec": round(mb / sum(best.values()), 3),
+    }
+    return {"counts": counts, "stages": stages}
+
+
+def compare_to_baseline(current: Dict, baseline: Dict, threshold: float) -> List[str]:
+    regressions: List[str] = []
+    for stage, now in current["stages"].items():
+        before = baseline.get("stages", {}).get(stage)
+        if not before or not before.get("files_per_sec"):
+            continue
+        ratio = now["files_per_sec"] / before["files_per_sec"]
+        flag = "REGRESSION" if ratio < 1 - threshold else ""
+        print(f"  {stage:<9} {before['files_per_sec']:>10.1f} -> {now['files_per_sec']:>10.1f} files/s  ({ratio:.2f}x) {flag}")
+        if flag:
+            regressions.append(stage)
+    return regressions
+
+
+def bench_suite(args: argparse.Namespace) -> int:
+    work = Path(args.keep) if args.keep else Path(tempfile.mkdtemp(prefix="docsgen-bench-"))
+    root = work / "repo"
+    try:
+        if not root.exists():
+            total_bytes = synth_monorepo(root, args.files, args.packages, args.seed)
+        else:
+            total_bytes = sum(p.stat().st_size for p in gd.discover_source_files(root))
+        result = run_suite(root, total_bytes, args.jobs, args.repeat)
+    finally:
+        if not args.keep:
+            shutil.rmtree(work, ignore_errors=True)
+
+    report = {
+        "config": {"files": args.files, "packages": args.packages, "seed": args.seed, "jobs": args.jobs, "bytes": total_bytes},
+        "python": platform.python_version(),
+        **result,
+    }
+    counts = result["counts"]
+    print(f"{counts['files']} files ({total_bytes / 2**20:.1f} MB), {counts['modules']} modules, {counts['items']} items, {counts['edges']} edges")
+    print(f"{'stage':<9} {'seconds':>9} {'files/s':>10} {'MB/s':>8}")
+    for stage, rec in result["stages"].items():
+        print(f"{stage:<9} {rec['seconds']:>9.3f} {rec['files_per_sec']:>10.1f} {rec['mb_per_sec']:>8.2f}")
+
+    status = 0
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        if baseline.get("config") != report["config"]:
+            print("warning: baseline was recorded with a different configuration")
+        print(f"Compared to {args.compare} (threshold {args.threshold:.0%}):")
+        if compare_to_baseline(report, baseline, args.threshold):
+            status = 1
+    if args.save_baseline:
+        Path(args.save_baseline).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.save_baseline).write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    return status
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks for scripts/generate_docs.py.")
+    sub = parser.add_subparsers(dest="bench", required=True)
+
+    p_index = sub.add_parser("line-index", help="JS/TS extraction scaling with the shared SourceIndex")
+    p_index.add_argument("--sizes", default="6250,12500,25000,50000", help="Comma-separated export counts")
+    p_index.add_argument("--repeat", type=int, default=3, help="Repetitions per size (best is reported)")
+
+    p_c = sub.add_parser("c-style", help="Go/Rust/Java single-pass extraction scaling")
+    p_c.add_argument("--files", default="100,400,1600", help="Comma-separated synthetic file counts per source")
+    p_c.add_argument("--repeat", type=int, default=3, help="Repetitions per size (best is reported)")
+
+    p_start = sub.add_parser("startup", help="Import time plus lazy backend loading, per language and for all")
+    p_start.add_argument("--repeat", type=int, default=10, help="Fresh interpreters per row (best is reported)")
+
+    p_scan = sub.add_parser("export-scan", help="Single-pass JS/TS export scanner vs one pass per pattern")
+    p_scan.add_argument("--sizes-kb", default="64,512,4096", help="Comma-separated source sizes in KB")
+    p_scan.add_argument("--repeat", type=int, default=3, help="Repetitions per size (best is reported)")
+
+    p_react = sub.add_parser("react-index", help="Per-file React component index vs per-export regex scans")
+    p_react.add_argument("--copies", default="10,50,200", help="Comma-separated component counts")
+    p_react.add_argument("--repeat", type=int, default=3, help="Repetitions per size (best is reported)")
+
+    p_mem = sub.add_parser("render-memory", help="tracemalloc peak of streamed vs joined API_FULL.md rendering")
+    p_mem.add_argument("--modules", default="500,2000,8000", help="Comma-separated module counts")
+
+    p_items = sub.add_parser("item-memory", help="tracemalloc of loaded legacy vs compact ApiItem storage")
+    p_items.add_argument("--files", type=int, default=7500, help="Synthetic files to extract (7500 gives about 100k items)")
+    p_items.add_argument("--jobs", type=int, default=1, help="Extraction worker processes")
+    p_items.add_argument("--seed", type=int, default=1, help="Random seed for the generated repo")
+
+    p_json = sub.add_parser("json-load", help="Loading API.json/API.ndjson into indexes vs scraping API_FULL.md")
+    p_json.add_argument("--modules", default="500,2000,8000", help="Comma-separated module counts (20 items each)")
+    p_json.add_argument("--repeat", type=int, default=3, help="Repetitions per size (best is reported)")
+
+    p_search = sub.add_parser("search", help="Search index size, build/load time and query latency")
+    p_search.add_argument("--modules", default="500,2000,5000", help="Comma-separated module counts (20 items each)")
+    p_search.add_argument("--queries", type=int, default=200, help="Queries per size")
+
+    p_pipe = sub.add_parser("pipeline", help="Phased vs --pipeline full runs under emulated read/write latency")
+    p_pipe.add_argument("--files", type=int, default=1000, help="Number of source files to generate")
+    p_pipe.add_argument("--latency-ms", default="0,1,5", help="Comma-separated per-read and per-write latencies")
+    p_pipe.add_argument("--queue", type=int, default=gd.DEFAULT_PIPELINE_QUEUE, help="--pipeline-queue for the pipelined runs")
+    p_pipe.add_argument("--seed", type=int, default=1, help="Random seed for the generated repo")
+
+    p_timeout = sub.add_parser("file-timeout", help="Extraction wall time with stalled files, without and with --file-timeout")
+    p_timeout.add_argument("--files", type=int, default=1000, help="Number of source files to generate")
+    p_timeout.add_argument("--stalled", type=int, default=2, help="Extra files that stall the extractor")
+    p_timeout.add_argument("--stall", type=float, default=5.0, help="Seconds each stalled file holds the extractor")
+    p_timeout.add_argument("--budgets", default="0.5,2", help="Comma-separated --file-timeout budgets in seconds")
+    p_timeout.add_argument("--jobs", type=int, default=1, help="Extraction worker processes")
+    p_timeout.add_argument("--seed", type=int, default=1, help="Random seed for the generated repo")
+
+    p_reexp = sub.add_parser("reexports", help="API_FULL.md size and run time of barrel-heavy repos, unlinked vs linked")
+    p_reexp.add_argument("--files", type=int, default=2000, help="Number of source files to generate")
+    p_reexp.add_argument("--repeat", type=int, default=3, help="Repetitions per mode (best is reported)")
+    p_reexp.add_argument("--seed", type=int, default=1, help="Random seed for the generated repo")
+
+    p_suite = sub.add_parser("suite", help="Timed discover/extract/resolve/render stages on a synthetic monorepo")
+    p_suite.add_argument("--files", type=int, default=2000, help="Number of source files to generate")
+    p_suite.add_argument("--packages", type=int, default=20, help="Number of packages to spread files over")
+    p_suite.add_argument("--seed", type=int, default=1, help="Random seed for the generated repo")
+    p_suite.add_argument("--jobs", type=int, default=1, help="Extraction worker processes")
+    p_suite.add_argument("--repeat", type=int, default=3, help="Repetitions (best per stage is reported)")
+    p_suite.add_argument("--keep", help="Generate into (or reuse) this directory instead of a temporary one")
+    p_suite.add_argument("--save-baseline", help="Write the results as a baseline JSON file")
+    p_suite.add_argument("--compare", help="Baseline JSON to compare against; exits 1 on regression")
+    p_suite.add_argument("--threshold", type=float, default=0.15, help="Allowed files/s drop before flagging (default: 0.15)")
+
+    args = parser.parse_args()
+    if args.bench == "line-index":
+        bench_line_index([int(s) for s in args.sizes.split(",") if s.strip()], args.repeat)
+    elif args.bench == "c-style":
+        bench_c_style([int(s) for s in args.files.split(",") if s.strip()], args.repeat)
+    elif args.bench == "startup":
+        bench_startup(args.repeat)
+    elif args.bench == "export-scan":
+        bench_export_scan([int(s) for s in args.sizes_kb.split(",") if s.strip()], args.repeat)
+    elif args.bench == "react-index":
+        bench_react_index([int(s) for s in args.copies.split(",") if s.strip()], args.repeat)
+    elif args.bench == "render-memory":
+        bench_render_memory([int(s) for s in args.modules.split(",") if s.strip()])
+    elif args.bench == "item-memory":
+        bench_item_memory(args.files, args.jobs, args.seed)
+    elif args.bench == "json-load":
+        bench_json_load([int(s) for s in args.modules.split(",") if s.strip()], args.repeat)
+    elif args.bench == "search":
+        bench_search([int(s) for s in args.modules.split(",") if s.strip()], args.queries)
+    elif args.bench == "pipeline":
+        bench_pipeline(args.files, [float(s) for s in args.latency_ms.split(",") if s.strip()], args.queue, args.seed)
+    elif args.bench == "file-timeout":
+        budgets = [float(s) for s in args.budgets.split(",") if s.strip()]
+        bench_file_timeout(args.files, args.stalled, args.stall, budgets, args.jobs, args.seed)
+    elif args.bench == "reexports":
+        bench_reexports(args.files, args.repeat, args.seed)
+    elif args.bench == "suite":
+        return bench_suite(args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,22 +1,44 @@
 #!/usr/bin/env python3
 
 import argparse
+import ast
+import filecmp
+import functools
+import hashlib
+import importlib
+import itertools
 import json
 import os
+import queue
 import re
 import sys
-from dataclasses import dataclass
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Set
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Set, Union
 
+if TYPE_CHECKING:
+    # Process pools, subprocess, mmap and cProfile are imported where they are used, so that
+    # runs which never need them (and library imports) do not pay for them at startup
+    import mmap
+    from concurrent.futures import Future
+
+# Default --root for the command line; everything else takes the root it works on as an argument
 REPO_ROOT = Path(__file__).resolve().parent.parent
 
-DEFAULT_OUTPUT_DIR = REPO_ROOT / "docs"
-DEFAULT_SINGLE_FILE = DEFAULT_OUTPUT_DIR / "API.md"
-DEFAULT_INDEX_FILE = DEFAULT_OUTPUT_DIR / "README.md"
-SPLIT_OUTPUT_BASE = DEFAULT_OUTPUT_DIR / "api"
-DIAGRAMS_FILE = DEFAULT_OUTPUT_DIR / "DIAGRAMS.md"
-CONFIG_FILES = [REPO_ROOT / "docsgen.json", REPO_ROOT / ".docsgen.json"]
+# Relative to the root
+OUTPUT_DIR_NAME = "docs"
+CONFIG_FILE_NAMES = ("docsgen.json", ".docsgen.json")
+CACHE_DIR_NAME = ".docsgen-cache"
+# Relative to the output directory
+SPLIT_DIR_NAME = "api"
+
+# Bump when extraction output changes shape; cached results from other versions are discarded
+GENERATOR_VERSION = "1"
 
 EXCLUDED_DIR_NAMES = {
     ".git",
@@ -39,42 +61,42 @@ EXCLUDED_DIR_NAMES = {
     ".vscode",
 }
 
-SUPPORTED_EXTENSIONS = {
-    ".js": "javascript",
-    ".jsx": "javascript",
-    ".ts": "typescript",
-    ".tsx": "typescript",
-    ".py": "python",
-    ".go": "go",
-    ".rs": "rust",
-    ".java": "java",
-}
+class ApiItem:
+    # Compact record: no per-instance __dict__ and an interned kind. The signature is stored
+    # (and cached) as text so that rendering never reopens the source file. `default` marks
+    # the module's default export, whatever its kind was resolved to (e.g. a component).
+    __slots__ = ("kind", "name", "signature", "line_number", "description", "default")
 
-IMPORT_PATTERNS = {
-    "javascript": [
-        re.compile(r"^\s*import\s+.*?from\s+['\"]([^'\"]+)['\"];?", re.MULTILINE),
-        re.compile(r"^\s*const\s+.*?=\s*require\(['\"]([^'\"]+)['\"]\)\s*;?", re.MULTILINE),
-        re.compile(r"^\s*export\s+\*\s+from\s+['\"]([^'\"]+)['\"];?", re.MULTILINE),
-    ],
-    "typescript": [
-        re.compile(r"^\s*import\s+.*?from\s+['\"]([^'\"]+)['\"];?", re.MULTILINE),
-        re.compile(r"^\s*const\s+.*?=\s*require\(['\"]([^'\"]+)['\"]\)\s*;?", re.MULTILINE),
-        re.compile(r"^\s*export\s+\*\s+from\s+['\"]([^'\"]+)['\"];?", re.MULTILINE),
-    ],
-    "python": [
-        re.compile(r"^\s*from\s+([\w\.]+)\s+import\s+", re.MULTILINE),
-        re.compile(r"^\s*import\s+([\w\.]+)", re.MULTILINE),
-    ],
-}
+    def __init__(
+        self,
+        kind: str,
+        name: str,
+        signature: str,
+        line_number: int,
+        description: Optional[str] = None,
+        default: bool = False,
+    ) -> None:
+        self.kind = sys.intern(kind)
+        self.name = name
+        self.signature = signature
+        self.line_number = line_number
+        self.description = description
+        self.default = default
 
+    def __repr__(self) -> str:
+        return (
+            f"ApiItem(kind={self.kind!r}, name={self.name!r}, signature={self.signature!r}, "
+            f"line_number={self.line_number!r}, description={self.description!r}, default={self.default!r})"
+        )
 
-@dataclass
-class ApiItem:
-    kind: str
-    name: str
-    signature: str
-    line_number: int
-    description: Optional[str] = None
+    def __reduce__(self) -> Tuple[Any, Tuple]:
+        # Rebuild through __init__ so that kinds arriving from worker processes are interned
+        return ApiItem, (self.kind, self.name, self.signature, self.line_number, self.description, self.default)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ApiItem):
+            return NotImplemented
+        return all(getattr(self, k) == getattr(other, k) for k in self.__slots__)
 
     def to_markdown(self) -> str:
         signature_inline = self.signature.replace("`", "\"").strip()
@@ -82,70 +104,789 @@ class ApiItem:
         return f"- **{self.kind}** `{self.name}` — `{signature_inline}`{desc}"
 
 
-@dataclass
 class ModuleDoc:
+    # also_exported: item name -> (barrel module, name exported there) for symbols other
+    # modules re-export; reexported: (name or "*", module) for a barrel's resolved re-exports.
+    # Both are set by link_reexports only.
+    __slots__ = ("language", "file_path", "items", "also_exported", "reexported")
+
+    def __init__(
+        self,
+        language: str,
+        file_path: Path,
+        items: List[ApiItem],
+        also_exported: Optional[Dict[str, List[Tuple[Path, str]]]] = None,
+        reexported: Optional[List[Tuple[str, Path]]] = None,
+    ) -> None:
+        self.language = sys.intern(language)
+        self.file_path = file_path
+        self.items = items
+        self.also_exported = also_exported
+        self.reexported = reexported
+
+    def __repr__(self) -> str:
+        return f"ModuleDoc(language={self.language!r}, file_path={self.file_path!r}, items={self.items!r})"
+
+    def __reduce__(self) -> Tuple[Any, Tuple]:
+        return ModuleDoc, (self.language, self.file_path, self.items, self.also_exported, self.reexported)
+
+    def link_key(self) -> Optional[str]:
+        # Digest of what link_reexports added, to tell whether a page must be re-rendered
+        if not self.also_exported and not self.reexported:
+            return None
+        also = sorted(
+            (name, [(str(fp), exported) for fp, exported in links]) for name, links in (self.also_exported or {}).items()
+        )
+        reexported = [(name, str(fp)) for name, fp in self.reexported or ()]
+        return hashlib.sha1(repr((also, reexported)).encode("utf-8")).hexdigest()
+
+
+@dataclass
+class FileExtraction:
     language: str
     file_path: Path
-    items: List[ApiItem]
+    digest: str
+    items: List[ApiItem] = field(default_factory=list)
+    imports: List[str] = field(default_factory=list)
+    # Content digest matched the cached entry, so items/imports were not extracted
+    unchanged: bool = False
+    # Per-file phase seconds measured where the work ran (possibly in a worker process)
+    timings: Dict[str, float] = field(default_factory=dict)
+    size: int = 0
+    # Why the file was not extracted: "too_large", "binary" or "minified" by policy, one of
+    # FAILURE_REASONS when something went wrong, or "quarantined"
+    skipped: Optional[str] = None
+    # Read through mmap with only the regions around declarations decoded
+    sparse: bool = False
+    # What went wrong, for failed and quarantined files
+    error: Optional[str] = None
+    # LanguageBackend.reexports of a documented module
+    reexports: List[Tuple[int, str, str, str]] = field(default_factory=list)
+
+    def __post_init__(self) -> None:
+        self.language = sys.intern(self.language)
+
+
+class SourceIndex:
+    # Built once per file: line-start offsets for bisecting match positions into
+    # line numbers, and the split lines shared by the comment helpers.
+    __slots__ = ("source", "line_starts", "lines")
+
+    def __init__(self, source: str) -> None:
+        self.source = source
+        starts = [0]
+        find = source.find
+        pos = find("\n")
+        while pos != -1:
+            starts.append(pos + 1)
+            pos = find("\n", pos + 1)
+        self.line_starts = starts
+        # Split on "\n" only so that lines[n - 1] always agrees with line_number()
+        self.lines = [l[:-1] if l.endswith("\r") else l for l in source.split("\n")]
+
+    def line_number(self, offset: int) -> int:
+        return bisect_right(self.line_starts, offset)
+
+    def line(self, line_num: int) -> Optional[str]:
+        if 0 < line_num <= len(self.lines):
+            return self.lines[line_num - 1]
+        return None
+
+
+def _as_index(source: Union[str, SourceIndex]) -> SourceIndex:
+    return source if isinstance(source, SourceIndex) else SourceIndex(source)
+
+
+# --- Instrumentation ---
+
+# (seconds, calls) for helpers timed inside extractors. extract_file reports the per-file delta,
+# so the numbers survive process-pool boundaries.
+_HELPER_TIMES: Dict[str, List[float]] = {}
+
+
+def _timed_helper(name: str) -> Callable[[Callable], Callable]:
+    def decorate(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                record = _HELPER_TIMES.setdefault(name, [0.0, 0])
+                record[0] += time.perf_counter() - start
+                record[1] += 1
+        return wrapper
+    return decorate
+
+
+class RunStats:
+    # Wall time and call counts per phase, per-file phase totals (summed across workers),
+    # per-language totals, the slowest files and the failed files of a run
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.phases: Dict[str, List[float]] = {}
+        self.file_phases: Dict[str, List[float]] = {}
+        self.languages: Dict[str, Dict[str, float]] = {}
+        self.files: List[Tuple[float, Path, str, int]] = []
+        self.counters: Dict[str, int] = {}
+        self.failures: List[FileExtraction] = []
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def add(self, name: str, seconds: float, calls: int = 1, table: Optional[Dict[str, List[float]]] = None) -> None:
+        record = (self.phases if table is None else table).setdefault(name, [0.0, 0])
+        record[0] += seconds
+        record[1] += calls
+
+    def count(self, name: str, amount: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def record_file(self, result: FileExtraction) -> None:
+        lang = self.languages.setdefault(result.language, {"files": 0, "items": 0, "bytes": 0, "seconds": 0.0})
+        lang["files"] += 1
+        lang["items"] += len(result.items)
+        if result.skipped:
+            self.count("files_skipped")
+            self.count(f"files_skipped:{result.skipped}")
+            if result.error is not None:
+                self.failures.append(result)
+        if result.sparse:
+            self.count("files_sparse")
+        if not result.timings:
+            return
+        seconds = sum(v for k, v in result.timings.items() if not k.endswith(".calls"))
+        lang["bytes"] += result.size
+        lang["seconds"] += seconds
+        for key, value in result.timings.items():
+            if not key.endswith(".calls"):
+                self.add(key, value, int(result.timings.get(key + ".calls", 1)), self.file_phases)
+        self.files.append((seconds, result.file_path, result.language, result.size))
+
+    def to_dict(self, root: Path, slowest: int = 10) -> Dict[str, Any]:
+        def table(records: Dict[str, List[float]]) -> Dict[str, Dict[str, float]]:
+            return {k: {"seconds": round(v[0], 6), "calls": int(v[1])} for k, v in sorted(records.items())}
+
+        top = sorted(self.files, key=lambda f: f[0], reverse=True)[:slowest]
+        return {
+            "total_seconds": round(time.perf_counter() - self.started, 6),
+            "phases": table(self.phases),
+            "file_phases": table(self.file_phases),
+            "languages": {k: {**v, "seconds": round(v["seconds"], 6)} for k, v in sorted(self.languages.items())},
+            "slowest_files": [
+                {"path": fp.relative_to(root).as_posix(), "language": lang, "bytes": size, "seconds": round(secs, 6)}
+                for secs, fp, lang, size in top
+            ],
+            "counters": dict(sorted(self.counters.items())),
+            "failures": [
+                {"path": r.file_path.relative_to(root).as_posix(), "language": r.language, "reason": r.skipped, "error": r.error}
+                for r in sorted(self.failures, key=lambda r: r.file_path.as_posix())
+            ],
+        }
+
+    def summary_lines(self, root: Path, slowest: int = 10) -> List[str]:
+        data = self.to_dict(root, slowest)
+        lines = [f"Total {data['total_seconds']:.3f}s"]
+        for name, rec in data["phases"].items():
+            lines.append(f"  {name:<24} {rec['seconds']:>9.3f}s  x{rec['calls']}")
+        for name, rec in data["file_phases"].items():
+            lines.append(f"  file:{name:<19} {rec['seconds']:>9.3f}s  x{rec['calls']}")
+        for f in data["slowest_files"]:
+            lines.append(f"  slow {f['seconds']:>8.4f}s {f['bytes']:>10} B  {f['path']}")
+        return lines
+
+
+def _phase(stats: Optional[RunStats], name: str):
+    return stats.phase(name) if stats is not None else nullcontext()
+
+
+# --- Language backends ---
+
+class LazyPattern:
+    # A regex compiled on first use. Pattern methods are looked up on the compiled object
+    # once and then cached on the instance, so later calls cost a plain attribute lookup.
+    def __init__(self, pattern: Union[str, bytes], flags: int = 0) -> None:
+        self.pattern = pattern
+        self.flags = flags
+        self._compiled: Optional["re.Pattern"] = None
+
+    def compile(self) -> "re.Pattern":
+        if self._compiled is None:
+            self._compiled = re.compile(self.pattern, self.flags)
+        return self._compiled
+
+    def __getattr__(self, name: str) -> Any:
+        value = getattr(self.compile(), name)
+        self.__dict__[name] = value
+        return value
+
+
+class LanguageBackend:
+    # One language: the file extensions it claims, its extractor, import scanning and
+    # resolution, and the usage examples rendered on its pages. Instances are created and
+    # load()ed by LanguageRegistry.get the first time a file of the language is read.
+    name = ""
+    extensions: Tuple[str, ...] = ()
+    # Extra names accepted by --languages
+    aliases: Tuple[str, ...] = ()
+    # Regexes compiled by load(); extractors reference their module-level patterns directly
+    patterns: Tuple[LazyPattern, ...] = ()
+    # Bytes regexes whose matches cover every line the extractor or import patterns can match
+    # (a superset is fine: extra matches only decode more context). Each starts with a literal
+    # so the regex engine can skip ahead quickly. Empty means large files are decoded in full.
+    sparse_candidates: Tuple[LazyPattern, ...] = ()
+    # Group 1 of each match is an import specifier
+    import_patterns: Tuple[LazyPattern, ...] = ()
+
+    def load(self) -> None:
+        for pattern in (*self.patterns, *self.sparse_candidates, *self.import_patterns):
+            pattern.compile()
+
+    def extract(self, index: "SourceIndex") -> List["ApiItem"]:
+        raise NotImplementedError
+
+    def extract_module(self, index: "SourceIndex") -> Tuple[List["ApiItem"], Optional[Iterable[str]]]:
+        # Items and, for backends whose parse also sees the imports, the import specifiers;
+        # None means imports() scans the source separately
+        return self.extract(index), None
+
+    def imports(self, source: str) -> Set[str]:
+        return {m.group(1) for pattern in self.import_patterns for m in pattern.finditer(source)}
+
+    def reexports(self, index: "SourceIndex", items: List["ApiItem"]) -> List[Tuple[int, str, str, str]]:
+        # (line, exported name, name in the source module, import specifier) for each item that
+        # re-exports another module's symbol, "*" for both names of a wildcard re-export.
+        # link_reexports follows them to the modules that define the symbols.
+        return []
+
+    def resolve_import(self, resolver: "ImportResolver", directory: Path, spec: str) -> Optional[Path]:
+        return resolver.resolve_path(directory, spec)
+
+    def usage_example(self, rel_path: Path, item: "ApiItem") -> str:
+        # `rel_path` is the module's path relative to the root
+        return "```\n// Usage example\n```"
+
+
+def _import_object(target: str) -> Any:
+    # "package.module:Attr.attr" -> object
+    module_name, _, attr = target.partition(":")
+    obj = importlib.import_module(module_name)
+    for part in filter(None, attr.split(".")):
+        obj = getattr(obj, part)
+    return obj
+
+
+class LanguageRegistry:
+    # Language name -> backend. Registering records only the extensions, aliases and a
+    # factory (a LanguageBackend subclass, or a "module:Class" string imported on first use);
+    # nothing is instantiated or compiled until get(). Plugins come from the
+    # "docsgen.languages" entry point group or the config's "language_backends". Sessions
+    # register their config's backends on a copy(), never on the module-wide LANGUAGES.
+    ENTRY_POINT_GROUP = "docsgen.languages"
+
+    def __init__(self, parent: Optional["LanguageRegistry"] = None) -> None:
+        # Backends whose factory is the parent's are loaded by (and shared with) the parent
+        self.parent = parent
+        self.extensions: Dict[str, str] = {}
+        self.aliases: Dict[str, str] = {}
+        self.factories: Dict[str, Union[type, str]] = {}
+        # Plugin registrations as picklable tuples, replayed in spawned worker processes
+        self.plugins: List[Tuple[str, Tuple[str, ...], str, Tuple[str, ...]]] = []
+        self._backends: Dict[str, LanguageBackend] = {}
+        self._lock = threading.Lock()
+        self._entry_points_loaded = False
+
+    def register(
+        self, name: str, extensions: Iterable[str], factory: Union[type, str], aliases: Iterable[str] = ()
+    ) -> None:
+        extensions = tuple(e.lower() if e.startswith(".") else "." + e.lower() for e in extensions)
+        aliases = tuple(aliases)
+        self.factories[name] = factory
+        self._backends.pop(name, None)
+        for ext in extensions:
+            self.extensions[ext] = name
+        for alias in (name, *aliases):
+            self.aliases[alias.lower()] = name
+        if isinstance(factory, str) and (name, extensions, factory, aliases) not in self.plugins:
+            self.plugins.append((name, extensions, factory, aliases))
+
+    def copy(self) -> "LanguageRegistry":
+        other = LanguageRegistry(self)
+        other.extensions = dict(self.extensions)
+        other.aliases = dict(self.aliases)
+        other.factories = dict(self.factories)
+        other.plugins = list(self.plugins)
+        other._entry_points_loaded = self._entry_points_loaded
+        return other
+
+    def add(self, cls: type) -> type:
+        # Class decorator for backends defined in this module
+        self.register(cls.name, cls.extensions, cls, cls.aliases)
+        return cls
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.factories
+
+    def language_for(self, path: Path) -> Optional[str]:
+        return self.extensions.get(path.suffix.lower())
+
+    def canonical(self, name: str) -> Optional[str]:
+        return self.aliases.get(name.strip().lower())
+
+    def get(self, name: str) -> LanguageBackend:
+        backend = self._backends.get(name)
+        if backend is not None:
+            return backend
+        # Reader threads in --pipeline mode may ask for a language at the same time
+        with self._lock:
+            backend = self._backends.get(name)
+            if backend is None:
+                factory = self.factories[name]
+                parent = self.parent
+                if parent is not None and parent.factories.get(name) is factory:
+                    backend = self._backends[name] = parent.get(name)
+                    return backend
+                if isinstance(factory, str):
+                    factory = _import_object(factory)
+                backend = factory()
+                backend.load()
+                self._backends[name] = backend
+        return backend
+
+    def loaded(self) -> List[str]:
+        return sorted(self._backends)
+
+    def load_config(self, specs: Dict[str, Any]) -> None:
+        # {"kotlin": {"backend": "docsgen_kotlin:KotlinBackend", "extensions": [".kt"], "aliases": ["kt"]}}
+        for name, spec in specs.items():
+            if not isinstance(spec, dict) or not isinstance(spec.get("backend"), str) or not spec.get("extensions"):
+                raise ValueError(f"language_backends.{name} needs a \"backend\" (module:Class) and \"extensions\"")
+            self.register(name, spec["extensions"], spec["backend"], spec.get("aliases", ()))
+
+    def load_entry_points(self) -> None:
+        # importlib.metadata and the scan of installed distributions take longer than setting
+        # up a single built-in language, so this runs only when a plugin may be needed
+        if self._entry_points_loaded:
+            return
+        self._entry_points_loaded = True
+        from importlib.metadata import entry_points
+
+        eps = entry_points()
+        if hasattr(eps, "select"):
+            selected = eps.select(group=self.ENTRY_POINT_GROUP)
+        else:
+            selected = eps.get(self.ENTRY_POINT_GROUP, ())
+        for ep in selected:
+            try:
+                cls = ep.load()
+            except Exception as exc:
+                print(f"Skipping language backend {ep.name} ({ep.value}): {exc}", file=sys.stderr)
+                continue
+            self.register(getattr(cls, "name", "") or ep.name, cls.extensions, ep.value, getattr(cls, "aliases", ()))
+
+
+LANGUAGES = LanguageRegistry()
+
+
+def install_language_plugins(plugins: List[Tuple[str, Tuple[str, ...], str, Tuple[str, ...]]]) -> None:
+    # Worker process initializer: workers started with "spawn" re-import this module and
+    # would otherwise only know the built-in backends. A forked worker gets a fresh lock, as
+    # the one it inherited may have been held by a pipeline reader thread at fork time.
+    LANGUAGES._lock = threading.Lock()
+    for name, extensions, target, aliases in plugins:
+        if LANGUAGES.factories.get(name) != target:
+            LANGUAGES.register(name, extensions, target, aliases)
 
 
 # --- Discovery ---
 
-def discover_source_files(root: Path, include: Optional[List[str]] = None, exclude: Optional[List[str]] = None) -> List[Path]:
-    include = include or []
-    exclude = exclude or []
-    discovered: List[Path] = []
-    for dirpath, dirnames, filenames in os.walk(root):
-        dirnames[:] = [d for d in dirnames if d not in EXCLUDED_DIR_NAMES]
-        for filename in filenames:
-            file_path = Path(dirpath) / filename
-            suffix = file_path.suffix.lower()
-            if suffix not in SUPPORTED_EXTENSIONS:
+class PathFilter:
+    # A list of regexes applied with re.search. Patterns without capture groups are compiled
+    # once into a single alternation; patterns with groups stay separate, since joining them
+    # would renumber their groups and break backreferences such as `(a)\1` (as would inline
+    # global flags, which also keep every pattern separate)
+    def __init__(self, patterns: Optional[List[str]]) -> None:
+        self.patterns = [re.compile(p) for p in patterns or []]
+        self.combined: Optional[re.Pattern] = None
+        self.separate = [p for p in self.patterns if p.groups]
+        simple = [p for p in self.patterns if not p.groups]
+        if len(simple) > 1:
+            try:
+                self.combined = re.compile("|".join(f"(?:{p.pattern})" for p in simple))
+            except re.error:
+                self.separate = self.patterns
+        elif simple:
+            self.combined = simple[0]
+        # Patterns that look past the end of their match cannot be decided from a prefix
+        self._prunable = [p for p in self.patterns if "(?=" not in p.pattern and "(?!" not in p.pattern]
+
+    def __bool__(self) -> bool:
+        return bool(self.patterns)
+
+    def search(self, rel: str) -> bool:
+        if self.combined is not None and self.combined.search(rel) is not None:
+            return True
+        return any(p.search(rel) for p in self.separate)
+
+    def covers_dir(self, rel_dir: str) -> bool:
+        # True when the pattern matches every path under rel_dir: it matches inside the
+        # "rel_dir/" prefix without reaching past it (a NUL sentinel stops `$` and catch-alls)
+        probe = rel_dir + "/\0"
+        for p in self._prunable:
+            m = p.search(probe)
+            if m is not None and m.end() < len(probe):
+                return True
+        return False
+
+
+def _gitignore_rule(line: str) -> Optional[Tuple[re.Pattern, bool, bool]]:
+    # Translates one .gitignore line to (regex on a path relative to the .gitignore's
+    # directory, negated, directory-only)
+    line = line.rstrip("\n").rstrip("\r")
+    if not line.strip() or line.startswith("#"):
+        return None
+    line = line.rstrip(" ")
+    negated = line.startswith("!")
+    if negated:
+        line = line[1:]
+    if line.startswith("\\"):
+        line = line[1:]
+    dir_only = line.endswith("/")
+    line = line.rstrip("/")
+    if not line:
+        return None
+    anchored = "/" in line
+    line = line.lstrip("/")
+    out: List[str] = []
+    i = 0
+    while i < len(line):
+        c = line[i]
+        if line.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+        elif line.startswith("/**", i) and i + 3 == len(line):
+            out.append("/.*")
+            i += 3
+        elif line.startswith("**", i):
+            out.append(".*")
+            i += 2
+        elif c == "*":
+            out.append("[^/]*")
+            i += 1
+        elif c == "?":
+            out.append("[^/]")
+            i += 1
+        elif c == "[":
+            end = line.find("]", i + 1)
+            if end == -1:
+                out.append(re.escape(c))
+                i += 1
+            else:
+                body = line[i + 1:end].replace("\\", "\\\\")
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                out.append(f"[{body}]")
+                i = end + 1
+        else:
+            out.append(re.escape(c))
+            i += 1
+    prefix = "" if anchored else "(?:.*/)?"
+    return re.compile(f"{prefix}{''.join(out)}"), negated, dir_only
+
+
+class GitIgnore:
+    # Rules from the .gitignore files seen on the way down, evaluated last-match-wins.
+    # Each entry is (directory relative to the walk root, rules).
+    def __init__(self) -> None:
+        self.layers: List[Tuple[str, List[Tuple[re.Pattern, bool, bool]]]] = []
+
+    def load(self, dir_path: str, rel_dir: str) -> bool:
+        try:
+            with open(os.path.join(dir_path, ".gitignore"), encoding="utf-8", errors="replace") as fh:
+                rules = [r for r in (_gitignore_rule(l) for l in fh) if r is not None]
+        except OSError:
+            return False
+        if not rules:
+            return False
+        self.layers.append((rel_dir, rules))
+        return True
+
+    def ignored(self, rel: str, is_dir: bool) -> bool:
+        result = False
+        for base, rules in self.layers:
+            if base:
+                if not rel.startswith(base + "/"):
+                    continue
+                sub = rel[len(base) + 1:]
+            else:
+                sub = rel
+            for pattern, negated, dir_only in rules:
+                if dir_only and not is_dir:
+                    continue
+                if pattern.fullmatch(sub):
+                    result = not negated
+        return result
+
+
+def iter_source_files(
+    root: Path,
+    include: Optional[List[str]] = None,
+    exclude: Optional[List[str]] = None,
+    dirs_out: Optional[List[Path]] = None,
+    gitignore: bool = False,
+    registry: LanguageRegistry = LANGUAGES,
+) -> Iterator[Path]:
+    # Depth-first scandir walk in the same order as os.walk. Names are checked against
+    # EXCLUDED_DIR_NAMES and the registered extensions before any Path is built, directories whose
+    # prefix an exclude pattern fully covers are not entered, and .gitignore files are
+    # honored when `gitignore` is set.
+    include_filter = PathFilter(include)
+    exclude_filter = PathFilter(exclude)
+    ignore = GitIgnore() if gitignore else None
+    splitext = os.path.splitext
+    extensions = registry.extensions
+    # (absolute dir, rel dir, number of gitignore layers when the dir was entered)
+    stack: List[Tuple[str, str, int]] = [(os.fspath(root), "", 0)]
+    while stack:
+        dir_path, rel_dir, depth = stack.pop()
+        if ignore is not None:
+            del ignore.layers[depth:]
+            ignore.load(dir_path, rel_dir)
+        if dirs_out is not None:
+            dirs_out.append(Path(dir_path))
+        try:
+            with os.scandir(dir_path) as it:
+                entries = list(it)
+        except OSError:
+            continue
+        subdirs: List[Tuple[str, str]] = []
+        for entry in entries:
+            name = entry.name
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            rel = f"{rel_dir}/{name}" if rel_dir else name
+            if is_dir:
+                if name in EXCLUDED_DIR_NAMES or entry.is_symlink():
+                    continue
+                if exclude_filter and exclude_filter.covers_dir(rel):
+                    continue
+                if ignore is not None and ignore.ignored(rel, True):
+                    continue
+                subdirs.append((entry.path, rel))
+                continue
+            if splitext(name)[1].lower() not in extensions:
                 continue
-            rel = file_path.relative_to(root).as_posix()
             # include/exclude filters
-            if include and not any(re.search(p, rel) for p in include):
+            if include_filter and not include_filter.search(rel):
                 continue
-            if exclude and any(re.search(p, rel) for p in exclude):
+            if exclude_filter and exclude_filter.search(rel):
                 continue
-            discovered.append(file_path)
-    return discovered
+            if ignore is not None and ignore.ignored(rel, False):
+                continue
+            yield Path(entry.path)
+        layers = len(ignore.layers) if ignore is not None else 0
+        for sub_path, sub_rel in reversed(subdirs):
+            stack.append((sub_path, sub_rel, layers))
+
+
+def discover_source_files(
+    root: Path,
+    include: Optional[List[str]] = None,
+    exclude: Optional[List[str]] = None,
+    dirs_out: Optional[List[Path]] = None,
+    gitignore: bool = False,
+    registry: LanguageRegistry = LANGUAGES,
+) -> List[Path]:
+    return list(iter_source_files(root, include, exclude, dirs_out, gitignore, registry))
+
+
+def is_discoverable(
+    root: Path,
+    rel: str,
+    include: PathFilter,
+    exclude: PathFilter,
+    ignore: Optional[GitIgnore] = None,
+    registry: LanguageRegistry = LANGUAGES,
+) -> bool:
+    # iter_source_files' rules for a single repo-relative path, checked without walking the tree
+    if os.path.splitext(rel)[1].lower() not in registry.extensions or not (root / rel).is_file():
+        return False
+    parts = rel.split("/")
+    if ignore is not None:
+        del ignore.layers[:]
+        ignore.load(os.fspath(root), "")
+    for depth in range(1, len(parts)):
+        rel_dir = "/".join(parts[:depth])
+        if parts[depth - 1] in EXCLUDED_DIR_NAMES or (root / rel_dir).is_symlink():
+            return False
+        if exclude and exclude.covers_dir(rel_dir):
+            return False
+        if ignore is not None:
+            if ignore.ignored(rel_dir, True):
+                return False
+            ignore.load(os.fspath(root / rel_dir), rel_dir)
+    if include and not include.search(rel):
+        return False
+    if exclude and exclude.search(rel):
+        return False
+    return ignore is None or not ignore.ignored(rel, False)
+
+
+# --- Source reading ---
+
+# Files above this many bytes are skipped (0 disables the limit)
+DEFAULT_MAX_FILE_SIZE = 2 * 1024 * 1024
+# Files at least this large are memory-mapped and only the regions around declaration
+# candidates are decoded
+SPARSE_READ_THRESHOLD = 256 * 1024
+SNIFF_BYTES = 8192
+# Average line length over the sniffed head above which a file is treated as minified
+MINIFIED_LINE_LENGTH = 400
+# Lines kept above (doc comments) and below (multi-line headers) each candidate
+SPARSE_CONTEXT_BEFORE = 40
+SPARSE_CONTEXT_AFTER = 8
+# Stands in for each line a sparse read did not decode
+SPARSE_ELIDED_LINE = ";"
+
+@dataclass
+class SourceText:
+    text: str
+    digest: str
+    size: int
+    skipped: Optional[str] = None
+    sparse: bool = False
+    error: Optional[str] = None
+
 
+def _sniff_skip_reason(head: bytes) -> Optional[str]:
+    if b"\0" in head:
+        return "binary"
+    # Heads too short to judge are kept
+    if len(head) >= 2048 and len(head) // (head.count(b"\n") + 1) > MINIFIED_LINE_LENGTH:
+        return "minified"
+    return None
+
+
+def _count_newlines(buf: "mmap.mmap", start: int, end: int, chunk: int = 1 << 20) -> int:
+    count = 0
+    while start < end:
+        stop = min(end, start + chunk)
+        count += buf[start:stop].count(b"\n")
+        start = stop
+    return count
+
+
+def _sparse_decode(buf: "mmap.mmap", candidates: Tuple[LazyPattern, ...]) -> str:
+    # Decodes the lines around each candidate match and replaces every other line with
+    # SPARSE_ELIDED_LINE, so line numbers are unchanged and comment look-behind stops at the
+    # elided regions. The first lines are always kept for patterns anchored at the start of
+    # the file, and a block comment closed inside the context is kept back to its opener.
+    spans = sorted([(0, 0)] + [m.span() for pattern in candidates for m in pattern.finditer(buf)])
+    elided = SPARSE_ELIDED_LINE + "\n"
+    parts: List[str] = []
+    pos = 0
+    size = len(buf)
+    for match_start, match_end in spans:
+        start = buf.rfind(b"\n", 0, match_start) + 1
+        for _ in range(SPARSE_CONTEXT_BEFORE):
+            if start <= pos:
+                break
+            start = buf.rfind(b"\n", 0, start - 1) + 1
+        start = max(start, pos)
+        if start > pos:
+            close = buf.find(b"*/", start, match_start)
+            if close != -1 and buf.rfind(b"/*", start, close) == -1:
+                # Inside a comment, so the nearest opener above is its own
+                opener = buf.rfind(b"/*", 0, start)
+                if opener != -1:
+                    start = max(buf.rfind(b"\n", 0, opener) + 1, pos)
+        end = match_end
+        for _ in range(SPARSE_CONTEXT_AFTER + 1):
+            nl = buf.find(b"\n", end)
+            if nl == -1:
+                end = size
+                break
+            end = nl + 1
+        if end <= pos:
+            continue
+        if start > pos:
+            parts.append(elided * _count_newlines(buf, pos, start))
+        parts.append(buf[start:end].decode("utf-8", "replace"))
+        pos = end
+    if pos < size:
+        # Keep the trailing lines (and an unterminated last line) so the line count matches
+        parts.append(elided * _count_newlines(buf, pos, size))
+        if buf[size - 1:size] != b"\n":
+            parts.append(SPARSE_ELIDED_LINE)
+    return "".join(parts)
 
-def read_text_safely(path: Path) -> str:
+
+def read_source(
+    path: Path, language: str, max_size: int = DEFAULT_MAX_FILE_SIZE, registry: LanguageRegistry = LANGUAGES
+) -> SourceText:
+    # Size-bounded read with a binary/minified check on the first SNIFF_BYTES. Large files
+    # are memory-mapped: hashed in place and scanned with bytes regexes, never fully decoded.
     try:
-        return path.read_text(encoding="utf-8", errors="replace")
-    except Exception:
-        return ""
+        with open(path, "rb") as fh:
+            size = os.fstat(fh.fileno()).st_size
+            if max_size and size > max_size:
+                return SourceText("", "", size, "too_large")
+            candidates = registry.get(language).sparse_candidates
+            if size < SPARSE_READ_THRESHOLD or not candidates:
+                data = fh.read()
+                digest = hashlib.sha1(data).hexdigest()
+                reason = _sniff_skip_reason(data[:SNIFF_BYTES])
+                if reason:
+                    return SourceText("", digest, len(data), reason)
+                return SourceText(data.decode("utf-8", "replace"), digest, len(data))
+            import mmap
+
+            with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                digest = hashlib.sha1(buf).hexdigest()
+                reason = _sniff_skip_reason(buf[:SNIFF_BYTES])
+                if reason:
+                    return SourceText("", digest, size, reason)
+                return SourceText(_sparse_decode(buf, candidates), digest, size, sparse=True)
+    except (OSError, ValueError) as exc:
+        return SourceText("", "", 0, "unreadable", error=str(exc))
 
 
 # --- Language-specific extraction ---
 
-JS_EXPORT_PATTERNS = [
-    ("function", re.compile(r"^\s*export\s+(?:async\s+)?function\s+([A-Za-z0-9_$]+)\s*\(", re.MULTILINE)),
-    ("class", re.compile(r"^\s*export\s+class\s+([A-Za-z0-9_$]+)\b", re.MULTILINE)),
-    ("const", re.compile(r"^\s*export\s+const\s+([A-Za-z0-9_$]+)\s*=", re.MULTILINE)),
-    ("let", re.compile(r"^\s*export\s+let\s+([A-Za-z0-9_$]+)\s*=", re.MULTILINE)),
-    ("var", re.compile(r"^\s*export\s+var\s+([A-Za-z0-9_$]+)\s*=", re.MULTILINE)),
-    ("type", re.compile(r"^\s*export\s+type\s+([A-Za-z0-9_$]+)\b", re.MULTILINE)),
-    ("interface", re.compile(r"^\s*export\s+interface\s+([A-Za-z0-9_$]+)\b", re.MULTILINE)),
-    ("enum", re.compile(r"^\s*export\s+enum\s+([A-Za-z0-9_$]+)\b", re.MULTILINE)),
-    ("default", re.compile(r"^\s*export\s+default\s+(?:function\s+)?([A-Za-z0-9_$]*)", re.MULTILINE)),
-    ("named_export_list", re.compile(r"^\s*export\s*\{([^}]+)\}\s*(?:from\s*['\"][^'\"]+['\"])?:?", re.MULTILINE)),
-    ("reexport_all", re.compile(r"^\s*export\s+\*\s+from\s+['\"][^'\"]+['\"];?", re.MULTILINE)),
-    ("cjs_object", re.compile(r"module\.exports\s*=\s*\{([^}]+)\}", re.MULTILINE)),
-    ("cjs_property", re.compile(r"exports\.([A-Za-z0-9_$]+)\s*=", re.MULTILINE)),
-]
-
-
-def _find_line_number(source: str, match: re.Match) -> int:
-    start = match.start()
-    return source.count("\n", 0, start) + 1
-
-
-def _extract_jsdoc_before(source: str, start_line: int) -> Optional[str]:
+JS_FROM_CLAUSE = LazyPattern(r"\bfrom\s*['\"]([^'\"]+)['\"]")
+JS_EXPORT_ALIAS = LazyPattern(r"([A-Za-z0-9_$]+)\s+as\s+([A-Za-z0-9_$]+)")
+# All export forms in one alternation so a file is scanned once and items come out in source
+# order. Each branch has exactly one named group, so `match.lastgroup` is the export kind.
+JS_EXPORT_SCANNER = LazyPattern(
+    r"^[ \t]*export(?:"
+    r"\s+(?:async\s+)?function\s+(?P<function>[A-Za-z0-9_$]+)\s*\("
+    r"|\s+class\s+(?P<class>[A-Za-z0-9_$]+)\b"
+    r"|\s+const\s+(?P<const>[A-Za-z0-9_$]+)\s*="
+    r"|\s+let\s+(?P<let>[A-Za-z0-9_$]+)\s*="
+    r"|\s+var\s+(?P<var>[A-Za-z0-9_$]+)\s*="
+    r"|\s+type\s+(?P<type>[A-Za-z0-9_$]+)\b"
+    r"|\s+interface\s+(?P<interface>[A-Za-z0-9_$]+)\b"
+    r"|\s+enum\s+(?P<enum>[A-Za-z0-9_$]+)\b"
+    r"|\s+default\b(?:[ \t]+function\b)?[ \t]*(?P<default>[A-Za-z0-9_$]*)"
+    r"|\s*\{(?P<named_export_list>[^}]+)\}\s*(?:from\s*['\"][^'\"]+['\"])?:?"
+    r"|\s+(?P<reexport_all>\*)\s+from\s+['\"][^'\"]+['\"];?"
+    r")"
+    r"|module\.exports\s*=\s*\{(?P<cjs_object>[^}]+)\}"
+    r"|exports\.(?P<cjs_property>[A-Za-z0-9_$]+)\s*=",
+    re.MULTILINE,
+)
+
+
+def _extract_jsdoc_before(index: SourceIndex, start_line: int) -> Optional[str]:
     # Find nearest /** ... */ or consecutive // lines immediately above the start_line
-    lines = source.splitlines()
+    lines = index.lines
     idx = start_line - 2  # 0-based index, line above declaration
     # First check block comment
     block = []
@@ -158,6 +899,9 @@ def _extract_jsdoc_before(source: str, start_line: int) -> Optional[str]:
             found_start = False
             while idx2 >= 0:
                 line2 = lines[idx2].rstrip()
+                # An elided region of a sparse read: the opener (if any) was not decoded
+                if line2 == SPARSE_ELIDED_LINE:
+                    break
                 block.append(line2)
                 if line2.strip().startswith("/**"):
                     found_start = True
@@ -194,265 +938,619 @@ def _extract_jsdoc_before(source: str, start_line: int) -> Optional[str]:
     return None
 
 
-def _is_react_component(source: str, name: str) -> bool:
-    # Heuristics: PascalCase name and function/const assigned to arrow that returns JSX
-    if not name or not name[0].isupper():
-        return False
-    pattern_func = re.compile(rf"\bfunction\s+{re.escape(name)}\b[\s\S]*?return\s*\(\s*<", re.MULTILINE)
-    pattern_const_arrow = re.compile(rf"\b{re.escape(name)}\s*=\s*\(.*?\)\s*=>[\s\S]*?return\s*\(\s*<", re.MULTILINE)
-    pattern_type = re.compile(rf"\b{re.escape(name)}\s*:\s*React\.FC|JSX\.Element|ReactElement")
-    return bool(pattern_func.search(source) or pattern_const_arrow.search(source) or pattern_type.search(source))
+# Top-level (column 0) function and variable declarations; nested helpers are indented and so
+# stay part of their enclosing declaration's span. Classes and anonymous default exports only
+# end the previous span (`boundary`), so a JSX return inside them is credited to no one.
+REACT_DECLARATION = LazyPattern(
+    r"^(?:export[ \t]+(?:default[ \t]+)?)?(?:"
+    r"(?:async[ \t]+)?function[ \t]*\*?[ \t]*(?P<func>[A-Za-z0-9_$]+)"
+    r"|(?:const|let|var)[ \t]+(?P<var>[A-Za-z0-9_$]+)[ \t]*(?::[ \t]*(?P<var_type>[^=\n]+?))?[ \t]*="
+    r"|(?P<boundary>(?:abstract[ \t]+)?class\b)"
+    r")"
+    r"|^export[ \t]+default[ \t]+(?P<anonymous>(?:async[ \t]+)?(?:function\b|\(|[A-Za-z0-9_$]+[ \t]*=>))",
+    re.MULTILINE,
+)
+REACT_COMPONENT_TYPE = LazyPattern(r"\b(?:React\.)?(?:FC|FunctionComponent|VFC)\b")
+REACT_RETURN_TYPE = LazyPattern(r"[^{]*?\)\s*:\s*(?:JSX\.Element|(?:React\.)?ReactElement)\b")
+JSX_RETURN = LazyPattern(r"(?:\breturn|=>)\s*\(?\s*<[A-Za-z>]")
+
+
+@_timed_helper("react_index")
+def _react_component_index(source: str) -> Set[str]:
+    # One pass over the top-level declarations and one over JSX returns. Each JSX return is
+    # attributed to the nearest declaration starting before it, and return-type annotations
+    # only count within the declaration's own header.
+    starts: List[int] = []
+    names: List[str] = []
+    components: Set[str] = set()
+    for m in REACT_DECLARATION.finditer(source):
+        name = m.group("func") or m.group("var") or ""
+        starts.append(m.start())
+        names.append(name)
+        if not name[:1].isupper():
+            continue
+        var_type = m.group("var_type")
+        if var_type is not None:
+            if REACT_COMPONENT_TYPE.search(var_type):
+                components.add(name)
+        elif REACT_RETURN_TYPE.match(source, m.end(), m.end() + 500):
+            components.add(name)
+    if not starts:
+        return components
+    for m in JSX_RETURN.finditer(source):
+        idx = bisect_right(starts, m.start()) - 1
+        if idx >= 0 and names[idx][:1].isupper():
+            components.add(names[idx])
+    return components
+
+
+def _iter_js_export_matches(source: str) -> Iterator[re.Match]:
+    # Every export form contains "export", and a match can only start at the beginning of that
+    # line (`export ...`), 7 characters before it (`module.exports`) or at it (`exports.x`).
+    # Trying just those positions avoids running the regex over the rest of the file.
+    find = source.find
+    scan_from = 0
+    last_tried = -1
+    pos = find("export")
+    while pos != -1:
+        line_start = source.rfind("\n", 0, pos) + 1
+        for start in (line_start, pos - 7, pos):
+            if start < scan_from or start <= last_tried:
+                continue
+            last_tried = start
+            m = JS_EXPORT_SCANNER.match(source, start)
+            if m is not None:
+                yield m
+                scan_from = m.end()
+                break
+        pos = find("export", max(pos + 6, scan_from))
+
+
+def _js_export_names(names_blob: str) -> List[Tuple[str, str]]:
+    # (local or imported name, exported name) for each entry of an `export { ... }` list
+    names: List[Tuple[str, str]] = []
+    for raw in names_blob.split(","):
+        name = raw.strip()
+        if not name:
+            continue
+        alias_match = JS_EXPORT_ALIAS.match(name)
+        names.append((alias_match.group(1), alias_match.group(2)) if alias_match else (name, name))
+    return names
 
 
-def extract_js_ts_exports(source: str) -> List[ApiItem]:
+def js_ts_reexports(index: SourceIndex, items: List[ApiItem]) -> List[Tuple[int, str, str, str]]:
+    # LanguageBackend.reexports for JS/TS: only the lines holding re-export items are matched again
+    found: List[Tuple[int, str, str, str]] = []
+    source = index.source
+    seen: Set[int] = set()
+    for item in items:
+        if item.kind != "re-export" or item.line_number in seen:
+            continue
+        seen.add(item.line_number)
+        m = JS_EXPORT_SCANNER.match(source, index.line_starts[item.line_number - 1])
+        if m is None or m.lastgroup not in ("named_export_list", "reexport_all"):
+            continue
+        spec = JS_FROM_CLAUSE.search(source, m.end(m.lastgroup), m.end())
+        if spec is None:
+            continue
+        if m.lastgroup == "reexport_all":
+            found.append((item.line_number, "*", "*", spec.group(1)))
+        else:
+            for name, exported_name in _js_export_names(m.group("named_export_list")):
+                found.append((item.line_number, exported_name, name, spec.group(1)))
+    return found
+
+
+def extract_js_ts_exports(source: Union[str, SourceIndex]) -> List[ApiItem]:
+    index = _as_index(source)
+    source = index.source
     items: List[ApiItem] = []
-    lines = source.splitlines()
-    for kind, pattern in JS_EXPORT_PATTERNS:
-        for m in pattern.finditer(source):
-            if kind == "named_export_list":
-                names_blob = m.group(1)
-                for raw in names_blob.split(','):
-                    name = raw.strip()
-                    if not name:
-                        continue
-                    alias_match = re.match(r"([A-Za-z0-9_$]+)\s+as\s+([A-Za-z0-9_$]+)", name)
-                    exported_name = alias_match.group(2) if alias_match else name
-                    line_num = _find_line_number(source, m)
-                    sig = lines[line_num - 1] if 0 < line_num <= len(lines) else f"export {{ {name} }}"
-                    desc = _extract_jsdoc_before(source, line_num)
-                    resolved_kind = "component" if _is_react_component(source, exported_name) else "export"
-                    items.append(ApiItem(resolved_kind, exported_name, sig, line_num, desc))
-            elif kind == "reexport_all":
-                line_num = _find_line_number(source, m)
-                sig = lines[line_num - 1] if 0 < line_num <= len(lines) else "export * from '...'"
-                desc = _extract_jsdoc_before(source, line_num)
-                items.append(ApiItem("re-export", "*", sig, line_num, desc))
-            elif kind == "cjs_object":
-                names_blob = m.group(1)
-                for raw in names_blob.split(','):
-                    kv = raw.strip().split(':')
-                    name = kv[0].strip() if kv else ""
-                    if name:
-                        line_num = _find_line_number(source, m)
-                        sig = lines[line_num - 1] if 0 < line_num <= len(lines) else "module.exports = { ... }"
-                        desc = _extract_jsdoc_before(source, line_num)
-                        resolved_kind = "component" if _is_react_component(source, name) else "export"
-                        items.append(ApiItem(resolved_kind, name, sig, line_num, desc))
-            elif kind == "cjs_property":
-                name = m.group(1)
-                line_num = _find_line_number(source, m)
-                sig = lines[line_num - 1] if 0 < line_num <= len(lines) else f"exports.{name} = ..."
-                desc = _extract_jsdoc_before(source, line_num)
-                resolved_kind = "component" if _is_react_component(source, name) else "export"
-                items.append(ApiItem(resolved_kind, name, sig, line_num, desc))
-            else:
-                name = (m.group(1) or "default").strip()
-                if name == "":
-                    name = "default"
-                line_num = _find_line_number(source, m)
-                sig = lines[line_num - 1] if 0 < line_num <= len(lines) else m.group(0)
-                desc = _extract_jsdoc_before(source, line_num)
-                resolved_kind = "component" if _is_react_component(source, name) else kind
-                items.append(ApiItem(resolved_kind, name, sig, line_num, desc))
+    components = _react_component_index(source) if "<" in source else set()
+    for m in _iter_js_export_matches(source):
+        kind = m.lastgroup
+        line_num = index.line_number(m.start())
+        line = index.line(line_num)
+        if kind == "named_export_list":
+            reexport = JS_FROM_CLAUSE.search(source, m.end(kind), m.end()) is not None
+            for name, exported_name in _js_export_names(m.group(kind)):
+                sig = line if line is not None else f"export {{ {name} }}"
+                desc = _extract_jsdoc_before(index, line_num)
+                if reexport:
+                    resolved_kind = "re-export"
+                else:
+                    resolved_kind = "component" if exported_name in components else "export"
+                items.append(ApiItem(resolved_kind, exported_name, sig, line_num, desc))
+        elif kind == "reexport_all":
+            sig = line if line is not None else "export * from '...'"
+            desc = _extract_jsdoc_before(index, line_num)
+            items.append(ApiItem("re-export", "*", sig, line_num, desc))
+        elif kind == "cjs_object":
+            names_blob = m.group(kind)
+            for raw in names_blob.split(','):
+                kv = raw.strip().split(':')
+                name = kv[0].strip() if kv else ""
+                if name:
+                    sig = line if line is not None else "module.exports = { ... }"
+                    desc = _extract_jsdoc_before(index, line_num)
+                    resolved_kind = "component" if name in components else "export"
+                    items.append(ApiItem(resolved_kind, name, sig, line_num, desc))
+        elif kind == "cjs_property":
+            name = m.group(kind)
+            sig = line if line is not None else f"exports.{name} = ..."
+            desc = _extract_jsdoc_before(index, line_num)
+            resolved_kind = "component" if name in components else "export"
+            items.append(ApiItem(resolved_kind, name, sig, line_num, desc))
+        else:
+            name = (m.group(kind) or "default").strip()
+            if name == "":
+                name = "default"
+            sig = line if line is not None else m.group(0)
+            desc = _extract_jsdoc_before(index, line_num)
+            resolved_kind = "component" if name in components else kind
+            items.append(ApiItem(resolved_kind, name, sig, line_num, desc, default=kind == "default"))
     return items
 
 
-# Python via AST to get accurate docstrings and parameters
+# Python via AST to get accurate docstrings and parameters. One walk over the statement
+# lists collects public functions, classes with their public methods and properties (nested
+# classes get dotted names), `__all__` and the import specifiers used for the graph.
 
-def extract_python_api(source: str) -> List[ApiItem]:
-    try:
-        import ast
-    except Exception:
-        return []
+PY_PROPERTY_DECORATORS = {"property", "cached_property"}
+
+
+def _py_function_signature(node: Union[ast.FunctionDef, ast.AsyncFunctionDef]) -> str:
+    prefix = "async def" if isinstance(node, ast.AsyncFunctionDef) else "def"
+    sig = f"{prefix} {node.name}({ast.unparse(node.args)})"
+    if node.returns is not None:
+        sig += f" -> {ast.unparse(node.returns)}"
+    return sig
+
+
+def _py_class_signature(node: ast.ClassDef) -> str:
+    bases = [ast.unparse(b) for b in node.bases] + [ast.unparse(k) for k in node.keywords]
+    return f"class {node.name}({', '.join(bases)})" if bases else f"class {node.name}"
+
+
+def _py_decorator_name(node: ast.expr) -> str:
+    if isinstance(node, ast.Call):
+        node = node.func
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    return node.id if isinstance(node, ast.Name) else ""
+
+
+def _py_string_list(node: Optional[ast.expr]) -> List[str]:
+    if isinstance(node, (ast.List, ast.Tuple)):
+        return [e.value for e in node.elts if isinstance(e, ast.Constant) and isinstance(e.value, str)]
+    return []
+
+
+def _py_all_names(node: ast.stmt) -> List[str]:
+    # `__all__ = [...]`, `__all__: List[str] = (...)`, `__all__ += [...]`, `__all__.extend([...])`
+    # and `__all__.append("...")`
+    if isinstance(node, ast.Assign):
+        if any(isinstance(t, ast.Name) and t.id == "__all__" for t in node.targets):
+            return _py_string_list(node.value)
+    elif isinstance(node, (ast.AnnAssign, ast.AugAssign)):
+        if isinstance(node.target, ast.Name) and node.target.id == "__all__":
+            if isinstance(node, ast.AnnAssign) or isinstance(node.op, ast.Add):
+                return _py_string_list(node.value)
+    elif isinstance(node, ast.Expr) and isinstance(node.value, ast.Call):
+        func = node.value.func
+        args = node.value.args
+        if isinstance(func, ast.Attribute) and isinstance(func.value, ast.Name) and func.value.id == "__all__" and args:
+            if func.attr == "extend":
+                return _py_string_list(args[0])
+            if func.attr == "append" and isinstance(args[0], ast.Constant) and isinstance(args[0].value, str):
+                return [args[0].value]
+    return []
+
+
+def extract_python_module(source: Union[str, SourceIndex]) -> Tuple[List[ApiItem], Set[str]]:
+    source = _as_index(source).source
     items: List[ApiItem] = []
+    imports: Set[str] = set()
     try:
         tree = ast.parse(source)
-    except SyntaxError:
-        return items
+    except (SyntaxError, ValueError):
+        return items, imports
+    exported: List[str] = []
 
-    class Visitor(ast.NodeVisitor):
-        def visit_FunctionDef(self, node: "ast.FunctionDef") -> None:
-            if node.name.startswith("_"):
-                return
-            doc = ast.get_docstring(node)
-            args = [a.arg for a in node.args.args]
-            sig = f"def {node.name}({', '.join(args)})"
-            items.append(ApiItem("function", node.name, sig, getattr(node, "lineno", 1), doc))
+    def walk(body: List[ast.stmt], owner: Optional[str], documented: bool) -> None:
+        # `owner` is the dotted name of the enclosing public class; `documented` is False inside
+        # functions and private classes, where only imports are collected
+        for node in body:
+            if isinstance(node, ast.Import):
+                imports.update(alias.name for alias in node.names)
+            elif isinstance(node, ast.ImportFrom):
+                base = "." * node.level + (node.module or "")
+                imports.add(base)
+                if not node.module:
+                    # `from . import sibling` may name submodules
+                    imports.update(base + alias.name for alias in node.names if alias.name != "*")
+            elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                if documented and not node.name.startswith("_"):
+                    decorators = {_py_decorator_name(d) for d in node.decorator_list}
+                    sig = _py_function_signature(node)
+                    doc = ast.get_docstring(node)
+                    if owner is None:
+                        items.append(ApiItem("function", node.name, sig, node.lineno, doc))
+                    elif decorators & PY_PROPERTY_DECORATORS:
+                        items.append(ApiItem("property", f"{owner}.{node.name}", sig, node.lineno, doc))
+                    elif not decorators & {"setter", "deleter"}:
+                        items.append(ApiItem("method", f"{owner}.{node.name}", sig, node.lineno, doc))
+                walk(node.body, None, False)
+            elif isinstance(node, ast.ClassDef):
+                public = documented and not node.name.startswith("_")
+                name = f"{owner}.{node.name}" if owner else node.name
+                if public:
+                    items.append(ApiItem("class", name, _py_class_signature(node), node.lineno, ast.get_docstring(node)))
+                walk(node.body, name if public else None, public)
+            else:
+                if documented and owner is None:
+                    exported.extend(_py_all_names(node))
+                # Compound statements (if/try/with/for/while/match) keep the current scope
+                for field_name in ("body", "orelse", "finalbody"):
+                    block = getattr(node, field_name, None)
+                    if isinstance(block, list):
+                        walk(block, owner, documented)
+                for handler in [*getattr(node, "handlers", ()), *getattr(node, "cases", ())]:
+                    walk(handler.body, owner, documented)
 
-        def visit_AsyncFunctionDef(self, node: "ast.AsyncFunctionDef") -> None:
-            if node.name.startswith("_"):
-                return
-            doc = ast.get_docstring(node)
-            args = [a.arg for a in node.args.args]
-            sig = f"async def {node.name}({', '.join(args)})"
-            items.append(ApiItem("function", node.name, sig, getattr(node, "lineno", 1), doc))
+    walk(tree.body, None, True)
 
-        def visit_ClassDef(self, node: "ast.ClassDef") -> None:
-            if node.name.startswith("_"):
-                return
-            doc = ast.get_docstring(node)
-            bases = [getattr(b, 'id', getattr(getattr(b, 'attr', None), '__str__', lambda: '')()) for b in node.bases]
-            base_str = f"({', '.join(bases)})" if bases else ""
-            sig = f"class {node.name}{base_str}"
-            items.append(ApiItem("class", node.name, sig, getattr(node, "lineno", 1), doc))
+    # __all__ explicit exports that are not already documented at module level
+    seen = {it.name for it in items}
+    for name in exported:
+        if name and name not in seen:
+            seen.add(name)
+            items.append(ApiItem("export", name, "__all__", 1, None))
+    return items, imports
 
-    Visitor().visit(tree)
 
-    # __all__ explicit exports
-    try:
-        m = re.search(r"__all__\s*=\s*\[([^\]]*)\]", source)
-        if m:
-            for raw in m.group(1).split(','):
-                name = raw.strip().strip("'\" ")
-                if name and not any(it.name == name for it in items):
-                    items.append(ApiItem("export", name, "__all__", 1, None))
-    except Exception:
-        pass
+def extract_python_api(source: Union[str, SourceIndex]) -> List[ApiItem]:
+    return extract_python_module(source)[0]
 
-    return items
 
+# Go, Rust and Java: one MULTILINE scanner per language finds comment lines and candidate
+# declarations in a single pass; doc comments are whatever comment run was open when a
+# declaration is reached.
+BLOCK_DOC_MARKUP = LazyPattern(r"^\s*/\*\*?|\s*\*/\s*$|^\s*\*\s?", re.MULTILINE)
 
-# Go public declarations and preceding comments
-GO_FUNC = re.compile(r"^func\s*(?:\(.*?\)\s*)?([A-Z][A-Za-z0-9_]*)\s*\(")
-GO_TYPE = re.compile(r"^type\s+([A-Z][A-Za-z0-9_]*)\s+(?:struct|interface|func|map|\[)")
-GO_CONST = re.compile(r"^const\s+([A-Z][A-Za-z0-9_]*)\s*")
 
+class DocComments:
+    # The most recent run of // lines (or /** */ block). It documents a declaration only when
+    # nothing but blank lines, or lines starting with one of `transparent` (attributes,
+    # annotations), separates the two.
+    __slots__ = ("source", "transparent", "parts", "block", "end")
 
-def _extract_line_comments_before(source: str, start_line: int, markers: Tuple[str, ...]) -> Optional[str]:
-    lines = source.splitlines()
-    idx = start_line - 2
-    comment_lines: List[str] = []
-    while idx >= 0:
-        stripped = lines[idx].strip()
-        if any(stripped.startswith(m) for m in markers):
-            c = stripped
-            for m in markers:
-                if c.startswith(m):
-                    c = c[len(m):]
-                    break
-            comment_lines.append(c.strip())
-            idx -= 1
-            continue
-        if stripped == "":
-            idx -= 1
-            continue
-        break
-    if comment_lines:
-        comment_lines.reverse()
-        return "\n".join(comment_lines).strip() or None
-    return None
+    def __init__(self, source: str, transparent: Tuple[str, ...] = ()) -> None:
+        self.source = source
+        self.transparent = transparent
+        self.parts: List[str] = []
+        self.block = False
+        self.end = -1
+
+    def _adjacent(self, start: int) -> bool:
+        gap = self.source[self.end:start]
+        if not gap.strip():
+            return True
+        if not self.transparent:
+            return False
+        return all(not l.strip() or l.strip().startswith(self.transparent) for l in gap.split("\n"))
+
+    def add_line(self, start: int, end: int, text: str) -> None:
+        if self.block or not self.parts or not self._adjacent(start):
+            self.parts = []
+        self.parts.append(text)
+        self.block = False
+        self.end = end
 
+    def add_block(self, end: int, text: str) -> None:
+        self.parts = [BLOCK_DOC_MARKUP.sub("", text.rstrip())]
+        self.block = True
+        self.end = end
 
-def extract_go_api(source: str) -> List[ApiItem]:
+    def before(self, start: int) -> Optional[str]:
+        if self.parts and self._adjacent(start):
+            return "\n".join(self.parts).strip() or None
+        return None
+
+
+# Go exported declarations. Top-level declarations start in column 0 (gofmt); members of
+# const/var/type groups and struct fields are matched at the indentation of the block's first
+# line and only while such a block is open.
+GO_SCANNER = LazyPattern(
+    r"^[ \t]*//(?P<comment>[^\n]*)"
+    r"|^func[ \t]*(?:\((?P<receiver>[^)\n]*)\)[ \t]*)?(?P<func>[A-Z][A-Za-z0-9_]*)[ \t]*[\[(]"
+    r"|^(?P<group>const|var|type)[ \t]*\([ \t]*(?://[^\n]*)?\r?$"
+    r"|^type[ \t]+(?P<type>[A-Z][A-Za-z0-9_]*)(?:\[[^\n]*?\])?[ \t]+(?:=[ \t]*)?(?P<struct>struct[ \t]*\{[ \t]*\r?$)?"
+    r"|^(?P<value_kind>const|var)[ \t]+(?P<value>[A-Z][A-Za-z0-9_]*)"
+    r"|^(?P<close>[)}])"
+    r"|^(?P<indent>[ \t]+)(?P<member>[A-Z][A-Za-z0-9_]*(?:[ \t]*,[ \t]*[A-Z][A-Za-z0-9_]*)*)\b",
+    re.MULTILINE,
+)
+GO_RECEIVER_TYPE = LazyPattern(r"([A-Za-z_][A-Za-z0-9_]*)\s*(?:\[[^\]]*\])?\s*$")
+# Indentation of the first non-blank line after a block opener
+GO_BLOCK_INDENT = LazyPattern(r"[^\n]*\n(?:[ \t]*\r?\n)*([ \t]+)\S")
+
+
+def _go_block_indent(source: str, pos: int) -> Optional[str]:
+    m = GO_BLOCK_INDENT.match(source, pos)
+    return m.group(1) if m else None
+
+
+def extract_go_api(source: Union[str, SourceIndex]) -> List[ApiItem]:
+    index = _as_index(source)
+    src = index.source
+    docs = DocComments(src)
     items: List[ApiItem] = []
-    lines = source.splitlines()
-    for idx, line in enumerate(lines, start=1):
-        stripped = line.strip()
-        m = GO_FUNC.match(stripped)
-        if m:
-            doc = _extract_line_comments_before(source, idx, ("//",))
-            items.append(ApiItem("function", m.group(1), line, idx, doc))
+    group_kind: Optional[str] = None
+    group_doc: Optional[str] = None
+    struct_name: Optional[str] = None
+    member_indent: Optional[str] = None
+    for m in GO_SCANNER.finditer(src):
+        kind = m.lastgroup
+        start = m.start()
+        if kind == "comment":
+            docs.add_line(start, m.end(), m.group("comment").strip())
+            continue
+        if kind == "close":
+            if m.group("close") == ")":
+                group_kind = None
+            else:
+                struct_name = None
+            member_indent = None
             continue
-        m = GO_TYPE.match(stripped)
-        if m:
-            doc = _extract_line_comments_before(source, idx, ("//",))
-            items.append(ApiItem("type", m.group(1), line, idx, doc))
+        if kind == "member":
+            if (group_kind is None and struct_name is None) or m.group("indent") != member_indent:
+                continue
+            idx = index.line_number(start)
+            doc = docs.before(start) or (group_doc if struct_name is None else None)
+            for name in m.group("member").split(","):
+                name = name.strip()
+                if struct_name is not None:
+                    items.append(ApiItem("field", f"{struct_name}.{name}", index.lines[idx - 1], idx, doc))
+                else:
+                    items.append(ApiItem(group_kind, name, index.lines[idx - 1], idx, doc))
             continue
-        m = GO_CONST.match(stripped)
-        if m:
-            doc = _extract_line_comments_before(source, idx, ("//",))
-            items.append(ApiItem("const", m.group(1), line, idx, doc))
+        if kind == "group":
+            group_kind = m.group("group")
+            group_doc = docs.before(start)
+            member_indent = _go_block_indent(src, m.end())
             continue
+        idx = index.line_number(start)
+        line = index.lines[idx - 1]
+        doc = docs.before(start)
+        if kind == "func":
+            receiver = m.group("receiver")
+            owner = GO_RECEIVER_TYPE.search(receiver) if receiver else None
+            if owner:
+                items.append(ApiItem("method", f"{owner.group(1)}.{m.group('func')}", line, idx, doc))
+            else:
+                items.append(ApiItem("function", m.group("func"), line, idx, doc))
+        elif kind in ("type", "struct"):
+            name = m.group("type")
+            items.append(ApiItem("type", name, line, idx, doc))
+            if m.group("struct"):
+                struct_name = name
+                member_indent = _go_block_indent(src, m.end())
+        else:
+            items.append(ApiItem(m.group("value_kind"), m.group("value"), line, idx, doc))
     return items
 
 
+def _scan_c_style(
+    index: SourceIndex, scanner: LazyPattern, transparent: Tuple[str, ...]
+) -> Iterator[Tuple["re.Match[str]", int, Optional[str]]]:
+    # Shared Rust/Java pass: /** */ blocks and // runs feed DocComments, every other match is
+    # yielded with its line number and doc comment
+    src = index.source
+    docs = DocComments(src, transparent)
+    for m in scanner.finditer(src):
+        kind = m.lastgroup
+        if kind == "block":
+            docs.add_block(m.end(), m.group(0))
+        elif kind == "comment":
+            docs.add_line(m.start(), m.end(), m.group("comment").lstrip("/").strip())
+        else:
+            start = m.start()
+            yield m, index.line_number(start), docs.before(start)
+
+
+DOC_BLOCK = r"^[ \t]*/\*\*(?P<block>(?:[^*]|\*(?!/))*)\*/[ \t]*\r?$|^[ \t]*//(?P<comment>[^\n]*)"
+
 # Rust
-RUST_PUB = re.compile(r"^\s*pub\s+(fn|struct|enum|trait|mod|const)\s+([A-Za-z0-9_]+)")
+RUST_SCANNER = LazyPattern(
+    DOC_BLOCK + r"|^[ \t]*pub[ \t]+(?:(?:async|unsafe|const|extern(?:[ \t]+\"[^\"\n]*\")?)[ \t]+)*"
+    r"(?P<kind>fn|struct|enum|trait|mod|const|static|type|union)[ \t]+(?P<name>[A-Za-z0-9_]+)",
+    re.MULTILINE,
+)
 
 
-def extract_rust_api(source: str) -> List[ApiItem]:
-    items: List[ApiItem] = []
-    lines = source.splitlines()
-    for idx, line in enumerate(lines, start=1):
-        m = RUST_PUB.match(line)
-        if m:
-            # Extract doc comments (/// or /** */)
-            block_doc = _extract_jsdoc_before(source, idx)
-            line_doc = _extract_line_comments_before(source, idx, ("///",))
-            doc = block_doc or line_doc
-            items.append(ApiItem(m.group(1), m.group(2), line, idx, doc))
-    return items
+def extract_rust_api(source: Union[str, SourceIndex]) -> List[ApiItem]:
+    index = _as_index(source)
+    return [
+        ApiItem(m.group("kind"), m.group("name"), index.lines[idx - 1], idx, doc)
+        for m, idx, doc in _scan_c_style(index, RUST_SCANNER, ("#[",))
+    ]
 
 
 # Java
-JAVA_PUBLIC_CLASS = re.compile(r"^\s*public\s+(?:abstract\s+|final\s+)?(class|interface|enum)\s+([A-Za-z0-9_]+)")
-JAVA_PUBLIC_METHOD = re.compile(r"^\s*public\s+(?:static\s+)?[\w<>,\[\]\s]+\s+([A-Za-z0-9_]+)\s*\(")
+JAVA_SCANNER = LazyPattern(
+    DOC_BLOCK
+    + r"|^[ \t]*public[ \t]+(?:(?:abstract|final|static|sealed|non-sealed|strictfp)[ \t]+)*"
+    r"(?P<type_kind>class|interface|enum|record)[ \t]+(?P<type>[A-Za-z0-9_]+)"
+    r"|^[ \t]*public[ \t]+(?:(?:static|final|abstract|synchronized|default|native|strictfp)[ \t]+)*"
+    r"[\w<>,.?\[\] \t]+?[ \t]+(?P<method>[A-Za-z0-9_]+)[ \t]*\(",
+    re.MULTILINE,
+)
 
 
-def extract_java_api(source: str) -> List[ApiItem]:
+def extract_java_api(source: Union[str, SourceIndex]) -> List[ApiItem]:
+    index = _as_index(source)
     items: List[ApiItem] = []
-    lines = source.splitlines()
-    for idx, line in enumerate(lines, start=1):
-        m = JAVA_PUBLIC_CLASS.match(line)
-        if m:
-            doc = _extract_jsdoc_before(source, idx)
-            kind, name = m.group(1), m.group(2)
-            items.append(ApiItem(kind, name, line, idx, doc))
-            continue
-        m = JAVA_PUBLIC_METHOD.match(line)
-        if m:
-            doc = _extract_jsdoc_before(source, idx)
-            name = m.group(1)
-            items.append(ApiItem("method", name, line, idx, doc))
-            continue
+    for m, idx, doc in _scan_c_style(index, JAVA_SCANNER, ("@",)):
+        if m.lastgroup == "type":
+            items.append(ApiItem(m.group("type_kind"), m.group("type"), index.lines[idx - 1], idx, doc))
+        else:
+            items.append(ApiItem("method", m.group("method"), index.lines[idx - 1], idx, doc))
     return items
 
 
-LANGUAGE_EXTRACTORS = {
-    "javascript": extract_js_ts_exports,
-    "typescript": extract_js_ts_exports,
-    "python": extract_python_api,
-    "go": extract_go_api,
-    "rust": extract_rust_api,
-    "java": extract_java_api,
-}
+def to_module_path(rel_path: Path) -> str:
+    return ".".join(rel_path.with_suffix("").parts)
+
 
+# Built-in backends. Registering them only records their extensions; each is instantiated
+# and its patterns compiled when the first file of the language is read.
 
-def to_module_path(file_path: Path) -> str:
-    rel = file_path.relative_to(REPO_ROOT).with_suffix("")
-    return ".".join(rel.parts)
+@LANGUAGES.add
+class JavaScriptBackend(LanguageBackend):
+    name = "javascript"
+    extensions = (".js", ".jsx")
+    aliases = ("js", "jsx")
+    fence = "js"
+    patterns = (
+        JS_EXPORT_SCANNER,
+        JS_FROM_CLAUSE,
+        JS_EXPORT_ALIAS,
+        REACT_DECLARATION,
+        REACT_COMPONENT_TYPE,
+        REACT_RETURN_TYPE,
+        JSX_RETURN,
+    )
+    sparse_candidates = (
+        LazyPattern(rb"exports?\b(?:\s*=?\s*\{[^}]*\})?"),
+        LazyPattern(rb"import\b"),
+        LazyPattern(rb"require\("),
+        LazyPattern(rb"\n(?:export[ \t]+(?:default[ \t]+)?)?(?:async[ \t]+)?(?:function|const|let|var|class)\b"),
+        LazyPattern(rb"return[\s(]*<[A-Za-z>]"),
+        LazyPattern(rb"=>[\s(]*<[A-Za-z>]"),
+    )
+    import_patterns = (
+        LazyPattern(r"^\s*import\s+.*?from\s+['\"]([^'\"]+)['\"];?", re.MULTILINE),
+        LazyPattern(r"^\s*const\s+.*?=\s*require\(['\"]([^'\"]+)['\"]\)\s*;?", re.MULTILINE),
+        LazyPattern(r"^\s*export\s+\*\s+from\s+['\"]([^'\"]+)['\"];?", re.MULTILINE),
+        LazyPattern(r"^\s*export\s*\{[^}]*\}\s*from\s*['\"]([^'\"]+)['\"];?", re.MULTILINE),
+    )
 
+    def extract(self, index: SourceIndex) -> List[ApiItem]:
+        return extract_js_ts_exports(index)
 
-def generate_usage_example(language: str, file_path: Path, item: ApiItem) -> str:
-    rel_path_no_ext = file_path.relative_to(REPO_ROOT).with_suffix("")
-    module_path = to_module_path(file_path)
+    def reexports(self, index: SourceIndex, items: List[ApiItem]) -> List[Tuple[int, str, str, str]]:
+        return js_ts_reexports(index, items)
 
-    if language in ("javascript", "typescript"):
-        ext = "ts" if language == "typescript" else "js"
+    def usage_example(self, rel_path: Path, item: ApiItem) -> str:
+        ext = self.fence
+        path = rel_path.with_suffix("").as_posix()
         if item.kind == "component":
-            return f"```{ext}\nimport {{ {item.name} }} from './{rel_path_no_ext.as_posix()}';\n\n<{item.name} /* props */ />\n```"
-        if item.kind in {"function", "const", "let", "var", "export"} and item.name != "default":
-            return f"```{ext}\nimport {{ {item.name} }} from './{rel_path_no_ext.as_posix()}';\n\nconst result = {item.name}(/* arguments */);\nconsole.log(result);\n```"
+            return f"```{ext}\nimport {{ {item.name} }} from './{path}';\n\n<{item.name} /* props */ />\n```"
+        if item.kind in {"function", "const", "let", "var", "export", "re-export"} and item.name not in ("default", "*"):
+            return f"```{ext}\nimport {{ {item.name} }} from './{path}';\n\nconst result = {item.name}(/* arguments */);\nconsole.log(result);\n```"
         if item.name == "default":
-            return f"```{ext}\nimport Thing from './{rel_path_no_ext.as_posix()}';\n\nThing(/* arguments */);\n```"
+            return f"```{ext}\nimport Thing from './{path}';\n\nThing(/* arguments */);\n```"
         if item.kind == "class":
-            return f"```{ext}\nimport {{ {item.name} }} from './{rel_path_no_ext.as_posix()}';\n\nconst instance = new {item.name}(/* constructor args */);\n```"
-        return f"```{ext}\n// Import types or re-exports from './{rel_path_no_ext.as_posix()}'\n```"
+            return f"```{ext}\nimport {{ {item.name} }} from './{path}';\n\nconst instance = new {item.name}(/* constructor args */);\n```"
+        return f"```{ext}\n// Import types or re-exports from './{path}'\n```"
+
+
+@LANGUAGES.add
+class TypeScriptBackend(JavaScriptBackend):
+    name = "typescript"
+    extensions = (".ts", ".tsx")
+    aliases = ("ts", "tsx")
+    fence = "ts"
 
-    if language == "python":
+
+@LANGUAGES.add
+class PythonBackend(LanguageBackend):
+    # Python is parsed whole with ast, so it has no sparse candidates and its imports come
+    # from the same parse
+    name = "python"
+    extensions = (".py",)
+    aliases = ("py",)
+
+    def extract(self, index: SourceIndex) -> List[ApiItem]:
+        return extract_python_api(index)
+
+    def extract_module(self, index: SourceIndex) -> Tuple[List[ApiItem], Optional[Iterable[str]]]:
+        return extract_python_module(index)
+
+    def resolve_import(self, resolver: "ImportResolver", directory: Path, spec: str) -> Optional[Path]:
+        return resolver.resolve_python(directory, spec)
+
+    def usage_example(self, rel_path: Path, item: ApiItem) -> str:
+        module_path = to_module_path(rel_path)
         if item.kind in {"function", "export"}:
             return f"```python\nfrom {module_path} import {item.name}\n\nresult = {item.name}(# arguments)\nprint(result)\n```"
         if item.kind == "class":
-            return f"```python\nfrom {module_path} import {item.name}\n\nobj = {item.name}(# constructor args)\n```"
+            return f"```python\nfrom {module_path} import {item.name.split('.')[0]}\n\nobj = {item.name}(# constructor args)\n```"
+        if item.kind in {"method", "property"}:
+            owner, _, member = item.name.rpartition(".")
+            access = f"{member}(# arguments)" if item.kind == "method" else member
+            return f"```python\nfrom {module_path} import {owner.split('.')[0]}\n\nobj = {owner}(# constructor args)\nobj.{access}\n```"
         return "```python\n# Usage example\n```"
 
-    if language == "go":
+
+@LANGUAGES.add
+class GoBackend(LanguageBackend):
+    name = "go"
+    extensions = (".go",)
+    aliases = ("golang",)
+    patterns = (GO_SCANNER, GO_RECEIVER_TYPE, GO_BLOCK_INDENT)
+    # Group members and struct fields sit below their opener, so indented exported names and
+    # the closing `)`/`}` lines are candidates too
+    sparse_candidates = (
+        LazyPattern(rb"func\b"),
+        LazyPattern(rb"type\b"),
+        LazyPattern(rb"const\b"),
+        LazyPattern(rb"var\b"),
+        LazyPattern(rb"\n[ \t]+[A-Z]"),
+        LazyPattern(rb"\n[)}]"),
+    )
+
+    def extract(self, index: SourceIndex) -> List[ApiItem]:
+        return extract_go_api(index)
+
+    def usage_example(self, rel_path: Path, item: ApiItem) -> str:
+        if item.kind in {"method", "field"}:
+            owner, _, member = item.name.rpartition(".")
+            access = f"{member}(/* args */)" if item.kind == "method" else member
+            return f"```go\n// In package usage (import path TBD)\n// var v {owner}\n// result := v.{access}\n```"
+        if item.kind == "type":
+            return f"```go\n// In package usage (import path TBD)\n// var v {item.name}\n```"
+        if item.kind in {"const", "var"}:
+            return f"```go\n// In package usage (import path TBD)\n// value := {item.name}\n```"
         return "```go\n// In package usage (import path TBD)\n// result := {name}(/* args */)\n```".replace("{name}", item.name)
 
-    if language == "rust":
+
+@LANGUAGES.add
+class RustBackend(LanguageBackend):
+    name = "rust"
+    extensions = (".rs",)
+    aliases = ("rs",)
+    patterns = (RUST_SCANNER, BLOCK_DOC_MARKUP)
+    sparse_candidates = (LazyPattern(rb"pub\s"),)
+
+    def extract(self, index: SourceIndex) -> List[ApiItem]:
+        return extract_rust_api(index)
+
+    def usage_example(self, rel_path: Path, item: ApiItem) -> str:
         return "```rust\n// use crate::path::to::{name};\n// let result = {name}(/* args */);\n```".replace("{name}", item.name)
 
-    if language == "java":
+
+@LANGUAGES.add
+class JavaBackend(LanguageBackend):
+    name = "java"
+    extensions = (".java",)
+    patterns = (JAVA_SCANNER, BLOCK_DOC_MARKUP)
+    sparse_candidates = (LazyPattern(rb"public\s"),)
+
+    def extract(self, index: SourceIndex) -> List[ApiItem]:
+        return extract_java_api(index)
+
+    def usage_example(self, rel_path: Path, item: ApiItem) -> str:
         if item.kind in {"class", "interface", "enum"}:
             return (
                 "```java\n// Example usage\n{ClassName} obj = new {ClassName}();\n```".replace("{ClassName}", item.name)
@@ -463,28 +1561,22 @@ def generate_usage_example(language: str, file_path: Path, item: ApiItem) -> str
             )
         return "```java\n// Usage example\n```"
 
-    return "```\n// Usage example\n```"
 
+def generate_usage_example(
+    language: str, rel_path: Path, item: ApiItem, registry: LanguageRegistry = LANGUAGES
+) -> str:
+    if language not in registry:
+        return LanguageBackend().usage_example(rel_path, item)
+    return registry.get(language).usage_example(rel_path, item)
 
-# Import graph
-
-def resolve_imports(language: str, file_path: Path, source: str) -> Set[str]:
-    modules: Set[str] = set()
-    patterns = IMPORT_PATTERNS.get(language)
-    if not patterns:
-        return modules
-    for pat in patterns:
-        for m in pat.finditer(source):
-            mod = m.group(1)
-            modules.add(mod)
-    return modules
 
+# Import graph
 
-def map_repo_modules(files: List[Path]) -> Dict[str, Path]:
+def map_repo_modules(files: List[Path], root: Path) -> Dict[str, Path]:
     # Map probable import specifiers to file paths (for intra-repo edges)
     mapping: Dict[str, Path] = {}
     for fp in files:
-        rel = fp.relative_to(REPO_ROOT)
+        rel = fp.relative_to(root)
         # JS/TS import without extension
         mapping[rel.with_suffix("").as_posix()] = fp
         # Python dotted
@@ -492,181 +1584,2734 @@ def map_repo_modules(files: List[Path]) -> Dict[str, Path]:
     return mapping
 
 
-# --- Output generation ---
+def _load_jsonc(path: Path) -> Optional[Dict]:
+    # tsconfig files allow comments and trailing commas
+    try:
+        text = path.read_text(encoding="utf-8")
+    except OSError:
+        return None
+    text = re.sub(r'("(?:\\.|[^"\\])*")|//[^\n]*|/\*[\s\S]*?\*/', lambda m: m.group(1) or "", text)
+    text = re.sub(r",(\s*[}\]])", r"\1", text)
+    try:
+        data = json.loads(text)
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
 
-def generate_module_markdown(mod: ModuleDoc) -> str:
-    lines: List[str] = []
-    rel = mod.file_path.relative_to(REPO_ROOT).as_posix()
-    lines.append(f"# `{rel}`\n")
-    for item in mod.items:
-        lines.append(f"## {item.kind}: `{item.name}`\n")
-        if item.description:
-            lines.append(item.description + "\n")
-        lines.append("Signature:\n")
-        lines.append(f"```\n{item.signature}\n```\n")
-        lines.append("Usage:\n")
-        lines.append(generate_usage_example(mod.language, mod.file_path, item) + "\n")
-    return "\n".join(lines)
 
+class ImportResolver:
+    # Resolves import specifiers to discovered repo files using set/dict lookups only.
+    # Handles relative paths (with extension probing and index/__init__ directory imports),
+    # Python relative and dotted imports, tsconfig `paths` aliases from the nearest
+    # tsconfig.json, and repo-root absolute specifiers. Results are memoized per
+    # (directory, importing language, specifier).
+    EXTENSIONS = ("", ".ts", ".tsx", ".js", ".jsx", ".py")
+    INDEX_FILES = ("index.ts", "index.tsx", "index.js", "index.jsx", "__init__.py")
 
-def generate_index_markdown(modules: List[ModuleDoc], split: bool) -> str:
-    lines: List[str] = []
-    lines.append("# API Reference\n")
-    lines.append("Auto-generated documentation of public APIs, functions, classes, and components.\n")
-    counts: Dict[str, int] = {}
-    for m in modules:
-        counts[m.language] = counts.get(m.language, 0) + len(m.items)
-    if not modules:
-        lines.append("\n> No public APIs detected.\n")
-        return "\n".join(lines)
-    lines.append("\n## Summary\n")
-    for lang, cnt in sorted(counts.items()):
-        lines.append(f"- {lang.title()}: {cnt} items")
-    lines.append("\n## Modules\n")
-    for m in sorted(modules, key=lambda x: x.file_path.as_posix()):
-        rel = m.file_path.relative_to(REPO_ROOT).as_posix()
-        if split:
-            out_rel = module_output_path(m).relative_to(DEFAULT_OUTPUT_DIR).as_posix()
-            lines.append(f"- `{rel}` — see [{out_rel}]({out_rel})")
-        else:
-            lines.append(f"- `{rel}`")
-    return "\n".join(lines)
+    def __init__(self, files: List[Path], root: Path, registry: LanguageRegistry = LANGUAGES) -> None:
+        self.root = root
+        self.registry = registry
+        self.file_set: Set[Path] = set(files)
+        self.repo_map = map_repo_modules(files, root)
+        # Directory imports: "pkg" -> pkg/__init__.py, "packages/ui/src" -> packages/ui/src/index.ts
+        for fp in sorted(files):
+            if fp.name in self.INDEX_FILES:
+                rel_dir = fp.parent.relative_to(root)
+                self.repo_map.setdefault(rel_dir.as_posix(), fp)
+                self.repo_map.setdefault(".".join(rel_dir.parts), fp)
+        self._memo: Dict[Tuple[Path, str, str], Optional[Path]] = {}
+        self._tsconfig_for_dir: Dict[Path, Optional[Tuple[Path, Dict[str, List[str]]]]] = {}
+        self._tsconfig_files: Dict[Path, Optional[Tuple[Path, Dict[str, List[str]]]]] = {}
 
+    def resolve_all(self, fp: Path, specs: List[str]) -> List[Path]:
+        targets: List[Path] = []
+        for spec in specs:
+            target = self.resolve(fp, spec)
+            if target is not None:
+                targets.append(target)
+        return targets
 
-def generate_dependency_mermaid(modules: List[ModuleDoc], import_edges: List[Tuple[Path, Path]]) -> str:
-    lines: List[str] = []
-    lines.append("# Dependency Graph\n")
-    lines.append("This graph shows intra-repository imports between documented modules.\n")
-    lines.append("\n```mermaid\n")
-    lines.append("graph LR")
-    # Map nodes to ids
-    node_ids: Dict[Path, str] = {}
-    for idx, m in enumerate(modules):
-        node_ids[m.file_path] = f"N{idx}"
-    for m in modules:
-        nid = node_ids[m.file_path]
-        label = m.file_path.relative_to(REPO_ROOT).as_posix()
-        lines.append(f"  {nid}[\"{label}\"]")
-    for a, b in import_edges:
-        if a in node_ids and b in node_ids:
-            lines.append(f"  {node_ids[a]} --> {node_ids[b]}")
-    lines.append("```\n")
-    return "\n".join(lines)
+    def resolve(self, fp: Path, spec: str) -> Optional[Path]:
+        # The importing file's backend picks the strategy: path-like (the default) or Python
+        lang = self.registry.language_for(fp)
+        key = (fp.parent, lang, spec)
+        try:
+            return self._memo[key]
+        except KeyError:
+            pass
+        if lang is None:
+            target = self.resolve_path(fp.parent, spec)
+        else:
+            target = self.registry.get(lang).resolve_import(self, fp.parent, spec)
+        self._memo[key] = target
+        return target
 
+    def _probe(self, base: Path) -> Optional[Path]:
+        # Try the path as given, with each extension, then as a directory with an index file
+        for ext in self.EXTENSIONS:
+            try:
+                cand = base.with_suffix(ext) if ext else base
+            except ValueError:
+                continue
+            if cand in self.file_set:
+                return cand
+        for name in self.INDEX_FILES:
+            cand = base / name
+            if cand in self.file_set:
+                return cand
+        return None
+
+    def resolve_path(self, directory: Path, spec: str) -> Optional[Path]:
+        if spec.startswith("."):
+            return self._probe(Path(os.path.normpath(directory / spec)))
+        aliased = self._tsconfig_paths(directory)
+        if aliased is not None:
+            base_dir, paths = aliased
+            for pattern, targets in paths.items():
+                star = pattern.find("*")
+                if star == -1:
+                    if spec != pattern:
+                        continue
+                    captured = ""
+                else:
+                    prefix, suffix = pattern[:star], pattern[star + 1:]
+                    if not (spec.startswith(prefix) and spec.endswith(suffix) and len(spec) >= len(prefix) + len(suffix)):
+                        continue
+                    captured = spec[len(prefix):len(spec) - len(suffix)]
+                for target in targets:
+                    found = self._probe(Path(os.path.normpath(base_dir / target.replace("*", captured))))
+                    if found is not None:
+                        return found
+        # Absolute-like: look up in mapping
+        return self.repo_map.get(spec)
 
-def module_output_path(mod: ModuleDoc) -> Path:
-    rel = mod.file_path.relative_to(REPO_ROOT)
-    return SPLIT_OUTPUT_BASE / mod.language / rel.with_suffix(".md")
+    def resolve_python(self, directory: Path, spec: str) -> Optional[Path]:
+        if not spec.startswith("."):
+            return self.repo_map.get(spec)
+        level = len(spec) - len(spec.lstrip("."))
+        base = directory
+        for _ in range(level - 1):
+            base = base.parent
+        rest = spec[level:]
+        if rest:
+            base = base.joinpath(*rest.split("."))
+        for cand in (base.with_name(base.name + ".py"), base / "__init__.py"):
+            if cand in self.file_set:
+                return cand
+        return None
 
+    def _tsconfig_paths(self, directory: Path) -> Optional[Tuple[Path, Dict[str, List[str]]]]:
+        # Nearest tsconfig.json at or above `directory`, within the repo
+        if directory in self._tsconfig_for_dir:
+            return self._tsconfig_for_dir[directory]
+        result = None
+        config_path = directory / "tsconfig.json"
+        if config_path.is_file():
+            result = self._load_tsconfig(config_path)
+        elif directory != self.root and self.root in directory.parents:
+            result = self._tsconfig_paths(directory.parent)
+        self._tsconfig_for_dir[directory] = result
+        return result
 
-def write_split_docs(modules: List[ModuleDoc], output_dir: Path) -> None:
-    for mod in modules:
-        out_path = module_output_path(mod)
-        out_path.parent.mkdir(parents=True, exist_ok=True)
-        out_path.write_text(generate_module_markdown(mod), encoding="utf-8")
+    def _load_tsconfig(self, config_path: Path, depth: int = 0) -> Optional[Tuple[Path, Dict[str, List[str]]]]:
+        # Returns (directory `paths` are relative to, paths), following relative `extends`
+        if config_path in self._tsconfig_files:
+            return self._tsconfig_files[config_path]
+        self._tsconfig_files[config_path] = None
+        data = _load_jsonc(config_path) or {}
+        options = data.get("compilerOptions") or {}
+        result = None
+        paths = options.get("paths")
+        if isinstance(paths, dict):
+            base_dir = config_path.parent / options.get("baseUrl", ".")
+            clean = {k: [t for t in v if isinstance(t, str)] for k, v in paths.items() if isinstance(v, list)}
+            result = (Path(os.path.normpath(base_dir)), clean)
+        else:
+            extends = data.get("extends")
+            if isinstance(extends, str) and extends.startswith(".") and depth < 8:
+                parent = Path(os.path.normpath(config_path.parent / extends))
+                if parent.suffix != ".json":
+                    parent = parent.with_name(parent.name + ".json")
+                result = self._load_tsconfig(parent, depth + 1)
+        self._tsconfig_files[config_path] = result
+        return result
 
 
-def write_single_file(modules: List[ModuleDoc], output_file: Path) -> None:
-    lines: List[str] = []
-    lines.append(generate_index_markdown(modules, split=False))
-    for mod in sorted(modules, key=lambda m: m.file_path.as_posix()):
-        lines.append("\n---\n")
-        lines.append(generate_module_markdown(mod))
-    output_file.parent.mkdir(parents=True, exist_ok=True)
-    output_file.write_text("\n".join(lines), encoding="utf-8")
+# --- Fault isolation ---
 
+# Skip reasons reported as failures; results with these are never cached
+FAILURE_REASONS = ("unreadable", "error", "timeout", "crashed")
+# Failures that quarantine a file until it changes
+QUARANTINE_REASONS = ("timeout", "crashed")
+QUARANTINE_VERSION = 1
 
-# --- CLI and main ---
 
-def load_config(config_path: Optional[Path]) -> Dict:
-    paths = [config_path] if config_path else CONFIG_FILES
-    for p in paths:
-        if p and p.exists():
+def _guarded_worker(conn: Any, plugins: List[Tuple[str, Tuple[str, ...], str, Tuple[str, ...]]]) -> None:
+    # Runs each received batch of tasks, replying once per task as it finishes
+    install_language_plugins(plugins)
+    while True:
+        try:
+            batch = conn.recv()
+        except EOFError:
+            return
+        if batch is None:
+            return
+        fn, tasks = batch
+        for args in tasks:
             try:
-                return json.loads(p.read_text(encoding="utf-8"))
+                reply = (True, fn(*args))
+            except Exception as exc:
+                reply = (False, f"{type(exc).__name__}: {exc}")
+            conn.send(reply)
+
+
+class _GuardedWorker:
+    def __init__(self, ctx: Any, plugins: List[Tuple[str, Tuple[str, ...], str, Tuple[str, ...]]]) -> None:
+        self.conn, child = ctx.Pipe()
+        self.process = ctx.Process(target=_guarded_worker, args=(child, plugins), name="docsgen-extract", daemon=True)
+        self.process.start()
+        child.close()
+        # Sent and unanswered tasks, the running one first, and when it started
+        self.tasks: "deque[Tuple[Future, tuple]]" = deque()
+        self.started = 0.0
+
+    def stop(self, kill: bool) -> None:
+        if kill:
+            self.process.kill()
+        else:
+            try:
+                self.conn.send(None)
+            except OSError:
+                self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+class GuardedProcessPool:
+    # Process pool that gives each task `timeout` seconds (0: no limit). A supervisor thread
+    # hands idle workers batches of tasks, and workers reply per task, so every task has its
+    # own deadline. A worker that runs over is killed and replaced; its task resolves to
+    # fallback(args, "timeout", detail) and the rest of its batch is queued again. A task
+    # whose worker died or that raised resolves to the fallback with "crashed" or "error".
+    # Futures never fail, so one bad input costs at most one budget and one worker restart.
+    MAX_BATCH = 32
+
+    def __init__(
+        self,
+        workers: int,
+        fn: Callable[..., Any],
+        fallback: Callable[[tuple, str, str], Any],
+        timeout: float = 0.0,
+        registry: LanguageRegistry = LANGUAGES,
+    ) -> None:
+        self.size = max(1, workers)
+        self.fn = fn
+        self.fallback = fallback
+        self.timeout = timeout
+        import multiprocessing
+
+        self.ctx = multiprocessing.get_context()
+        self.plugins = registry.plugins
+        self.workers: List[_GuardedWorker] = []
+        self.queue: "deque[Tuple[Future, tuple]]" = deque()
+        self.lock = threading.Lock()
+        self.wake_reader, self.wake_writer = self.ctx.Pipe(duplex=False)
+        self.wake_pending = False
+        self.closing = False
+        self.cancelled = False
+        self.thread = threading.Thread(target=self._supervise, name="docsgen-supervise", daemon=True)
+        self.thread.start()
+
+    def submit(self, *args: Any) -> "Future":
+        from concurrent.futures import Future
+
+        future: Future = Future()
+        with self.lock:
+            if self.closing:
+                raise RuntimeError("submit() after shutdown()")
+            self.queue.append((future, args))
+            self._wake()
+        return future
+
+    def shutdown(self, wait: bool = True, cancel_futures: bool = False) -> None:
+        # Same arguments as Executor.shutdown; cancel_futures also kills busy workers
+        with self.lock:
+            self.closing = True
+            self.cancelled = cancel_futures
+            self._wake()
+        if wait:
+            self.thread.join()
+            self.wake_reader.close()
+            self.wake_writer.close()
+
+    def _drop_queued(self) -> None:
+        # Called with the lock held
+        for future, args in self.queue:
+            if not future.cancel() and not future.done():
+                future.set_result(self.fallback(args, "crashed", "cancelled"))
+        self.queue.clear()
+
+    def _wake(self) -> None:
+        # Called with the lock held; one pending wake-up is enough for any number of submits
+        if not self.wake_pending:
+            self.wake_pending = True
+            self.wake_writer.send_bytes(b"")
+
+    def _dispatch(self) -> bool:
+        # Hands queued tasks to idle workers, starting workers up to the pool size. Returns
+        # False once the pool is shut down and every task is finished.
+        batches: List[List[Tuple[Future, tuple]]] = []
+        with self.lock:
+            if self.cancelled:
+                self._drop_queued()
+            idle = [w for w in self.workers if not w.tasks]
+            slots = len(idle) + self.size - len(self.workers)
+            # Batches shrink as the queue drains so that the workers finish together
+            batch_size = max(1, min(self.MAX_BATCH, len(self.queue) // (self.size * 4)))
+            while self.queue and len(batches) < slots:
+                batch = []
+                while self.queue and len(batch) < batch_size:
+                    future, args = self.queue.popleft()
+                    # Tasks requeued from a retired worker are already running
+                    if future.running() or future.set_running_or_notify_cancel():
+                        batch.append((future, args))
+                if batch:
+                    batches.append(batch)
+            if self.closing and not self.queue and not batches and not any(w.tasks for w in self.workers):
+                return False
+        for batch in batches:
+            if idle:
+                worker = idle.pop()
+            else:
+                worker = _GuardedWorker(self.ctx, self.plugins)
+                self.workers.append(worker)
+            worker.tasks.extend(batch)
+            worker.started = time.monotonic()
+            try:
+                worker.conn.send((self.fn, [args for _, args in batch]))
+            except OSError as exc:
+                self._retire(worker, "crashed", f"cannot reach worker: {exc}")
+        return True
+
+    def _retire(self, worker: _GuardedWorker, reason: str, detail: str) -> None:
+        # Kills `worker`, resolves its running task to the fallback and requeues the others
+        future, args = worker.tasks.popleft()
+        worker.stop(kill=True)
+        self.workers.remove(worker)
+        with self.lock:
+            self.queue.extendleft(reversed(worker.tasks))
+        worker.tasks.clear()
+        future.set_result(self.fallback(args, reason, detail))
+
+    def _collect(self) -> None:
+        # Waits for a reply, a worker exit, a wake-up or the earliest deadline
+        from multiprocessing.connection import wait as wait_ready
+
+        busy = [w for w in self.workers if w.tasks]
+        timeout = None
+        if self.timeout and busy:
+            timeout = max(0.0, min(w.started for w in busy) + self.timeout - time.monotonic())
+        ready = wait_ready([self.wake_reader] + [w.conn for w in busy] + [w.process.sentinel for w in busy], timeout)
+        if self.wake_reader in ready:
+            with self.lock:
+                while self.wake_reader.poll():
+                    self.wake_reader.recv_bytes()
+                self.wake_pending = False
+        for worker in busy:
+            if self.cancelled:
+                self._retire(worker, "crashed", "cancelled")
+                continue
+            try:
+                while worker.tasks and worker.conn.poll():
+                    ok, value = worker.conn.recv()
+                    future, args = worker.tasks.popleft()
+                    worker.started = time.monotonic()
+                    future.set_result(value if ok else self.fallback(args, "error", value))
+            except (EOFError, OSError):
+                worker.process.join()
+                self._retire(worker, "crashed", f"worker exited with code {worker.process.exitcode}")
+                continue
+            if not worker.tasks:
+                continue
+            if worker.process.sentinel in ready and not worker.process.is_alive():
+                self._retire(worker, "crashed", f"worker exited with code {worker.process.exitcode}")
+            elif self.timeout and time.monotonic() - worker.started >= self.timeout:
+                self._retire(worker, "timeout", f"exceeded the {self.timeout:g}s budget")
+
+    def _supervise(self) -> None:
+        try:
+            while self._dispatch():
+                self._collect()
+        finally:
+            for worker in self.workers:
+                for future, args in worker.tasks:
+                    if not future.done():
+                        future.set_result(self.fallback(args, "crashed", "pool stopped"))
+                worker.stop(kill=bool(worker.tasks))
+            self.workers = []
+            with self.lock:
+                self._drop_queued()
+
+
+def failed_extraction(args: tuple, reason: str, detail: str, registry: LanguageRegistry = LANGUAGES) -> FileExtraction:
+    # GuardedProcessPool fallback for extract_file and extract_source, whose first argument is the path
+    fp = args[0]
+    return FileExtraction(registry.language_for(fp) or "", fp, "", skipped=reason, error=detail)
+
+
+class Quarantine:
+    # Files whose extraction timed out or crashed its worker, keyed by repo-relative path with
+    # the mtime and size they had then. They are skipped without being read until either
+    # changes or, for timeouts, until a run has a larger budget.
+    FILE_NAME = "quarantine.json"
+
+    def __init__(
+        self, path: Optional[Path], root: Path, timeout: float = 0.0, registry: LanguageRegistry = LANGUAGES
+    ) -> None:
+        self.path = path
+        self.root = root
+        self.timeout = timeout
+        self.registry = registry
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.changed = False
+        if path is not None:
+            self._load()
+
+    def _load(self) -> None:
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if isinstance(data, dict) and data.get("version") == QUARANTINE_VERSION:
+            self.entries = data.get("files") or {}
+
+    def _key(self, fp: Path) -> str:
+        return fp.relative_to(self.root).as_posix()
+
+    def get(self, fp: Path) -> Optional[FileExtraction]:
+        entry = self.entries.get(self._key(fp))
+        if entry is None:
+            return None
+        if entry["reason"] == "timeout" and (not self.timeout or self.timeout > entry["timeout"]):
+            return None
+        try:
+            st = fp.stat()
+        except OSError:
+            return None
+        if (st.st_mtime_ns, st.st_size) != (entry["mtime_ns"], entry["size"]):
+            return None
+        detail = f"{entry['reason']} on an earlier run ({entry['error']}); skipped until the file changes"
+        return FileExtraction(self.registry.language_for(fp) or "", fp, "", skipped="quarantined", error=detail)
+
+    def update(self, result: FileExtraction) -> None:
+        key = self._key(result.file_path)
+        if result.skipped in QUARANTINE_REASONS:
+            try:
+                st = result.file_path.stat()
+            except OSError:
+                return
+            self.entries[key] = {
+                "mtime_ns": st.st_mtime_ns,
+                "size": st.st_size,
+                "reason": result.skipped,
+                "error": result.error,
+                "timeout": self.timeout,
+            }
+            self.changed = True
+        elif result.skipped != "quarantined" and self.entries.pop(key, None) is not None:
+            self.changed = True
+
+    def save(self) -> None:
+        if self.path is None:
+            return
+        for key in list(self.entries):
+            if not (self.root / key).exists():
+                del self.entries[key]
+                self.changed = True
+        if not self.changed:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        payload = {"version": QUARANTINE_VERSION, "files": self.entries}
+        tmp.write_text(json.dumps(payload, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+        os.replace(tmp, self.path)
+        self.changed = False
+
+
+def failure_lines(failures: Iterable[FileExtraction], root: Path) -> List[str]:
+    failures = sorted(failures, key=lambda r: r.file_path.as_posix())
+    lines = [f"{len(failures)} file{'' if len(failures) == 1 else 's'} could not be documented:"]
+    for res in failures:
+        rel = res.file_path.relative_to(root).as_posix()
+        lines.append(f"  {res.skipped:<12} {rel}" + (f": {res.error}" if res.error else ""))
+    return lines
+
+
+# --- Extraction pipeline ---
+
+def extract_file(
+    fp: Path,
+    known_digest: Optional[str] = None,
+    max_size: int = DEFAULT_MAX_FILE_SIZE,
+    registry: LanguageRegistry = LANGUAGES,
+) -> Optional[FileExtraction]:
+    lang = registry.language_for(fp)
+    if not lang:
+        return None
+    t0 = time.perf_counter()
+    read = read_source(fp, lang, max_size, registry)
+    return extract_source(fp, lang, read, known_digest, time.perf_counter() - t0, registry)
+
+
+def extract_source(
+    fp: Path,
+    lang: str,
+    read: SourceText,
+    known_digest: Optional[str] = None,
+    read_seconds: float = 0.0,
+    registry: LanguageRegistry = LANGUAGES,
+) -> FileExtraction:
+    # Extraction of an already read file; runs wherever the read happened or in a worker
+    # process, whose module-wide LANGUAGES has the plugins of the registry that started it
+    clock = time.perf_counter
+    src = read.text
+    t1 = clock()
+    timings = {"read": read_seconds}
+    if read.skipped:
+        return FileExtraction(lang, fp, read.digest, timings=timings, size=read.size, skipped=read.skipped, error=read.error)
+    digest = read.digest
+    if known_digest is not None and digest == known_digest:
+        return FileExtraction(lang, fp, digest, unchanged=True, timings=timings, size=read.size, sparse=read.sparse)
+    helpers_before = {k: tuple(v) for k, v in _HELPER_TIMES.items()}
+    try:
+        backend = registry.get(lang)
+        index = SourceIndex(src)
+        items, specifiers = backend.extract_module(index)
+        t2 = clock()
+        # Imports only matter for documented modules. Sorted so that edge order does not
+        # depend on per-process string hashing.
+        if not items:
+            imports = []
+        elif specifiers is not None:
+            imports = sorted(specifiers)
+        else:
+            imports = sorted(backend.imports(src))
+        reexports = backend.reexports(index, items) if items else []
+    except Exception as exc:
+        # A backend that breaks on one file fails that file, not the run
+        timings[f"extract:{lang}"] = clock() - t1
+        return FileExtraction(
+            lang, fp, digest, timings=timings, size=read.size, skipped="error", error=f"{type(exc).__name__}: {exc}"
+        )
+    t3 = clock()
+    helper_seconds = 0.0
+    for name, (secs, calls) in _HELPER_TIMES.items():
+        prev_secs, prev_calls = helpers_before.get(name, (0.0, 0))
+        if calls != prev_calls:
+            timings[name] = secs - prev_secs
+            timings[name + ".calls"] = calls - prev_calls
+            helper_seconds += secs - prev_secs
+    timings[f"extract:{lang}"] = t2 - t1 - helper_seconds
+    timings["scan_imports"] = t3 - t2
+    return FileExtraction(
+        lang, fp, digest, items, imports, timings=timings, size=read.size, sparse=read.sparse, reexports=reexports
+    )
+
+
+def _iter_extractors(
+    files: List[Path],
+    digests: List[Optional[str]],
+    jobs: int,
+    max_size: int,
+    timeout: float = 0.0,
+    registry: LanguageRegistry = LANGUAGES,
+) -> Iterator[Optional[FileExtraction]]:
+    if not timeout:
+        if jobs <= 1 or len(files) < 2:
+            for fp, d in zip(files, digests):
+                yield extract_file(fp, d, max_size, registry)
+            return
+        chunksize = max(1, min(64, len(files) // (jobs * 4)))
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(jobs, initializer=install_language_plugins, initargs=(registry.plugins,)) as pool:
+            yield from pool.map(extract_file, files, digests, [max_size] * len(files), chunksize=chunksize)
+        return
+    # A time budget needs worker processes even for a serial run, so that they can be killed
+    if not files:
+        return
+    fallback = functools.partial(failed_extraction, registry=registry)
+    pool = GuardedProcessPool(min(jobs, len(files)), extract_file, fallback, timeout, registry)
+    try:
+        futures = [pool.submit(fp, d, max_size) for fp, d in zip(files, digests)]
+        for future in futures:
+            yield future.result()
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+
+def iter_extract_files(
+    files: List[Path],
+    jobs: int = 1,
+    cache: Optional["ExtractionCache"] = None,
+    max_size: int = DEFAULT_MAX_FILE_SIZE,
+    timeout: float = 0.0,
+    quarantine: Optional[Quarantine] = None,
+    registry: LanguageRegistry = LANGUAGES,
+) -> Iterator[Optional[FileExtraction]]:
+    # Yields results in the order of `files` regardless of `jobs`, cache hits and quarantined
+    # files, each as soon as it and everything before it is available. With a `timeout`, each
+    # file is extracted in a worker that is killed once the file runs over it.
+    hits: Dict[int, FileExtraction] = {}
+    pending: List[Path] = []
+    digests: List[Optional[str]] = []
+    for i, fp in enumerate(files):
+        hit = cache.get(fp, max_size) if cache else None
+        if hit is None and quarantine is not None:
+            hit = quarantine.get(fp)
+        if hit is not None:
+            hits[i] = hit
+            continue
+        pending.append(fp)
+        digests.append(cache.known_digest(fp) if cache else None)
+    extracted = _iter_extractors(pending, digests, jobs, max_size, timeout, registry)
+    for i in range(len(files)):
+        hit = hits.pop(i, None)
+        if hit is not None:
+            yield hit
+            continue
+        res = next(extracted)
+        if res is not None:
+            if quarantine is not None:
+                quarantine.update(res)
+            if cache is not None:
+                res = cache.store(res)
+        yield res
+
+
+def extract_files(
+    files: List[Path],
+    jobs: int = 1,
+    cache: Optional["ExtractionCache"] = None,
+    max_size: int = DEFAULT_MAX_FILE_SIZE,
+    timeout: float = 0.0,
+    quarantine: Optional[Quarantine] = None,
+    registry: LanguageRegistry = LANGUAGES,
+) -> List[Optional[FileExtraction]]:
+    return list(iter_extract_files(files, jobs, cache, max_size, timeout, quarantine, registry))
+
+
+# --- Extraction cache ---
+
+def _generator_fingerprint() -> str:
+    try:
+        script_digest = hashlib.sha1(Path(__file__).read_bytes()).hexdigest()[:16]
+    except OSError:
+        script_digest = "unknown"
+    return f"{GENERATOR_VERSION}:{script_digest}"
+
+
+def _item_to_record(item: ApiItem) -> list:
+    record = [item.kind, item.name, item.signature, item.line_number, item.description]
+    if item.default:
+        record.append(True)
+    return record
+
+
+def _item_from_record(record: list) -> ApiItem:
+    return ApiItem(*record)
+
+
+class ExtractionCache:
+    # One JSON manifest keyed by repo-relative path. An entry is reused without reading the
+    # file when mtime and size match, or after reading when the content digest matches.
+    MANIFEST_NAME = "extraction.json"
+
+    def __init__(self, cache_dir: Path, root: Path) -> None:
+        self.cache_dir = cache_dir
+        self.root = root
+        self.fingerprint = _generator_fingerprint()
+        self.entries: Dict[str, Dict] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+        self._stats: Dict[str, Tuple[int, int]] = {}
+        # get() may run on pipeline reader threads
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            data = json.loads((self.cache_dir / self.MANIFEST_NAME).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if isinstance(data, dict) and data.get("fingerprint") == self.fingerprint:
+            self.entries = data.get("entries") or {}
+
+    def _key(self, fp: Path) -> str:
+        return fp.relative_to(self.root).as_posix()
+
+    def _from_entry(self, fp: Path, entry: Dict) -> FileExtraction:
+        items = [_item_from_record(r) for r in entry["items"]]
+        return FileExtraction(
+            entry["language"],
+            fp,
+            entry["digest"],
+            items,
+            list(entry["imports"]),
+            skipped=entry.get("skipped"),
+            reexports=[tuple(r) for r in entry.get("reexports", ())],
+        )
+
+    def get(self, fp: Path, max_size: int = DEFAULT_MAX_FILE_SIZE) -> Optional[FileExtraction]:
+        key = self._key(fp)
+        try:
+            st = fp.stat()
+        except OSError:
+            return None
+        # Stat before any read so that a concurrent edit can only make the entry look stale
+        self._stats[key] = (st.st_mtime_ns, st.st_size)
+        entry = self.entries.get(key)
+        if entry and entry.get("mtime_ns") == st.st_mtime_ns and entry.get("size") == st.st_size:
+            # An entry skipped for its size is only valid under the same size limit
+            if (entry.get("skipped") == "too_large") != bool(max_size and st.st_size > max_size):
+                return None
+            with self._lock:
+                self.hits += 1
+            return self._from_entry(fp, entry)
+        return None
+
+    def known_digest(self, fp: Path) -> Optional[str]:
+        entry = self.entries.get(self._key(fp))
+        return entry.get("digest") if entry else None
+
+    def store(self, result: FileExtraction) -> FileExtraction:
+        # Failures are retried on the next run rather than remembered
+        if result.skipped in FAILURE_REASONS:
+            self.misses += 1
+            return result
+        key = self._key(result.file_path)
+        mtime_ns, size = self._stats.get(key, (0, -1))
+        if result.unchanged:
+            entry = self.entries[key]
+            entry["mtime_ns"], entry["size"] = mtime_ns, size
+            self.hits += 1
+            return self._from_entry(result.file_path, entry)
+        self.entries[key] = {
+            "mtime_ns": mtime_ns,
+            "size": size,
+            "digest": result.digest,
+            "language": result.language,
+            "items": [_item_to_record(it) for it in result.items],
+            "imports": result.imports,
+        }
+        if result.skipped:
+            self.entries[key]["skipped"] = result.skipped
+        if result.reexports:
+            self.entries[key]["reexports"] = result.reexports
+        self.misses += 1
+        return result
+
+    def evict_missing(self) -> None:
+        for key in list(self.entries):
+            if key not in self._stats and not (self.root / key).exists():
+                del self.entries[key]
+                self.evicted += 1
+
+    def save(self) -> None:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self.cache_dir / self.MANIFEST_NAME
+        tmp = path.with_name(path.name + ".tmp")
+        payload = {"fingerprint": self.fingerprint, "entries": self.entries}
+        tmp.write_text(json.dumps(payload, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp, path)
+
+
+# --- Pipelined mode ---
+
+# Defaults for --pipeline: reader and writer threads, and how many files may be in flight
+# between two stages
+DEFAULT_PIPELINE_READERS = 8
+DEFAULT_PIPELINE_WRITERS = 4
+DEFAULT_PIPELINE_QUEUE = 64
+
+_END = object()
+
+
+def iter_in_background(items: Iterable[Any], maxsize: int) -> Iterator[Any]:
+    # Runs `items` on a daemon thread, at most `maxsize` values ahead of the consumer.
+    # Exceptions are re-raised in the consumer.
+    buffer: "queue.Queue[Any]" = queue.Queue(maxsize)
+    failure: List[BaseException] = []
+
+    def produce() -> None:
+        try:
+            for item in items:
+                buffer.put(item)
+        except BaseException as exc:
+            failure.append(exc)
+        finally:
+            buffer.put(_END)
+
+    threading.Thread(target=produce, name="docsgen-discover", daemon=True).start()
+    while True:
+        item = buffer.get()
+        if item is _END:
+            break
+        yield item
+    if failure:
+        raise failure[0]
+
+
+class BoundedPool:
+    # Thread pool with at most `limit` unfinished tasks: submit() waits for the oldest task
+    # once the limit is reached, so queued work (and its memory) stays bounded.
+    def __init__(self, workers: int, limit: int, name: str) -> None:
+        from concurrent.futures import ThreadPoolExecutor
+
+        self.executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix=name)
+        self.limit = max(1, limit)
+        self.pending: "deque[Future]" = deque()
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> None:
+        self.pending.append(self.executor.submit(fn, *args))
+        while len(self.pending) > self.limit:
+            self.pending.popleft().result()
+
+    def drain(self) -> None:
+        while self.pending:
+            self.pending.popleft().result()
+
+    def close(self) -> None:
+        try:
+            self.drain()
+        finally:
+            self.executor.shutdown(wait=True, cancel_futures=True)
+
+
+def write_module_page(
+    writer: "OutputWriter", mod: ModuleDoc, root: Path, output_dir: Path, registry: LanguageRegistry = LANGUAGES
+) -> None:
+    writer.write(module_output_path(mod, root, output_dir), generate_module_markdown(mod, root, registry))
+
+
+def _pipeline_read(
+    fp: Path,
+    cache: Optional[ExtractionCache],
+    max_size: int,
+    quarantine: Optional[Quarantine] = None,
+    registry: LanguageRegistry = LANGUAGES,
+) -> Tuple[Optional[FileExtraction], Optional[Tuple[Path, str, SourceText, Optional[str], float]]]:
+    # Reader thread: a cache hit or a quarantined file costs only a stat, anything else is
+    # read here so that extraction never waits on the disk
+    lang = registry.language_for(fp)
+    if not lang:
+        return None, None
+    hit = cache.get(fp, max_size) if cache else None
+    if hit is None and quarantine is not None:
+        hit = quarantine.get(fp)
+    if hit is not None:
+        return hit, None
+    t0 = time.perf_counter()
+    read = read_source(fp, lang, max_size, registry)
+    known = cache.known_digest(fp) if cache else None
+    return None, (fp, lang, read, known, time.perf_counter() - t0)
+
+
+def iter_pipeline_extract(
+    paths: Iterable[Path],
+    jobs: int = 1,
+    cache: Optional[ExtractionCache] = None,
+    max_size: int = DEFAULT_MAX_FILE_SIZE,
+    readers: int = DEFAULT_PIPELINE_READERS,
+    queue_size: int = DEFAULT_PIPELINE_QUEUE,
+    timeout: float = 0.0,
+    quarantine: Optional[Quarantine] = None,
+    registry: LanguageRegistry = LANGUAGES,
+) -> Iterator[Optional[FileExtraction]]:
+    # Same results in the same order as iter_extract_files, but paths are consumed as they
+    # arrive, reads overlap on `readers` threads and extraction runs in this thread (or in
+    # `jobs` worker processes, which a `timeout` always needs). At most `queue_size` files
+    # are being read and at most `queue_size` read files wait for extraction.
+    from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+
+    reads: "deque[Future]" = deque()
+    # Finished results or extraction futures, in input order
+    extracted: "deque[Any]" = deque()
+    workers: Any = None
+    if timeout:
+        fallback = functools.partial(failed_extraction, registry=registry)
+        workers = GuardedProcessPool(jobs, extract_source, fallback, timeout, registry)
+    elif jobs > 1:
+        workers = ProcessPoolExecutor(jobs, initializer=install_language_plugins, initargs=(registry.plugins,))
+    if workers is not None:
+        # Workers are forked while reader threads run, and a plugin module a reader is importing
+        # at that moment stays locked in the child, so plugins are imported before any read.
+        # A backend that fails to load is left to fail where it is first used.
+        for name, *_ in registry.plugins:
+            try:
+                registry.get(name)
             except Exception:
                 pass
-    return {}
 
+    def finish(entry: Any) -> Optional[FileExtraction]:
+        res = entry.result() if isinstance(entry, Future) else entry
+        if isinstance(entry, Future) and res is not None:
+            if quarantine is not None:
+                quarantine.update(res)
+            if cache is not None:
+                res = cache.store(res)
+        return res
 
-def main() -> int:
-    parser = argparse.ArgumentParser(description="Generate API documentation for the repository.")
-    parser.add_argument("--output-dir", type=Path, default=DEFAULT_OUTPUT_DIR, help="Output directory (default: docs)")
-    parser.add_argument("--format", choices=["single", "split", "both"], default="both", help="Output format")
-    parser.add_argument("--include", action="append", help="Regex to include paths (can be repeated)")
-    parser.add_argument("--exclude", action="append", help="Regex to exclude paths (can be repeated)")
-    parser.add_argument("--languages", help="Comma-separated languages to scan (default: all)")
-    parser.add_argument("--config", type=Path, help="Path to JSON config file")
-    parser.add_argument("--verbose", action="store_true", help="Verbose logging")
-    args = parser.parse_args()
+    def extract(read_future: Future) -> None:
+        hit, job = read_future.result()
+        if job is None:
+            extracted.append(hit)
+        elif timeout:
+            extracted.append(workers.submit(*job))
+        elif workers is not None:
+            extracted.append(workers.submit(extract_source, *job))
+        else:
+            done: Future = Future()
+            done.set_result(extract_source(*job, registry=registry))
+            extracted.append(done)
 
-    config = load_config(args.config)
+    def ready() -> Iterator[Optional[FileExtraction]]:
+        while extracted and (len(extracted) > queue_size or not isinstance(extracted[0], Future) or extracted[0].done()):
+            yield finish(extracted.popleft())
 
-    include = args.include or config.get("include") or []
-    exclude = args.exclude or config.get("exclude") or []
-    languages = set([l.strip().lower() for l in (args.languages or config.get("languages", "")).split(",") if l.strip()])
+    with ThreadPoolExecutor(max_workers=max(1, readers), thread_name_prefix="docsgen-read") as pool:
+        try:
+            for fp in paths:
+                reads.append(pool.submit(_pipeline_read, fp, cache, max_size, quarantine, registry))
+                while len(reads) >= queue_size or (reads and reads[0].done()):
+                    extract(reads.popleft())
+                    yield from ready()
+            while reads:
+                extract(reads.popleft())
+                yield from ready()
+            while extracted:
+                yield finish(extracted.popleft())
+        finally:
+            for f in reads:
+                f.cancel()
+            if workers is not None:
+                workers.shutdown(wait=True, cancel_futures=True)
 
-    files = discover_source_files(REPO_ROOT, include=include, exclude=exclude)
-    if languages:
-        files = [f for f in files if SUPPORTED_EXTENSIONS.get(f.suffix.lower()) in languages]
 
-    if args.verbose:
-        print(f"Discovered {len(files)} files")
+# --- Changed-files mode ---
 
-    api_modules: List[ModuleDoc] = []
-    import_edges: List[Tuple[Path, Path]] = []
-    repo_map = map_repo_modules(files)
+MODULE_MANIFEST_NAME = "modules.json"
 
-    for fp in files:
-        lang = SUPPORTED_EXTENSIONS.get(fp.suffix.lower())
-        if not lang:
+
+def git_changed_files(root: Path, rev: str) -> List[str]:
+    # Paths (relative to `root`) that differ between `rev` and the working tree, plus untracked
+    # files. Deleted paths are included so that their pages are pruned.
+    import subprocess
+
+    if rev.startswith("-"):
+        raise ValueError(f"invalid revision {rev!r}")
+    diff = subprocess.run(
+        ["git", "diff", "--name-only", "--no-renames", "--relative", "-z", rev, "--"],
+        cwd=root, capture_output=True, check=True,
+    ).stdout
+    untracked = subprocess.run(
+        ["git", "ls-files", "--others", "--exclude-standard", "-z"], cwd=root, capture_output=True, check=True
+    ).stdout
+    return [p for p in (diff + untracked).decode("utf-8", "surrogateescape").split("\0") if p]
+
+
+def read_changed_files(source: Path) -> List[str]:
+    # One path per line (or NUL-separated, as from `git diff -z`); "-" reads stdin
+    text = sys.stdin.read() if str(source) == "-" else source.read_text(encoding="utf-8")
+    return [p.strip() for p in text.split("\0" if "\0" in text else "\n") if p.strip()]
+
+
+def merge_changed_files(
+    root: Path,
+    files: List[Path],
+    changed: Iterable[Union[str, Path]],
+    include: Optional[List[str]] = None,
+    exclude: Optional[List[str]] = None,
+    languages: Optional[Set[str]] = None,
+    gitignore: bool = False,
+    registry: LanguageRegistry = LANGUAGES,
+) -> Tuple[List[Path], List[Path]]:
+    # Returns the updated file list and the files in it that must be re-extracted. Changed
+    # paths (absolute or relative to `root`) that are gone or no longer pass the filters are
+    # dropped; new ones are placed after the last known file in their directory.
+    include_filter, exclude_filter = PathFilter(include), PathFilter(exclude)
+    ignore = GitIgnore() if gitignore else None
+    touched: Dict[Path, bool] = {}
+    for raw in changed:
+        fp = Path(raw) if os.path.isabs(raw) else root / raw
+        try:
+            rel = Path(os.path.normpath(fp)).relative_to(root).as_posix()
+        except ValueError:
             continue
-        src = read_text_safely(fp)
-        extractor = LANGUAGE_EXTRACTORS[lang]
-        items = extractor(src)
-        if not items:
+        fp = root / rel
+        if fp in touched:
             continue
-        api_modules.append(ModuleDoc(lang, fp, items))
-        # Resolve imports for graph
-        for spec in resolve_imports(lang, fp, src):
-            # Try to resolve to repo file
-            candidates = []
-            if spec.startswith("."):
-                # relative import path for JS/TS
-                resolved = (fp.parent / spec).resolve()
-                # Try with and without extensions, index files are ignored for simplicity
-                for ext in ("", ".ts", ".tsx", ".js", ".jsx", ".py"):
-                    cand = (resolved.with_suffix(ext)) if ext else resolved
-                    if cand in files:
-                        candidates.append(cand)
-            else:
-                # Absolute-like: look up in mapping
-                if spec in repo_map:
-                    candidates.append(repo_map[spec])
-            for c in candidates:
-                import_edges.append((fp, c))
+        keep = is_discoverable(root, rel, include_filter, exclude_filter, ignore, registry)
+        if keep and languages:
+            keep = registry.language_for(fp) in languages
+        touched[fp] = keep
+    files = [fp for fp in files if touched.get(fp, True)]
+    known = set(files)
+    for fp, keep in touched.items():
+        if not keep or fp in known:
+            continue
+        pos = len(files)
+        for i in range(len(files) - 1, -1, -1):
+            if files[i].parent == fp.parent:
+                pos = i + 1
+                break
+        files.insert(pos, fp)
+        known.add(fp)
+    return files, [fp for fp in files if fp in touched]
 
-    output_dir: Path = args.output_dir
+
+class ModuleManifest:
+    # Discovered files and documented modules (items and unresolved import specifiers) of the
+    # last run, stored under the cache directory. --since / --changed-files-from re-extract only
+    # the listed paths and take everything else from here. The manifest is only used with the
+    # discovery options and generator version it was written with. `links` holds the
+    # ModuleDoc.link_key of each module after re-export linking.
+    def __init__(
+        self,
+        root: Path,
+        files: List[Path],
+        modules: Dict[Path, Tuple[str, List[list], List[str], List[list]]],
+        links: Optional[Dict[Path, str]] = None,
+    ) -> None:
+        self.root = root
+        self.files = files
+        self.modules = modules
+        self.links = links or {}
+
+    @staticmethod
+    def options_key(
+        include: List[str],
+        exclude: List[str],
+        languages: Set[str],
+        gitignore: bool,
+        max_file_size: int,
+        fmt: str,
+        output_dir: Path,
+    ) -> Dict[str, Any]:
+        # The output format and directory are part of the key: pages of another format, or in
+        # another directory, were never rendered there
+        return {
+            "generator": _generator_fingerprint(),
+            "format": fmt,
+            "output_dir": os.fspath(output_dir.resolve()),
+            "include": list(include),
+            "exclude": list(exclude),
+            "languages": sorted(languages),
+            "gitignore": gitignore,
+            "max_file_size": max_file_size,
+        }
+
+    @classmethod
+    def load(cls, path: Path, options: Dict[str, Any], root: Path) -> Optional["ModuleManifest"]:
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if not isinstance(data, dict) or data.get("options") != options:
+            return None
+        modules = {
+            root / m["path"]: (m["language"], m["items"], m["imports"], m.get("reexports", [])) for m in data["modules"]
+        }
+        links = {root / m["path"]: m["links"] for m in data["modules"] if "links" in m}
+        return cls(root, [root / f for f in data["files"]], modules, links)
+
+    @staticmethod
+    def save(
+        path: Path,
+        options: Dict[str, Any],
+        files: List[Path],
+        modules: List[ModuleDoc],
+        imports: List[List[str]],
+        root: Path,
+        reexports: Optional[List[List[Tuple[int, str, str, str]]]] = None,
+        linked: Optional[List[ModuleDoc]] = None,
+    ) -> None:
+        # `modules` as extracted; `linked` is the same list after link_reexports
+        entries = []
+        for i, (mod, specifiers) in enumerate(zip(modules, imports)):
+            entry = {
+                "path": mod.file_path.relative_to(root).as_posix(),
+                "language": mod.language,
+                "items": [_item_to_record(it) for it in mod.items],
+                "imports": specifiers,
+            }
+            if reexports and reexports[i]:
+                entry["reexports"] = reexports[i]
+            key = linked[i].link_key() if linked is not None else None
+            if key is not None:
+                entry["links"] = key
+            entries.append(entry)
+        payload = {
+            "options": options,
+            "files": [fp.relative_to(root).as_posix() for fp in files],
+            "modules": entries,
+        }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps(payload, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp, path)
+
+    def apply_changes(
+        self,
+        changed: List[str],
+        include: Optional[List[str]] = None,
+        exclude: Optional[List[str]] = None,
+        languages: Optional[Set[str]] = None,
+        gitignore: bool = False,
+        registry: LanguageRegistry = LANGUAGES,
+    ) -> Tuple[List[Path], List[Path]]:
+        # Files deleted without being listed (untracked files, an incomplete --changed-files-from
+        # list) are dropped like listed deletions rather than replayed from the manifest
+        files = [fp for fp in self.files if os.path.isfile(fp)]
+        return merge_changed_files(self.root, files, changed, include, exclude, languages, gitignore, registry)
+
+    def iter_results(self, files: List[Path], fresh: List[Optional[FileExtraction]]) -> Iterator[FileExtraction]:
+        # Re-extracted results where available, manifest entries for every other documented file
+        extracted = {r.file_path: r for r in fresh if r is not None}
+        for fp in files:
+            result = extracted.get(fp)
+            if result is not None:
+                yield result
+                continue
+            entry = self.modules.get(fp)
+            if entry is not None:
+                language, records, imports, reexports = entry
+                yield FileExtraction(
+                    language,
+                    fp,
+                    "",
+                    [_item_from_record(r) for r in records],
+                    list(imports),
+                    unchanged=True,
+                    reexports=[tuple(r) for r in reexports],
+                )
+
+
+# --- Re-export linking ---
+
+def link_reexports(
+    modules: List[ModuleDoc], reexports: List[List[Tuple[int, str, str, str]]], resolver: ImportResolver
+) -> List[ModuleDoc]:
+    # Follows `export * from` / `export { x } from` chains (records from LanguageBackend.reexports,
+    # parallel to `modules`) to the module that defines each symbol. Resolved re-export items
+    # are dropped from barrels, which list their sources in `reexported` instead, and each
+    # definition lists the barrels that expose it in `also_exported`. Modules carrying link
+    # info are returned as new objects; the others (and `modules` itself) are not modified.
+    by_path = {m.file_path: m for m in modules}
+    records = {m.file_path: recs for m, recs in zip(modules, reexports) if recs}
+    if not records:
+        return modules
+    targets = {fp: [resolver.resolve(fp, spec) for _, _, _, spec in recs] for fp, recs in records.items()}
+    own_memo: Dict[Path, Dict[str, Tuple[Path, str]]] = {}
+    # Exported name -> (defining module, name there) for every barrel, computed once
+    exported: Dict[Path, Dict[str, Tuple[Path, str]]] = {}
+    linked: Dict[Path, Tuple[List[Tuple[str, Path]], Set[Tuple[int, str]]]] = {}
+
+    def own(fp: Path) -> Dict[str, Tuple[Path, str]]:
+        names = own_memo.get(fp)
+        if names is None:
+            names = own_memo[fp] = {}
+            mod = by_path.get(fp)
+            # Keyed by the module's own file_path object, so identity tells modules apart below
+            for item in mod.items if mod is not None else ():
+                if item.kind != "re-export":
+                    names.setdefault("default" if item.default else item.name, (mod.file_path, item.name))
+        return names
+
+    def names_of(fp: Path) -> Dict[str, Tuple[Path, str]]:
+        # Barrels still being visited (an import cycle) only contribute their own definitions
+        return exported[fp] if fp in exported else own(fp)
+
+    def link(fp: Path) -> None:
+        names = dict(own(fp))
+        sources: List[Tuple[str, Path]] = []
+        resolved: Set[Tuple[int, str]] = set()
+        pairs = [(rec, target) for rec, target in zip(records[fp], targets[fp]) if target is not None and target != fp]
+        # Local definitions win over named re-exports, which win over `export *`
+        for (line, name, imported, _), target in pairs:
+            if name != "*":
+                canonical = names_of(target).get(imported)
+                if canonical is not None:
+                    names.setdefault(name, canonical)
+                    sources.append((name, canonical[0]))
+                    resolved.add((line, name))
+        for (line, name, _, _), target in pairs:
+            if name == "*":
+                for star_name, canonical in names_of(target).items():
+                    if star_name != "default":
+                        names.setdefault(star_name, canonical)
+                sources.append(("*", target))
+                resolved.add((line, "*"))
+        exported[fp] = names
+        linked[fp] = (sources, resolved)
+
+    for start in records:
+        if start in exported:
+            continue
+        # Iterative post-order walk so that long chains do not hit the recursion limit
+        stack = [start]
+        visiting = {start}
+        while stack:
+            fp = stack[-1]
+            pending = next((t for t in targets[fp] if t in records and t not in exported and t not in visiting), None)
+            if pending is not None:
+                visiting.add(pending)
+                stack.append(pending)
+                continue
+            stack.pop()
+            link(fp)
+
+    also: Dict[Path, Dict[str, List[Tuple[Path, str]]]] = {}
+    for mod in modules:
+        fp = mod.file_path
+        for name, (defined_in, defined_as) in exported.get(fp, {}).items():
+            if defined_in is not fp:
+                also.setdefault(defined_in, {}).setdefault(defined_as, []).append((fp, name))
+    out: List[ModuleDoc] = []
+    for mod in modules:
+        fp = mod.file_path
+        sources, resolved = linked.get(fp, ([], set()))
+        also_exported = also.get(fp)
+        if not sources and not also_exported:
+            out.append(mod)
+            continue
+        items = [it for it in mod.items if it.kind != "re-export" or (it.line_number, it.name) not in resolved]
+        out.append(ModuleDoc(mod.language, fp, items, also_exported, sources or None))
+    return out
+
+
+# --- Output generation ---
+
+def _join_lines(lines: Iterable[str]) -> Iterator[str]:
+    # Streaming equivalent of "\n".join(lines)
+    first = True
+    for line in lines:
+        if not first:
+            yield "\n"
+        first = False
+        yield line
+
+
+def _shared_reexports(mod: ModuleDoc) -> List[Path]:
+    # Barrels re-exporting every (non-default) item of the module under its own name, listed
+    # once at the top of the page instead of under each item
+    also = mod.also_exported or {}
+    named = [item.name for item in mod.items if not item.default]
+    if not named:
+        return []
+    common = {barrel for barrel, exported in also.get(named[0], ()) if exported == named[0]}
+    for name in named[1:]:
+        common.intersection_update(barrel for barrel, exported in also.get(name, ()) if exported == name)
+    return [barrel for barrel, exported in also.get(named[0], ()) if barrel in common and exported == named[0]]
+
+
+def _also_exported_line(links: Iterable[Tuple[Path, str]], name: str, root: Path) -> str:
+    refs = [
+        f"`{barrel.relative_to(root).as_posix()}`" + ("" if exported == name else f" (as `{exported}`)")
+        for barrel, exported in links
+    ]
+    return f"Also exported from {', '.join(refs)}.\n"
+
+
+def iter_module_markdown(mod: ModuleDoc, root: Path, registry: LanguageRegistry = LANGUAGES) -> Iterator[str]:
+    rel_path = mod.file_path.relative_to(root)
+    yield f"# `{rel_path.as_posix()}`\n"
+    shared: Set[Path] = set()
+    if mod.also_exported:
+        common = _shared_reexports(mod)
+        if common:
+            yield f"Also exported from {', '.join(f'`{barrel.relative_to(root).as_posix()}`' for barrel in common)}.\n"
+            shared = set(common)
+    for item in mod.items:
+        yield f"## {item.kind}: `{item.name}`\n"
+        if item.description:
+            yield item.description + "\n"
+        if mod.also_exported and item.name in mod.also_exported:
+            links = [(b, n) for b, n in mod.also_exported[item.name] if not (b in shared and n == item.name)]
+            if links:
+                yield _also_exported_line(links, item.name, root)
+        yield "Signature:\n"
+        yield f"```\n{item.signature}\n```\n"
+        yield "Usage:\n"
+        yield generate_usage_example(mod.language, rel_path, item, registry) + "\n"
+    if mod.reexported:
+        yield "## Re-exports\n"
+        yield "\n".join(f"- `{name}` from `{source.relative_to(root).as_posix()}`" for name, source in mod.reexported) + "\n"
+
+
+def generate_module_markdown(mod: ModuleDoc, root: Path, registry: LanguageRegistry = LANGUAGES) -> str:
+    return "\n".join(iter_module_markdown(mod, root, registry))
+
+
+def iter_index_markdown(modules: List[ModuleDoc], split: bool, root: Path) -> Iterator[str]:
+    yield "# API Reference\n"
+    yield "Auto-generated documentation of public APIs, functions, classes, and components.\n"
+    counts: Dict[str, int] = {}
+    for m in modules:
+        counts[m.language] = counts.get(m.language, 0) + len(m.items)
+    if not modules:
+        yield "\n> No public APIs detected.\n"
+        return
+    yield "\n## Summary\n"
+    for lang, cnt in sorted(counts.items()):
+        yield f"- {lang.title()}: {cnt} items"
+    yield "\n## Modules\n"
+    for m in sorted(modules, key=lambda x: x.file_path.as_posix()):
+        rel = m.file_path.relative_to(root).as_posix()
+        if split:
+            out_rel = module_page_path(m, root).as_posix()
+            yield f"- `{rel}` — see [{out_rel}]({out_rel})"
+        else:
+            yield f"- `{rel}`"
+
+
+def generate_index_markdown(modules: List[ModuleDoc], split: bool, root: Path) -> str:
+    return "\n".join(iter_index_markdown(modules, split, root))
+
+
+def iter_single_file_markdown(
+    modules: List[ModuleDoc],
+    root: Path,
+    pages: Optional[Dict[Path, str]] = None,
+    registry: LanguageRegistry = LANGUAGES,
+) -> Iterator[str]:
+    # Lines of API_FULL.md; every part is non-empty, so joining the flattened lines is the same
+    # as joining the index and each module page
+    yield from iter_index_markdown(modules, False, root)
+    for mod in sorted(modules, key=lambda m: m.file_path.as_posix()):
+        yield "\n---\n"
+        if pages is not None:
+            yield _module_markdown(mod, pages, root, registry)
+        else:
+            yield from iter_module_markdown(mod, root, registry)
+
+
+OUTPUT_FORMATS = ("single", "split", "both", "json", "ndjson")
+
+# Machine-readable output: one record per ApiItem plus the import edges between documented
+# modules. Both encodings are produced record by record.
+STRUCTURED_FORMAT_FILES = {"json": "API.json", "ndjson": "API.ndjson"}
+STRUCTURED_FORMAT_VERSION = 1
+
+
+def iter_item_records(mod: ModuleDoc, root: Path) -> Iterator[Dict[str, Any]]:
+    rel = mod.file_path.relative_to(root).as_posix()
+    also = mod.also_exported or {}
+    for item in mod.items:
+        record = {
+            "module": rel,
+            "language": mod.language,
+            "kind": item.kind,
+            "name": item.name,
+            "signature": item.signature,
+            "line": item.line_number,
+            "description": item.description,
+        }
+        if item.name in also:
+            record["also_exported_from"] = [
+                {"module": barrel.relative_to(root).as_posix(), "name": name} for barrel, name in also[item.name]
+            ]
+        yield record
+
+
+def iter_edge_records(
+    modules: List[ModuleDoc], import_edges: List[Tuple[Path, Path]], root: Path
+) -> Iterator[Dict[str, str]]:
+    # Same edges as the dependency diagram: both ends must be documented modules
+    documented = {m.file_path for m in modules}
+    for a, b in import_edges:
+        if a in documented and b in documented:
+            yield {"from": a.relative_to(root).as_posix(), "to": b.relative_to(root).as_posix()}
+
+
+def _ndjson_line(record_type: str, record: Dict[str, Any]) -> str:
+    return json.dumps({"type": record_type, **record}, ensure_ascii=False) + "\n"
+
+
+def ndjson_header() -> str:
+    return _ndjson_line("meta", {"version": STRUCTURED_FORMAT_VERSION})
+
+
+def iter_ndjson_items(mod: ModuleDoc, root: Path) -> Iterator[str]:
+    for record in iter_item_records(mod, root):
+        yield _ndjson_line("item", record)
+
+
+def iter_ndjson_edges(modules: List[ModuleDoc], import_edges: List[Tuple[Path, Path]], root: Path) -> Iterator[str]:
+    for record in iter_edge_records(modules, import_edges, root):
+        yield _ndjson_line("edge", record)
+
+
+def iter_ndjson(modules: List[ModuleDoc], import_edges: List[Tuple[Path, Path]], root: Path) -> Iterator[str]:
+    # A "meta" line, then one "item" line per ApiItem and one "edge" line per import edge
+    yield ndjson_header()
+    for mod in sorted(modules, key=lambda m: m.file_path.as_posix()):
+        yield from iter_ndjson_items(mod, root)
+    yield from iter_ndjson_edges(modules, import_edges, root)
+
+
+def iter_json(modules: List[ModuleDoc], import_edges: List[Tuple[Path, Path]], root: Path) -> Iterator[str]:
+    # {"version": ..., "items": [...], "edges": [...]} with one record per line
+    yield f'{{"version": {STRUCTURED_FORMAT_VERSION}, "items": ['
+    sep = "\n"
+    for mod in sorted(modules, key=lambda m: m.file_path.as_posix()):
+        for record in iter_item_records(mod, root):
+            yield sep + json.dumps(record, ensure_ascii=False)
+            sep = ",\n"
+    yield '\n], "edges": ['
+    sep = "\n"
+    for record in iter_edge_records(modules, import_edges, root):
+        yield sep + json.dumps(record)
+        sep = ",\n"
+    yield "\n]}\n"
+
+
+def load_api_index(path: Path) -> Dict[str, Dict[str, List[Dict[str, Any]]]]:
+    # Reads API.json or API.ndjson into lookups by item name, module and kind, plus the
+    # import edges by importing and by imported module
+    items: List[Dict[str, Any]] = []
+    edges: List[Dict[str, str]] = []
+    with open(path, encoding="utf-8") as fh:
+        if path.suffix == ".ndjson":
+            for line in fh:
+                record = json.loads(line)
+                record_type = record.pop("type", None)
+                if record_type == "item":
+                    items.append(record)
+                elif record_type == "edge":
+                    edges.append(record)
+        else:
+            data = json.load(fh)
+            items, edges = data.get("items", []), data.get("edges", [])
+    index: Dict[str, Dict[str, List[Dict[str, Any]]]] = {
+        "by_name": {}, "by_module": {}, "by_kind": {}, "imports": {}, "imported_by": {},
+    }
+    for record in items:
+        index["by_name"].setdefault(record["name"], []).append(record)
+        index["by_module"].setdefault(record["module"], []).append(record)
+        index["by_kind"].setdefault(record["kind"], []).append(record)
+    for edge in edges:
+        index["imports"].setdefault(edge["from"], []).append(edge)
+        index["imported_by"].setdefault(edge["to"], []).append(edge)
+    return index
+
+
+def module_page_path(mod: ModuleDoc, root: Path) -> Path:
+    # Split page of a module, relative to the output directory
+    rel = mod.file_path.relative_to(root)
+    return Path(SPLIT_DIR_NAME, mod.language, rel.with_suffix(".md"))
+
+
+def module_output_path(mod: ModuleDoc, root: Path, output_dir: Path) -> Path:
+    return output_dir / module_page_path(mod, root)
+
+
+class OutputWriter:
+    # Writes a file only when its bytes differ from what is on disk, and remembers every
+    # path it was asked to produce so that stale pages can be pruned afterwards.
+    def __init__(self) -> None:
+        self.written = 0
+        self.unchanged = 0
+        self.deleted = 0
+        self.produced: Set[Path] = set()
+        # write() may run on pipeline writer threads
+        self._lock = threading.Lock()
+
+    def write(self, path: Path, content: str) -> bool:
+        data = content.encode("utf-8")
+        self.produced.add(path)
+        try:
+            if path.stat().st_size == len(data) and path.read_bytes() == data:
+                with self._lock:
+                    self.unchanged += 1
+                return False
+        except OSError:
+            pass
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+        with self._lock:
+            self.written += 1
+        return True
+
+    def write_chunks(self, path: Path, chunks: Iterable[str]) -> bool:
+        # Streams into a temporary sibling and renames it into place, so peak memory does not
+        # depend on the document size and readers never see a partial file
+        self.produced.add(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp, "w", encoding="utf-8", newline="", buffering=1 << 16) as fh:
+                for chunk in chunks:
+                    fh.write(chunk)
+            if path.is_file() and filecmp.cmp(tmp, path, shallow=False):
+                tmp.unlink()
+                self.unchanged += 1
+                return False
+            os.replace(tmp, path)
+        except BaseException:
+            if tmp.exists():
+                tmp.unlink()
+            raise
+        self.written += 1
+        return True
+
+    def delete(self, path: Path, base: Path) -> None:
+        try:
+            path.unlink()
+        except OSError:
+            return
+        self.deleted += 1
+        # Drop directories left empty up to `base`, stopping at the first non-empty one
+        parent = path.parent
+        while parent != base and base in parent.parents:
+            try:
+                parent.rmdir()
+            except OSError:
+                break
+            parent = parent.parent
+
+    def summary(self) -> str:
+        return f"{self.written} written, {self.unchanged} unchanged, {self.deleted} deleted"
+
+
+def prune_split_docs(
+    writer: OutputWriter, scanned: List[Path], root: Path, output_dir: Path, registry: LanguageRegistry = LANGUAGES
+) -> None:
+    # A page is orphaned when it was not produced by this run and its source either no longer
+    # exists or was scanned and had nothing to document. Pages for sources outside this run's
+    # include/language filters are left alone.
+    split_base = output_dir / SPLIT_DIR_NAME
+    if not split_base.is_dir():
+        return
+    scanned_set = set(scanned)
+    exts_by_lang: Dict[str, List[str]] = {}
+    for ext, lang in registry.extensions.items():
+        exts_by_lang.setdefault(lang, []).append(ext)
+    for lang_dir in split_base.iterdir():
+        exts = exts_by_lang.get(lang_dir.name)
+        if not exts or not lang_dir.is_dir():
+            continue
+        for page in sorted(lang_dir.rglob("*.md")):
+            if page in writer.produced:
+                continue
+            stem = root / page.relative_to(lang_dir).with_suffix("")
+            sources = [stem.with_name(stem.name + ext) for ext in exts]
+            if any(src in scanned_set for src in sources) or not any(src.exists() for src in sources):
+                writer.delete(page, split_base)
+
+
+def _module_markdown(
+    mod: ModuleDoc, pages: Optional[Dict[Path, str]], root: Path, registry: LanguageRegistry = LANGUAGES
+) -> str:
+    # `pages` memoizes rendered modules across outputs; callers drop entries for changed files
+    if pages is None:
+        return generate_module_markdown(mod, root, registry)
+    page = pages.get(mod.file_path)
+    if page is None:
+        page = pages[mod.file_path] = generate_module_markdown(mod, root, registry)
+    return page
+
+
+def write_split_docs(
+    modules: List[ModuleDoc],
+    root: Path,
+    output_dir: Path,
+    writer: Optional[OutputWriter] = None,
+    pages: Optional[Dict[Path, str]] = None,
+    registry: LanguageRegistry = LANGUAGES,
+) -> None:
+    writer = writer or OutputWriter()
+    for mod in modules:
+        writer.write(module_output_path(mod, root, output_dir), _module_markdown(mod, pages, root, registry))
+
+
+def write_single_file(
+    modules: List[ModuleDoc],
+    root: Path,
+    output_file: Path,
+    writer: Optional[OutputWriter] = None,
+    pages: Optional[Dict[Path, str]] = None,
+    registry: LanguageRegistry = LANGUAGES,
+) -> None:
+    writer = writer or OutputWriter()
+    writer.write_chunks(output_file, _join_lines(iter_single_file_markdown(modules, root, pages, registry)))
+
+
+def write_outputs(
+    modules: List[ModuleDoc],
+    import_edges: List[Tuple[Path, Path]],
+    root: Path,
+    output_dir: Path,
+    fmt: str,
+    writer: OutputWriter,
+    split_modules: Optional[List[ModuleDoc]] = None,
+    pages: Optional[Dict[Path, str]] = None,
+    stats: Optional[RunStats] = None,
+    graph: Optional["GraphOptions"] = None,
+    registry: LanguageRegistry = LANGUAGES,
+) -> None:
+    # `split_modules` limits which per-module pages are rendered; the index, single file and
+    # diagram always cover all `modules`
     output_dir.mkdir(parents=True, exist_ok=True)
 
+    with _phase(stats, "write_search_index"):
+        write_search_index(modules, root, output_dir / SEARCH_INDEX_FILE, writer, split=(fmt in ("split", "both")))
+
+    if fmt in STRUCTURED_FORMAT_FILES:
+        render = iter_json if fmt == "json" else iter_ndjson
+        with _phase(stats, f"write_{fmt}"):
+            writer.write_chunks(output_dir / STRUCTURED_FORMAT_FILES[fmt], render(modules, import_edges, root))
+        return
+
     # Write index
-    index_md = generate_index_markdown(api_modules, split=(args.format in ("split", "both")))
-    (output_dir / "API.md").write_text(index_md, encoding="utf-8")
+    with _phase(stats, "write_index"):
+        index_md = generate_index_markdown(modules, fmt in ("split", "both"), root)
+        writer.write(output_dir / "API.md", index_md)
 
     # Write formats
-    if args.format in ("split", "both"):
-        write_split_docs(api_modules, output_dir)
-    if args.format in ("single", "both"):
-        write_single_file(api_modules, output_dir / "API_FULL.md")
+    if fmt in ("split", "both"):
+        with _phase(stats, "write_split"):
+            write_split_docs(modules if split_modules is None else split_modules, root, output_dir, writer, pages, registry)
+    if fmt in ("single", "both"):
+        with _phase(stats, "write_single"):
+            write_single_file(modules, root, output_dir / "API_FULL.md", writer, pages, registry)
 
     # Dependency graph
-    diagrams_md = generate_dependency_mermaid(api_modules, import_edges)
-    (output_dir / "DIAGRAMS.md").write_text(diagrams_md, encoding="utf-8")
+    with _phase(stats, "write_diagrams"):
+        write_dependency_graph(modules, import_edges, root, output_dir, writer, graph or GraphOptions(), stats)
+
+
+# --- Dependency graph ---
+
+# Directories holding one of these files are package roots for --graph-level package
+PACKAGE_MANIFESTS = ("package.json", "pyproject.toml", "setup.py", "go.mod", "Cargo.toml", "pom.xml", "build.gradle")
+# Above this many nodes, --graph-level auto collapses the diagram to packages
+MERMAID_MAX_NODES = 300
+GRAPH_FORMAT_FILES = {"mermaid": "DIAGRAMS.md", "dot": "dependencies.dot", "json": "dependencies.json"}
+
+
+@dataclass
+class GraphOptions:
+    level: str = "auto"  # "auto", "module" or "package"
+    formats: Tuple[str, ...] = ("mermaid",)
+    subgraphs: bool = False
+
+
+@dataclass
+class DependencyGraph:
+    level: str
+    nodes: List[str]
+    # Package of each node (the node itself at package level)
+    groups: List[str]
+    # Deduplicated (from, to) node indexes in first-seen order
+    edges: List[Tuple[int, int]]
+
+
+class PackageResolver:
+    # Maps a file to the repo-relative directory of its nearest package manifest below the
+    # root, falling back to its top-level directory. Memoized per directory.
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self._memo: Dict[Path, str] = {}
+
+    def package_of(self, path: Path) -> str:
+        directory = path.parent
+        package = self._memo.get(directory)
+        if package is not None:
+            return package
+        walked: List[Path] = []
+        depth = len(self.root.parts)
+        while len(directory.parts) > depth:
+            package = self._memo.get(directory)
+            if package is not None:
+                break
+            walked.append(directory)
+            if any((directory / name).is_file() for name in PACKAGE_MANIFESTS):
+                package = directory.relative_to(self.root).as_posix()
+                break
+            directory = directory.parent
+        if package is None:
+            rel = path.relative_to(self.root)
+            package = rel.parts[0] if len(rel.parts) > 1 else "."
+        for d in walked:
+            self._memo[d] = package
+        return package
+
+
+def parse_graph_formats(value: str) -> Tuple[str, ...]:
+    formats = tuple(dict.fromkeys(f.strip().lower() for f in value.split(",") if f.strip()))
+    unknown = [f for f in formats if f not in GRAPH_FORMAT_FILES]
+    if unknown or not formats:
+        raise argparse.ArgumentTypeError(
+            f"unknown graph format(s) {', '.join(unknown) or repr(value)}; choose from {', '.join(GRAPH_FORMAT_FILES)}"
+        )
+    return formats
+
+
+def build_dependency_graph(
+    modules: List[ModuleDoc],
+    import_edges: List[Tuple[Path, Path]],
+    root: Path,
+    level: str = "module",
+    packages: Optional[PackageResolver] = None,
+) -> DependencyGraph:
+    # Nodes are the documented modules (or their packages) in module order. Edges whose ends
+    # are not documented are dropped, duplicates are kept once and, at package level, edges
+    # inside a package disappear.
+    packages = packages or PackageResolver(root)
+    if level == "auto":
+        level = "module" if len(modules) <= MERMAID_MAX_NODES else "package"
+    node_of: Dict[Path, int] = {}
+    nodes: List[str] = []
+    groups: List[str] = []
+    if level == "package":
+        package_ids: Dict[str, int] = {}
+        for m in modules:
+            package = packages.package_of(m.file_path)
+            if package not in package_ids:
+                package_ids[package] = len(nodes)
+                nodes.append(package)
+                groups.append(package)
+            node_of[m.file_path] = package_ids[package]
+    else:
+        for m in modules:
+            node_of[m.file_path] = len(nodes)
+            nodes.append(m.file_path.relative_to(root).as_posix())
+            groups.append(packages.package_of(m.file_path))
+    edges: Dict[Tuple[int, int], None] = {}
+    for a, b in import_edges:
+        na, nb = node_of.get(a), node_of.get(b)
+        if na is None or nb is None or (level == "package" and na == nb):
+            continue
+        edges[(na, nb)] = None
+    return DependencyGraph(level, nodes, groups, list(edges))
+
+
+def strongly_connected_components(count: int, edges: List[Tuple[int, int]]) -> List[List[int]]:
+    # Iterative Tarjan, O(V + E). Components come out in reverse topological order.
+    adjacency: List[List[int]] = [[] for _ in range(count)]
+    for a, b in edges:
+        adjacency[a].append(b)
+    index = [-1] * count
+    lowlink = [0] * count
+    on_stack = [False] * count
+    stack: List[int] = []
+    components: List[List[int]] = []
+    counter = 0
+    for start in range(count):
+        if index[start] != -1:
+            continue
+        work = [(start, 0)]
+        while work:
+            node, child = work[-1]
+            if child == 0:
+                index[node] = lowlink[node] = counter
+                counter += 1
+                stack.append(node)
+                on_stack[node] = True
+            if child < len(adjacency[node]):
+                work[-1] = (node, child + 1)
+                nxt = adjacency[node][child]
+                if index[nxt] == -1:
+                    work.append((nxt, 0))
+                elif on_stack[nxt]:
+                    lowlink[node] = min(lowlink[node], index[nxt])
+                continue
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                lowlink[parent] = min(lowlink[parent], lowlink[node])
+            if lowlink[node] == index[node]:
+                component: List[int] = []
+                while True:
+                    member = stack.pop()
+                    on_stack[member] = False
+                    component.append(member)
+                    if member == node:
+                        break
+                components.append(component)
+    return components
+
+
+def import_cycles(graph: DependencyGraph) -> List[List[str]]:
+    # Strongly connected components with more than one node, as sorted node labels
+    cycles = [
+        sorted(graph.nodes[n] for n in component)
+        for component in strongly_connected_components(len(graph.nodes), graph.edges)
+        if len(component) > 1
+    ]
+    return sorted(cycles)
+
+
+def generate_dependency_mermaid(
+    graph: DependencyGraph, subgraphs: bool = False, cycles: Optional[List[List[str]]] = None
+) -> str:
+    lines: List[str] = []
+    lines.append("# Dependency Graph\n")
+    if graph.level == "package":
+        lines.append("This graph shows intra-repository imports between packages of documented modules.\n")
+    else:
+        lines.append("This graph shows intra-repository imports between documented modules.\n")
+    lines.append("\n```mermaid\n")
+    lines.append("graph LR")
+    if subgraphs and graph.level == "module":
+        members: Dict[str, List[int]] = {}
+        for idx, group in enumerate(graph.groups):
+            members.setdefault(group, []).append(idx)
+        for gidx, (group, idxs) in enumerate(members.items()):
+            lines.append(f"  subgraph P{gidx}[\"{group}\"]")
+            for idx in idxs:
+                lines.append(f"    N{idx}[\"{graph.nodes[idx]}\"]")
+            lines.append("  end")
+    else:
+        for idx, label in enumerate(graph.nodes):
+            lines.append(f"  N{idx}[\"{label}\"]")
+    for a, b in graph.edges:
+        lines.append(f"  N{a} --> N{b}")
+    lines.append("```\n")
+    if cycles:
+        lines.append("## Import cycles\n")
+        for cycle in cycles:
+            lines.append("- " + ", ".join(f"`{label}`" for label in cycle))
+        lines.append("")
+    return "\n".join(lines)
+
+
+def generate_dependency_dot(graph: DependencyGraph, subgraphs: bool = False) -> str:
+    lines = ["digraph dependencies {", "  rankdir=LR;", "  node [shape=box];"]
+    if subgraphs and graph.level == "module":
+        members: Dict[str, List[int]] = {}
+        for idx, group in enumerate(graph.groups):
+            members.setdefault(group, []).append(idx)
+        for gidx, (group, idxs) in enumerate(members.items()):
+            lines.append(f"  subgraph cluster_{gidx} {{")
+            lines.append(f"    label={json.dumps(group, ensure_ascii=False)};")
+            for idx in idxs:
+                lines.append(f"    n{idx} [label={json.dumps(graph.nodes[idx], ensure_ascii=False)}];")
+            lines.append("  }")
+    else:
+        for idx, label in enumerate(graph.nodes):
+            lines.append(f"  n{idx} [label={json.dumps(label, ensure_ascii=False)}];")
+    for a, b in graph.edges:
+        lines.append(f"  n{a} -> n{b};")
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+
+def generate_dependency_json(graph: DependencyGraph, cycles: List[List[str]]) -> str:
+    data = {
+        "level": graph.level,
+        "nodes": [{"id": label, "package": group} for label, group in zip(graph.nodes, graph.groups)],
+        "edges": [[graph.nodes[a], graph.nodes[b]] for a, b in graph.edges],
+        "cycles": cycles,
+    }
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+
+def write_dependency_graph(
+    modules: List[ModuleDoc],
+    import_edges: List[Tuple[Path, Path]],
+    root: Path,
+    output_dir: Path,
+    writer: OutputWriter,
+    options: GraphOptions,
+    stats: Optional[RunStats] = None,
+) -> None:
+    graph = build_dependency_graph(modules, import_edges, root, options.level)
+    cycles = import_cycles(graph)
+    if stats is not None:
+        stats.count("graph_nodes", len(graph.nodes))
+        stats.count("graph_edges", len(graph.edges))
+        stats.count("import_cycles", len(cycles))
+    for fmt in options.formats:
+        if fmt == "mermaid":
+            content = generate_dependency_mermaid(graph, options.subgraphs, cycles)
+        elif fmt == "dot":
+            content = generate_dependency_dot(graph, options.subgraphs)
+        else:
+            content = generate_dependency_json(graph, cycles)
+        writer.write(output_dir / GRAPH_FORMAT_FILES[fmt], content)
+
+
+# --- Search index ---
+
+# Prebuilt symbol index written next to the docs: every item's name, its camelCase/snake_case
+# parts and its description words map to item ids. Item ids follow the lowercased names, so
+# name-prefix matches are one contiguous id range and any result set ranks by sorting its ids.
+# Terms are kept sorted for prefix lookups by bisection, name trigrams answer substring
+# queries, and posting lists are delta-encoded.
+SEARCH_INDEX_FILE = "search-index.json"
+SEARCH_INDEX_VERSION = 1
+SEARCH_WORD = LazyPattern(r"[A-Za-z0-9]+")
+SEARCH_NAME_PART = LazyPattern(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|[0-9]+")
+SEARCH_DESCRIPTION_WORD = LazyPattern(r"[a-z0-9]{3,}")
+
+
+def _search_terms(name: str, description: Optional[str]) -> Set[str]:
+    terms = {name.lower()}
+    for word in SEARCH_WORD.findall(name):
+        terms.add(word.lower())
+        terms.update(part.lower() for part in SEARCH_NAME_PART.findall(word))
+    if description:
+        terms.update(SEARCH_DESCRIPTION_WORD.findall(description.lower()))
+    return terms
+
+
+def _trigrams(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _delta_encode(ids: List[int]) -> List[int]:
+    return [b - a for a, b in zip([0] + ids, ids)]
+
+
+def build_search_index(modules: List[ModuleDoc], root: Path, split: bool) -> Dict[str, Any]:
+    module_rows: List[List[Any]] = []
+    entries: List[Tuple[str, str, int, ApiItem]] = []
+    for mod in sorted(modules, key=lambda m: m.file_path.as_posix()):
+        page = module_page_path(mod, root).as_posix() if split else "API_FULL.md"
+        module_rows.append([mod.file_path.relative_to(root).as_posix(), mod.language, page])
+        entries.extend((item.name.lower(), item.name, len(module_rows) - 1, item) for item in mod.items)
+    entries.sort(key=lambda e: (e[0], e[1], e[2], e[3].line_number))
+    items: List[List[Any]] = []
+    postings: Dict[str, List[int]] = {}
+    trigrams: Dict[str, List[int]] = {}
+    for item_id, (lowered, name, module_id, item) in enumerate(entries):
+        items.append([name, item.kind, module_id, item.line_number])
+        for term in _search_terms(name, item.description):
+            postings.setdefault(term, []).append(item_id)
+        for tri in _trigrams(lowered):
+            trigrams.setdefault(tri, []).append(item_id)
+    terms = sorted(postings)
+    return {
+        "version": SEARCH_INDEX_VERSION,
+        "modules": module_rows,
+        "items": items,
+        "terms": terms,
+        "postings": [_delta_encode(postings[t]) for t in terms],
+        "trigrams": {t: _delta_encode(ids) for t, ids in sorted(trigrams.items())},
+    }
+
+
+def write_search_index(modules: List[ModuleDoc], root: Path, path: Path, writer: OutputWriter, split: bool) -> None:
+    writer.write(path, json.dumps(build_search_index(modules, root, split), separators=(",", ":")))
+
+
+class SearchIndex:
+    # Query side of search-index.json. Results come in tiers, each ordered by name: names
+    # equal to or starting with the query, then names containing it, then items whose terms
+    # start with every word of the query. Lower tiers are only computed when needed.
+    def __init__(self, data: Dict[str, Any]) -> None:
+        if data.get("version") != SEARCH_INDEX_VERSION:
+            raise ValueError(f"unsupported search index version {data.get('version')!r}")
+        self.modules: List[List[Any]] = data["modules"]
+        self.items: List[List[Any]] = data["items"]
+        self.terms: List[str] = data["terms"]
+        self._postings: List[List[int]] = data["postings"]
+        self._trigrams: Dict[str, List[int]] = data["trigrams"]
+        self._names: Optional[List[str]] = None
+
+    @classmethod
+    def load(cls, path: Path) -> "SearchIndex":
+        with open(path, encoding="utf-8") as fh:
+            return cls(json.load(fh))
+
+    def _prefix_ids(self, prefix: str) -> Set[int]:
+        ids: Set[int] = set()
+        terms = self.terms
+        i = bisect_left(terms, prefix)
+        while i < len(terms) and terms[i].startswith(prefix):
+            ids.update(itertools.accumulate(self._postings[i]))
+            i += 1
+        return ids
+
+    def _name_prefix_ids(self, text: str, limit: int) -> List[int]:
+        if self._names is None:
+            self._names = [item[0].lower() for item in self.items]
+        lo = bisect_left(self._names, text)
+        hi = lo
+        while hi < len(self._names) and hi - lo < limit and self._names[hi].startswith(text):
+            hi += 1
+        return list(range(lo, hi))
+
+    def _substring_ids(self, text: str) -> Set[int]:
+        ids: Optional[Set[int]] = None
+        for tri in _trigrams(text):
+            found = set(itertools.accumulate(self._trigrams.get(tri, [])))
+            ids = found if ids is None else ids & found
+            if not ids:
+                return set()
+        return {i for i in ids or () if text in self.items[i][0].lower()}
+
+    def _term_ids(self, words: List[str]) -> Set[int]:
+        ids: Set[int] = set()
+        for n, word in enumerate(words):
+            found = self._prefix_ids(word)
+            ids = found if n == 0 else ids & found
+            if not ids:
+                break
+        return ids
+
+    def search(self, query: str, limit: int = 20) -> List[Dict[str, Any]]:
+        text = query.strip().lower()
+        if not text or limit <= 0:
+            return []
+        ranked = self._name_prefix_ids(text, limit)
+        seen = set(ranked)
+        tiers: List[Callable[[], Set[int]]] = [
+            lambda: self._substring_ids(text) if len(text) >= 3 else set(),
+            lambda: self._term_ids([w.lower() for w in SEARCH_WORD.findall(text)]),
+        ]
+        for tier in tiers:
+            if len(ranked) >= limit:
+                break
+            ids = tier() - seen
+            ranked.extend(sorted(ids)[:limit - len(ranked)])
+            seen.update(ids)
+        hits: List[Dict[str, Any]] = []
+        for item_id in ranked:
+            name, kind, module_id, line = self.items[item_id]
+            module, language, page = self.modules[module_id]
+            hits.append({"name": name, "kind": kind, "module": module, "language": language, "line": line, "page": page})
+        return hits
+
+
+def search_cli(index_path: Path, query: str, limit: int) -> int:
+    try:
+        index = SearchIndex.load(index_path)
+    except (OSError, ValueError) as exc:
+        print(f"Cannot load search index {index_path}: {exc}", file=sys.stderr)
+        return 1
+    hits = index.search(query, limit)
+    for hit in hits:
+        print(f"{hit['kind']:<10} {hit['name']:<40} {hit['module']}:{hit['line']}  ({hit['page']})")
+    return 0 if hits else 1
+
+
+# --- Library API ---
+
+def _config_csv(value: Any) -> str:
+    # Config values given either as "a,b" or as ["a", "b"]
+    if isinstance(value, (list, tuple)):
+        return ",".join(value)
+    return value or ""
+
+
+def resolve_language_names(value: str, registry: LanguageRegistry = LANGUAGES) -> Set[str]:
+    # Comma-separated names or aliases -> backend names; empty means every language. Installed
+    # plugins are only looked up when they could be selected.
+    requested = [l.strip().lower() for l in value.split(",") if l.strip()]
+    if not requested or any(registry.canonical(l) is None for l in requested):
+        registry.load_entry_points()
+    unknown = [l for l in requested if registry.canonical(l) is None]
+    if unknown:
+        raise ValueError(f"Unknown languages: {', '.join(unknown)} (available: {', '.join(sorted(registry.aliases))})")
+    return {registry.canonical(l) for l in requested}
+
+
+class DocGenerator:
+    # In-process documentation session for one source tree, for callers that document many
+    # trees (or one tree repeatedly) without starting a process per run. Discovered files,
+    # extraction results, resolved import edges, rendered pages and the extraction cache stay
+    # in memory between calls; compiled patterns and loaded built-in backends are shared by
+    # every session in the process, while "language_backends" only apply to this session's
+    # `registry`. `config` takes the docsgen.json keys plus "format" and
+    # "cache_dir" (relative to `root`, None disables the cache and keeps the quarantine in
+    # memory). Call scan() once, update() with edited, added or deleted paths afterwards, and
+    # render() to write what changed; `failures` holds the files that could not be extracted.
+    # modules() are linked by link_reexports unless "link_reexports" is false.
+    def __init__(self, root: Path, output_dir: Path, config: Optional[Dict[str, Any]] = None) -> None:
+        config = config or {}
+        self.root = Path(root).resolve()
+        self.output_dir = Path(output_dir).resolve()
+        self.fmt = config.get("format", "both")
+        if self.fmt not in OUTPUT_FORMATS:
+            raise ValueError(f"Unknown format {self.fmt!r}; choose from {', '.join(OUTPUT_FORMATS)}")
+        self.registry = LANGUAGES.copy()
+        self.registry.load_config(config.get("language_backends") or {})
+        self.include: List[str] = list(config.get("include") or [])
+        self.exclude: List[str] = list(config.get("exclude") or [])
+        self.languages = resolve_language_names(_config_csv(config.get("languages")), self.registry)
+        self.gitignore = bool(config.get("gitignore", False))
+        self.max_file_size = int(config.get("max_file_size", DEFAULT_MAX_FILE_SIZE))
+        self.graph = GraphOptions(
+            level=config.get("graph_level", "auto"),
+            formats=parse_graph_formats(_config_csv(config.get("graph_format")) or "mermaid"),
+            subgraphs=bool(config.get("graph_subgraphs", False)),
+        )
+        jobs = int(config.get("jobs", 1))
+        self.jobs = jobs if jobs > 0 else os.cpu_count() or 1
+        self.file_timeout = float(config.get("file_timeout", 0))
+        self.link_reexports = bool(config.get("link_reexports", True))
+        cache_dir = config.get("cache_dir", CACHE_DIR_NAME)
+        self.cache = ExtractionCache(self.root / cache_dir, self.root) if cache_dir else None
+        self.quarantine = Quarantine(
+            self.root / cache_dir / Quarantine.FILE_NAME if cache_dir else None, self.root, self.file_timeout, self.registry
+        )
+        self.files: List[Path] = []
+        self.resolver = ImportResolver([], self.root, self.registry)
+        # Documented modules only, with their resolved import targets and rendered pages
+        self.results: Dict[Path, FileExtraction] = {}
+        self.edges: Dict[Path, List[Path]] = {}
+        self.pages: Dict[Path, str] = {}
+        # Files that failed or are quarantined, with why (FileExtraction.error)
+        self.failures: Dict[Path, FileExtraction] = {}
+        # Modules whose pages the next render() writes (None: all, and orphans are pruned) and
+        # modules whose pages it deletes
+        self._dirty: Optional[Set[Path]] = None
+        self._dropped: Set[Path] = set()
+        # ModuleDoc.link_key of the linked modules as of the last render()
+        self._links: Dict[Path, str] = {}
+
+    def _discover(self, dirs_out: Optional[List[Path]] = None) -> List[Path]:
+        files = discover_source_files(
+            self.root,
+            include=self.include,
+            exclude=self.exclude,
+            dirs_out=dirs_out,
+            gitignore=self.gitignore,
+            registry=self.registry,
+        )
+        if self.languages:
+            files = [f for f in files if self.registry.language_for(f) in self.languages]
+        return files
+
+    def _set_files(self, files: List[Path]) -> None:
+        self.files = files
+        self.resolver = ImportResolver(files, self.root, self.registry)
+
+    def _relink(self, paths) -> None:
+        for fp in paths:
+            res = self.results[fp]
+            self.edges[fp] = self.resolver.resolve_all(fp, res.imports)
+
+    def _refresh(self, changed: Set[Path], removed: Set[Path]) -> None:
+        # Re-extracts `changed` files of the current file list and forgets `removed` ones
+        relink_all = bool(removed) or any(fp not in self.results for fp in changed)
+        for fp in removed:
+            self.pages.pop(fp, None)
+            self.edges.pop(fp, None)
+            if self.results.pop(fp, None) is not None:
+                self._dropped.add(fp)
+            self.failures.pop(fp, None)
+        paths = sorted(changed)
+        for fp, res in zip(paths, self._extract(paths)):
+            self.pages.pop(fp, None)
+            self.failures.pop(fp, None)
+            if res is not None and res.error is not None:
+                self.failures[fp] = res
+            if res is None or not res.items:
+                self.edges.pop(fp, None)
+                if self.results.pop(fp, None) is not None:
+                    self._dropped.add(fp)
+                continue
+            self.results[fp] = res
+            self._dropped.discard(fp)
+        self.quarantine.save()
+        # New or vanished files can change what other modules' specifiers resolve to
+        self._relink(self.results if relink_all else [fp for fp in changed if fp in self.results])
+        if self._dirty is not None:
+            self._dirty.update(changed)
+
+    def _extract(self, files: List[Path]) -> List[Optional[FileExtraction]]:
+        return extract_files(
+            files, self.jobs, self.cache, self.max_file_size, self.file_timeout, self.quarantine, self.registry
+        )
+
+    def modules(self) -> List[ModuleDoc]:
+        modules: List[ModuleDoc] = []
+        reexports: List[List[Tuple[int, str, str, str]]] = []
+        for fp in self.files:
+            res = self.results.get(fp)
+            if res is not None:
+                modules.append(ModuleDoc(res.language, fp, res.items))
+                reexports.append(res.reexports)
+        if self.link_reexports:
+            modules = link_reexports(modules, reexports, self.resolver)
+        return modules
+
+    def import_edges(self) -> List[Tuple[Path, Path]]:
+        return [(fp, target) for fp in self.files for target in self.edges.get(fp, ())]
+
+    def scan(self) -> List[ModuleDoc]:
+        # Full discovery and extraction. Unchanged files are cache hits, and their rendered
+        # pages are kept, when the session has scanned before.
+        files = self._discover()
+        self._set_files(files)
+        previous = self.results
+        self.results = {}
+        self.failures = {}
+        for result in self._extract(files):
+            if result is None:
+                continue
+            if result.items:
+                self.results[result.file_path] = result
+            elif result.error is not None:
+                self.failures[result.file_path] = result
+        self.quarantine.save()
+        if self.cache is not None:
+            self.cache.evict_missing()
+            self.cache.save()
+        self.pages = {
+            fp: page for fp, page in self.pages.items()
+            if fp in self.results and fp in previous and previous[fp].digest == self.results[fp].digest
+        }
+        self.edges = {}
+        self._relink(self.results)
+        self._dirty = None
+        self._dropped = set()
+        return self.modules()
+
+    def update(self, paths: Iterable[Union[str, Path]]) -> List[ModuleDoc]:
+        # `paths` are absolute or relative to the root. Paths that do not pass the discovery
+        # filters are ignored, and deleted files drop their modules.
+        files, changed = merge_changed_files(
+            self.root, self.files, paths, self.include, self.exclude, self.languages, self.gitignore, self.registry
+        )
+        removed = set(self.files).difference(files)
+        if removed or len(files) != len(self.files):
+            self._set_files(files)
+        self._refresh(set(changed), removed)
+        return self.modules()
+
+    def render(self) -> OutputWriter:
+        # After scan() every page is written and orphaned pages are pruned; after update() only
+        # the pages of re-extracted modules are written and those of dropped modules deleted.
+        # The index, single file, graph and search index always cover every module.
+        modules = self.modules()
+        # An edit can change the links of modules it did not touch
+        links = {m.file_path: key for m in modules for key in (m.link_key(),) if key is not None}
+        for fp in set(links).union(self._links):
+            if links.get(fp) != self._links.get(fp):
+                self.pages.pop(fp, None)
+                if self._dirty is not None:
+                    self._dirty.add(fp)
+        self._links = links
+        writer = OutputWriter()
+        split_modules = None if self._dirty is None else [m for m in modules if m.file_path in self._dirty]
+        write_outputs(
+            modules,
+            self.import_edges(),
+            self.root,
+            self.output_dir,
+            self.fmt,
+            writer,
+            split_modules,
+            self.pages,
+            graph=self.graph,
+            registry=self.registry,
+        )
+        if self.fmt in ("split", "both"):
+            if self._dirty is None:
+                prune_split_docs(writer, self.files, self.root, self.output_dir, self.registry)
+            else:
+                split_base = self.output_dir / SPLIT_DIR_NAME
+                for fp in self._dropped:
+                    lang = self.registry.language_for(fp) or ""
+                    writer.delete(module_output_path(ModuleDoc(lang, fp, []), self.root, self.output_dir), split_base)
+        self._dirty = set()
+        self._dropped = set()
+        return writer
+
+
+# --- Watch mode ---
+
+def _stat_key(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class DocsWatcher(DocGenerator):
+    # Polls the discovered files and directories of a scanned session for changes. Touched
+    # files are re-extracted and only their split pages re-rendered; the index, single file
+    # and diagram are rebuilt from memoized module pages.
+    def __init__(
+        self, root: Path, output_dir: Path, config: Optional[Dict[str, Any]] = None, verbose: bool = False
+    ) -> None:
+        super().__init__(root, output_dir, config)
+        self.verbose = verbose
+        self.file_stats: Dict[Path, Tuple[int, int]] = {}
+        self.dir_stats: Dict[Path, Optional[Tuple[int, int]]] = {}
+
+    def _discover(self, dirs_out: Optional[List[Path]] = None) -> List[Path]:
+        dirs: List[Path] = []
+        files = super()._discover(dirs)
+        # A directory's mtime changes when entries are added, removed or renamed in it. Output
+        # directories are skipped so that our own writes do not trigger a rescan.
+        output_dir = self.output_dir
+        self.dir_stats = {d: _stat_key(d) for d in dirs if d != output_dir and output_dir not in d.parents}
+        return files
+
+    def scan(self) -> List[ModuleDoc]:
+        modules = super().scan()
+        self.file_stats = {}
+        for fp in self.files:
+            st = _stat_key(fp)
+            if st is not None:
+                self.file_stats[fp] = st
+        return modules
+
+    def poll(self) -> Tuple[Set[Path], Set[Path]]:
+        # Returns (changed or added, removed) files since the previous poll
+        structural = any(_stat_key(d) != st for d, st in self.dir_stats.items())
+        files = self._discover() if structural else self.files
+        stats: Dict[Path, Tuple[int, int]] = {}
+        changed: Set[Path] = set()
+        for fp in files:
+            st = _stat_key(fp)
+            if st is None:
+                continue
+            stats[fp] = st
+            if self.file_stats.get(fp) != st:
+                changed.add(fp)
+        removed = set(self.file_stats) - set(stats)
+        if structural or removed:
+            self._set_files([fp for fp in files if fp in stats])
+        self.file_stats = stats
+        return changed, removed
+
+    def run(self, interval: float = 0.5) -> int:
+        if self.verbose:
+            print(f"Watching {len(self.dir_stats)} directories (Ctrl-C to stop)")
+        try:
+            while True:
+                time.sleep(interval)
+                start = time.perf_counter()
+                changed, removed = self.poll()
+                if not changed and not removed:
+                    continue
+                self._refresh(changed, removed)
+                writer = self.render()
+                failed = [self.failures[fp] for fp in changed if fp in self.failures]
+                if failed:
+                    print("\n".join(failure_lines(failed, self.root)), file=sys.stderr)
+                if self.verbose:
+                    elapsed_ms = (time.perf_counter() - start) * 1000
+                    print(f"Updated {len(changed)} changed, {len(removed)} removed in {elapsed_ms:.1f} ms: {writer.summary()}")
+        except KeyboardInterrupt:
+            return 0
+
+
+# --- CLI and main ---
+
+def load_config(config_path: Optional[Path], root: Path) -> Dict:
+    # Raises ValueError for a config file that cannot be read or is not a JSON object
+    paths = [config_path] if config_path else [root / name for name in CONFIG_FILE_NAMES]
+    for p in paths:
+        if p and p.exists():
+            try:
+                data = json.loads(p.read_text(encoding="utf-8"))
+            except (OSError, ValueError) as exc:
+                raise ValueError(f"Cannot load config {p}: {exc}") from None
+            if not isinstance(data, dict):
+                raise ValueError(f"Cannot load config {p}: expected a JSON object")
+            return data
+    return {}
+
+
+def run(args: argparse.Namespace) -> int:
+    root: Path = args.root
+    try:
+        config = load_config(args.config, root)
+    except ValueError as exc:
+        print(exc, file=sys.stderr)
+        return 1
+
+    include = args.include or config.get("include") or []
+    exclude = args.exclude or config.get("exclude") or []
+    # The config's backends apply to this run only
+    registry = LANGUAGES.copy()
+    try:
+        registry.load_config(config.get("language_backends") or {})
+    except ValueError as exc:
+        print(f"Invalid config: {exc}", file=sys.stderr)
+        return 1
+    try:
+        languages = resolve_language_names(args.languages or _config_csv(config.get("languages")), registry)
+    except ValueError as exc:
+        print(exc, file=sys.stderr)
+        return 1
+    gitignore = args.gitignore or bool(config.get("gitignore", False))
+    max_file_size = args.max_file_size
+    if max_file_size is None:
+        max_file_size = int(config.get("max_file_size", DEFAULT_MAX_FILE_SIZE))
+    graph = GraphOptions(
+        level=args.graph_level or config.get("graph_level", "auto"),
+        formats=args.graph_format or parse_graph_formats(config.get("graph_format", "mermaid")),
+        subgraphs=args.graph_subgraphs or bool(config.get("graph_subgraphs", False)),
+    )
+    pipeline = args.pipeline or bool(config.get("pipeline", False))
+    jobs = args.jobs if args.jobs is not None else int(config.get("jobs", 1))
+    if jobs <= 0:
+        jobs = os.cpu_count() or 1
+    file_timeout = args.file_timeout
+    if file_timeout is None:
+        file_timeout = float(config.get("file_timeout", 0))
+    link = not args.no_link_reexports and bool(config.get("link_reexports", True))
+
+    if args.watch:
+        session = {
+            **config,
+            "format": args.format,
+            "include": include,
+            "exclude": exclude,
+            "languages": sorted(languages),
+            "gitignore": gitignore,
+            "max_file_size": max_file_size,
+            "graph_level": graph.level,
+            "graph_format": list(graph.formats),
+            "graph_subgraphs": graph.subgraphs,
+            "jobs": jobs,
+            "file_timeout": file_timeout,
+            "link_reexports": link,
+            "cache_dir": None if args.no_cache else args.cache_dir.resolve(),
+        }
+        watcher = DocsWatcher(root, args.output_dir, session, args.verbose)
+        watcher.scan()
+        writer = watcher.render()
+        if args.verbose:
+            print(f"Scanned {len(watcher.files)} files, {len(watcher.results)} documented: {writer.summary()}")
+        if watcher.failures:
+            print("\n".join(failure_lines(watcher.failures.values(), root)), file=sys.stderr)
+        return watcher.run(args.watch_interval)
+    cache = None if args.no_cache else ExtractionCache(args.cache_dir, root)
+    quarantine = Quarantine(None if args.no_cache else args.cache_dir / Quarantine.FILE_NAME, root, file_timeout, registry)
+
+    # `--format ndjson --output-dir -` streams records to stdout as files are extracted;
+    # progress output then goes to stderr
+    stream = sys.stdout if args.format == "ndjson" and str(args.output_dir) == "-" else None
+    log = functools.partial(print, file=sys.stderr) if stream is not None else print
+
+    # --since / --changed-files-from: re-extract only the listed paths on top of the last run
+    manifest_path = args.cache_dir / MODULE_MANIFEST_NAME
+    manifest_options = ModuleManifest.options_key(
+        include, exclude, languages, gitignore, max_file_size, args.format, args.output_dir
+    )
+    manifest = None
+    if args.since is not None or args.changed_files_from is not None:
+        import subprocess
+
+        try:
+            if args.since is not None:
+                changed = git_changed_files(root, args.since)
+            else:
+                changed = read_changed_files(args.changed_files_from)
+        except (OSError, ValueError, subprocess.CalledProcessError) as exc:
+            detail = exc.stderr.decode("utf-8", "replace").strip() if isinstance(exc, subprocess.CalledProcessError) else exc
+            print(f"Cannot list changed files: {detail}", file=sys.stderr)
+            return 1
+        manifest = ModuleManifest.load(manifest_path, manifest_options, root)
+        if manifest is None:
+            log(f"No manifest from a previous run with these options in {args.cache_dir}; scanning the whole tree")
+        pipeline = False
+
+    stats = RunStats()
+    api_modules: List[ModuleDoc] = []
+    module_imports: List[List[str]] = []
+    module_reexports: List[List[Tuple[int, str, str, str]]] = []
+    output_dir: Path = args.output_dir
+    writer = OutputWriter()
+    # In --pipeline mode split pages are flushed by writer threads as modules complete
+    pages_pool = None
+    # With re-export linking, a page is only flushed early when the last run's manifest shows
+    # that its module had no links; every other page waits for link_reexports
+    unlinked_before: Set[Path] = set()
+    flushed: Set[Path] = set()
+    if pipeline and stream is None and args.format in ("split", "both"):
+        pages_pool = BoundedPool(args.pipeline_writers, args.pipeline_queue, "docsgen-write")
+        if link:
+            previous = ModuleManifest.load(manifest_path, manifest_options, root)
+            if previous is not None:
+                unlinked_before = {
+                    fp for fp, entry in previous.modules.items() if fp not in previous.links and not entry[3]
+                }
+
+    changed_files: Optional[List[Path]] = None
+    if manifest is not None:
+        with stats.phase("discover"):
+            files, changed_files = manifest.apply_changes(changed, include, exclude, languages, gitignore, registry)
+        stats.count("files_discovered", len(files))
+        stats.count("files_changed", len(changed_files))
+        if args.verbose:
+            log(f"Re-extracting {len(changed_files)} changed files, {len(files) - len(changed_files)} from the manifest")
+        with stats.phase("extract"):
+            fresh = extract_files(changed_files, jobs, cache, max_file_size, file_timeout, quarantine, registry)
+        results: Iterable[Optional[FileExtraction]] = manifest.iter_results(files, fresh)
+    elif pipeline:
+        # Discovery, reads, extraction and page writes overlap; per-stage timings are folded
+        # into one "pipeline" phase
+        files: List[Path] = []
+        walk = iter_source_files(root, include=include, exclude=exclude, gitignore=gitignore, registry=registry)
+        if languages:
+            walk = (f for f in walk if registry.language_for(f) in languages)
+
+        def discovered() -> Iterator[Path]:
+            for fp in iter_in_background(walk, args.pipeline_queue):
+                files.append(fp)
+                yield fp
+
+        results = iter_pipeline_extract(
+            discovered(),
+            jobs,
+            cache,
+            max_file_size,
+            args.pipeline_readers,
+            args.pipeline_queue,
+            file_timeout,
+            quarantine,
+            registry,
+        )
+    else:
+        with stats.phase("discover"):
+            files = discover_source_files(root, include=include, exclude=exclude, gitignore=gitignore, registry=registry)
+            if languages:
+                files = [f for f in files if registry.language_for(f) in languages]
+        stats.count("files_discovered", len(files))
+        if args.verbose:
+            log(f"Discovered {len(files)} files")
+        if stream is None:
+            with stats.phase("extract"):
+                results = extract_files(files, jobs, cache, max_file_size, file_timeout, quarantine, registry)
+        else:
+            results = iter_extract_files(files, jobs, cache, max_file_size, file_timeout, quarantine, registry)
+
+    if stream is not None:
+        stream.write(ndjson_header())
+    with stats.phase("pipeline") if pipeline else nullcontext():
+        for result in results:
+            if result is None:
+                continue
+            if changed_files is None or not result.unchanged:
+                stats.record_file(result)
+            if not result.items:
+                continue
+            mod = ModuleDoc(result.language, result.file_path, result.items)
+            api_modules.append(mod)
+            module_imports.append(result.imports)
+            module_reexports.append(result.reexports)
+            if stream is not None:
+                with stats.phase("write_ndjson"):
+                    stream.writelines(iter_ndjson_items(mod, root))
+                    stream.flush()
+            if pages_pool is not None and (not link or (mod.file_path in unlinked_before and not result.reexports)):
+                flushed.add(mod.file_path)
+                pages_pool.submit(write_module_page, writer, mod, root, output_dir, registry)
+        if pages_pool is not None:
+            pages_pool.close()
+    if pipeline:
+        stats.count("files_discovered", len(files))
+        if args.verbose:
+            log(f"Discovered {len(files)} files")
+
+    # Imports are resolved once every file is known
+    with stats.phase("resolver_index"):
+        resolver = ImportResolver(files, root, registry)
+    import_edges: List[Tuple[Path, Path]] = []
+    with stats.phase("resolve_imports"):
+        for mod, imports in zip(api_modules, module_imports):
+            for target in resolver.resolve_all(mod.file_path, imports):
+                import_edges.append((mod.file_path, target))
+    # Streamed records are already out, so --output-dir - is never linked
+    linked_modules = api_modules
+    if link and stream is None:
+        with stats.phase("link_reexports"):
+            linked_modules = link_reexports(api_modules, module_reexports, resolver)
+
+    if args.verbose and stats.counters.get("files_skipped"):
+        reasons = ", ".join(f"{k.split(':', 1)[1]}: {v}" for k, v in sorted(stats.counters.items()) if k.startswith("files_skipped:"))
+        log(f"Skipped {stats.counters['files_skipped']} files ({reasons})")
+
+    if stats.failures:
+        print("\n".join(failure_lines(stats.failures, root)), file=sys.stderr)
+    quarantine.save()
+
+    if cache is not None:
+        with stats.phase("cache_save"):
+            cache.evict_missing()
+            cache.save()
+        stats.count("cache_hits", cache.hits)
+        stats.count("cache_misses", cache.misses)
+        stats.count("cache_evicted", cache.evicted)
+        if args.verbose:
+            log(f"Extraction cache: {cache.hits} hits, {cache.misses} misses, {cache.evicted} evicted")
+
+    if stream is not None:
+        with stats.phase("write_ndjson"):
+            stream.writelines(iter_ndjson_edges(api_modules, import_edges, root))
+            stream.flush()
+    else:
+        split_modules = None
+        if pages_pool is not None:
+            # Held-back pages, and flushed pages whose module gained links after all
+            split_modules = [m for m in linked_modules if m.file_path not in flushed or m.link_key() is not None]
+        elif changed_files is not None:
+            # Only the pages of re-extracted modules, and of modules whose links changed, are
+            # rendered again
+            changed_set = set(changed_files)
+            split_modules = [
+                m for m in linked_modules
+                if m.file_path in changed_set or m.link_key() != manifest.links.get(m.file_path)
+            ]
+        write_outputs(
+            linked_modules,
+            import_edges,
+            root,
+            output_dir,
+            args.format,
+            writer,
+            split_modules,
+            stats=stats,
+            graph=graph,
+            registry=registry,
+        )
+        if args.format in ("split", "both"):
+            with stats.phase("prune"):
+                prune_split_docs(writer, files if changed_files is None else changed_files, root, output_dir, registry)
+        stats.count("files_written", writer.written)
+        stats.count("files_unchanged", writer.unchanged)
+        stats.count("files_deleted", writer.deleted)
+        if args.verbose:
+            log(f"Wrote docs to {output_dir}: {writer.summary()}")
+
+    with stats.phase("manifest_save"):
+        ModuleManifest.save(
+            manifest_path, manifest_options, files, api_modules, module_imports, root, module_reexports, linked_modules
+        )
 
     if args.verbose:
-        print(f"Wrote docs to {output_dir}")
+        log("\n".join(stats.summary_lines(root, args.slowest)))
+    if args.stats_json:
+        args.stats_json.parent.mkdir(parents=True, exist_ok=True)
+        data = stats.to_dict(root, args.slowest)
+        data["jobs"] = jobs
+        args.stats_json.write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
     return 0
 
 
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Generate API documentation for the repository.")
+    parser.add_argument("--root", type=Path, default=REPO_ROOT, help="Source tree to document (default: this repository)")
+    parser.add_argument(
+        "--output-dir", type=Path, help="Output directory (default: docs under --root; '-' streams ndjson to stdout; files are written whole at the end)"
+    )
+    parser.add_argument(
+        "--format",
+        choices=OUTPUT_FORMATS,
+        default="both",
+        help="Output format: markdown (single, split, both) or one record per API item (json, ndjson)",
+    )
+    parser.add_argument("--include", action="append", help="Regex to include paths (can be repeated)")
+    parser.add_argument("--exclude", action="append", help="Regex to exclude paths (can be repeated)")
+    parser.add_argument("--gitignore", action="store_true", help="Skip files and directories ignored by .gitignore files")
+    parser.add_argument("--languages", help="Comma-separated languages or aliases to scan, e.g. ts,js,py (default: all)")
+    parser.add_argument("--config", type=Path, help="Path to JSON config file")
+    parser.add_argument("--jobs", type=int, help="Worker processes for extraction (0 = all CPUs, default: 1)")
+    parser.add_argument(
+        "--max-file-size", type=int, help=f"Skip source files larger than this many bytes (0 = no limit, default: {DEFAULT_MAX_FILE_SIZE})"
+    )
+    parser.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="Overlap discovery, file reads, extraction and split page writes through bounded queues",
+    )
+    parser.add_argument(
+        "--pipeline-readers", type=int, default=DEFAULT_PIPELINE_READERS, help=f"Reader threads in --pipeline mode (default: {DEFAULT_PIPELINE_READERS})"
+    )
+    parser.add_argument(
+        "--pipeline-writers", type=int, default=DEFAULT_PIPELINE_WRITERS, help=f"Page writer threads in --pipeline mode (default: {DEFAULT_PIPELINE_WRITERS})"
+    )
+    parser.add_argument(
+        "--pipeline-queue",
+        type=int,
+        default=DEFAULT_PIPELINE_QUEUE,
+        help=f"Files in flight between two --pipeline stages (default: {DEFAULT_PIPELINE_QUEUE})",
+    )
+    parser.add_argument("--cache-dir", type=Path, help="Extraction cache directory (default: .docsgen-cache under --root)")
+    parser.add_argument("--no-cache", action="store_true", help="Disable the extraction cache and the quarantine list")
+    parser.add_argument(
+        "--file-timeout",
+        type=float,
+        metavar="SECONDS",
+        help="Extract each file in a worker process that is killed after this many seconds; "
+        "such files are quarantined until they change (0 = no limit, the default)",
+    )
+    parser.add_argument(
+        "--no-link-reexports",
+        action="store_true",
+        help="Keep barrel re-exports as items instead of linking them to the modules that define the symbols",
+    )
+    parser.add_argument(
+        "--graph-level",
+        choices=["auto", "module", "package"],
+        help=f"Dependency graph nodes: modules, packages, or packages above {MERMAID_MAX_NODES} modules (default: auto)",
+    )
+    parser.add_argument(
+        "--graph-format", type=parse_graph_formats, help="Comma-separated dependency graph outputs: mermaid, dot, json (default: mermaid)"
+    )
+    parser.add_argument("--graph-subgraphs", action="store_true", help="Group module-level graph nodes into per-package subgraphs")
+    parser.add_argument(
+        "--since",
+        metavar="REV",
+        help="Re-extract only files changed since this git revision (plus untracked files); the rest comes from the last run's manifest",
+    )
+    parser.add_argument(
+        "--changed-files-from",
+        type=Path,
+        metavar="FILE",
+        help="Like --since, but read the changed paths from FILE (one per line or NUL-separated; '-' for stdin)",
+    )
+    parser.add_argument("--watch", action="store_true", help="Keep running and regenerate docs for changed files")
+    parser.add_argument("--watch-interval", type=float, default=0.5, help="Seconds between change polls in --watch mode")
+    parser.add_argument("--stats-json", type=Path, help="Write per-phase timings, per-language totals and slowest files as JSON")
+    parser.add_argument("--slowest", type=int, default=10, help="Number of slowest files to report (default: 10)")
+    parser.add_argument("--profile", type=Path, help="Run under cProfile and dump stats to this .pstats file (parent process only)")
+    parser.add_argument("--search", metavar="QUERY", help="Look up symbols in the prebuilt search index under --output-dir and exit")
+    parser.add_argument("--search-limit", type=int, default=20, help="Maximum --search results (default: 20)")
+    parser.add_argument("--verbose", action="store_true", help="Verbose logging")
+    args = parser.parse_args()
+    args.root = args.root.resolve()
+    if args.output_dir is None:
+        args.output_dir = args.root / OUTPUT_DIR_NAME
+    if args.cache_dir is None:
+        args.cache_dir = args.root / CACHE_DIR_NAME
+    if args.search is not None:
+        return search_cli(args.output_dir / SEARCH_INDEX_FILE, args.search, args.search_limit)
+    if args.file_timeout is not None and args.file_timeout < 0:
+        parser.error("--file-timeout must not be negative")
+    if min(args.pipeline_readers, args.pipeline_writers, args.pipeline_queue) < 1:
+        parser.error("--pipeline-readers, --pipeline-writers and --pipeline-queue must be at least 1")
+    if args.since is not None and args.changed_files_from is not None:
+        parser.error("--since and --changed-files-from are mutually exclusive")
+    if args.watch and (args.since is not None or args.changed_files_from is not None):
+        parser.error("--since and --changed-files-from cannot be combined with --watch")
+    if str(args.output_dir) == "-" and (args.format != "ndjson" or args.watch):
+        parser.error("--output-dir - is only supported with --format ndjson and without --watch")
+
+    if not args.profile:
+        return run(args)
+    import cProfile
+
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(run, args)
+    finally:
+        args.profile.parent.mkdir(parents=True, exist_ok=True)
+        profiler.dump_stats(str(args.profile))
+
+
 if __name__ == "__main__":
-    sys.exit(main())
\ No newline at end of file
+    sys.exit(main())
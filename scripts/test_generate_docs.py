@@ -0,0 +1,280 @@
+import re
+from pathlib import Path
+from typing import Dict, List
+
+import generate_docs as gd
+
+
+def write_tree(root: Path, files: Dict[str, str]) -> None:
+    for rel, text in files.items():
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+
+
+# --- Discovery ---
+
+def test_path_filter_keeps_group_patterns_separate():
+    # joined into one alternation, the second pattern's \1 would refer to the first's group
+    f = gd.PathFilter([r"(src)/\1/", r"(\w+)/\1\.ts$", r"(?P<pkg>gen)/(?P=pkg)/", r"\.test\.ts$"])
+    assert f.search("src/src/a.ts")
+    assert f.search("lib/lib.ts")
+    assert f.search("gen/gen/a.ts")
+    assert f.search("pkg/a.test.ts")
+    assert not f.search("src/lib/a.ts")
+    assert not f.search("lib/core.ts")
+
+
+def test_gitignore_negation_reincludes_files(tmp_path):
+    write_tree(tmp_path, {
+        ".gitignore": "*.ts\n!keep.ts\nbuild/\n",
+        "keep.ts": "export const a = 1;\n",
+        "drop.ts": "export const b = 1;\n",
+        "src/.gitignore": "!drop.ts\n",
+        "src/drop.ts": "export const c = 1;\n",
+        "src/other.ts": "export const d = 1;\n",
+        "build/keep.ts": "export const e = 1;\n",
+    })
+    found = {p.relative_to(tmp_path).as_posix() for p in gd.iter_source_files(tmp_path, gitignore=True)}
+    # a negation cannot re-include a file whose directory is ignored
+    assert found == {"keep.ts", "src/drop.ts"}
+
+
+# --- Sparse reads ---
+
+def test_sparse_read_keeps_long_doc_blocks_and_trailing_lines(tmp_path):
+    doc = "/**\n" + "".join(f" * Line {i}.\n" for i in range(gd.SPARSE_CONTEXT_BEFORE * 2)) + " */\n"
+    filler = "const pad = 0;\n" * (gd.SPARSE_READ_THRESHOLD // 15)
+    source = "/** Unrelated. */\n" + filler + doc + "export function last() {}\n" + "// tail\n" * 20 + "// end"
+    path = tmp_path / "big.ts"
+    path.write_text(source, encoding="utf-8")
+    read = gd.read_source(path, "typescript")
+    assert read.sparse
+    assert read.text.count("\n") == source.count("\n")
+    (item,) = [i for i in gd.extract_js_ts_exports(read.text) if i.name == "last"]
+    assert item.description.startswith("Line 0.") and ";" not in item.description
+    assert f"Line {gd.SPARSE_CONTEXT_BEFORE * 2 - 1}." in item.description
+
+
+def test_jsdoc_lookbehind_stops_at_elided_lines():
+    source = "/** Unrelated. */\n;\n;\n * Middle of a block.\n */\nexport function f() {}\n"
+    assert gd._extract_jsdoc_before(gd.SourceIndex(source), 6) is None
+
+
+# --- JS/React detection ---
+
+REACT_SOURCE = """\
+export function Typed(): JSX.Element {
+  return null;
+}
+export const Arrow = (): React.ReactElement => null;
+export const Annotated: React.FC<Props> = (props) => null;
+export function Rendered() {
+  return (
+    <div />
+  );
+}
+export function helper(): JSX.Element {
+  return null;
+}
+export function Plain() {
+  return 1;
+}
+"""
+
+
+def test_react_component_index_detects_return_types_and_jsx():
+    assert gd._react_component_index(REACT_SOURCE) == {"Typed", "Arrow", "Annotated", "Rendered"}
+
+
+def test_js_exports_mark_components():
+    kinds = {item.name: item.kind for item in gd.extract_js_ts_exports(REACT_SOURCE)}
+    assert kinds["Typed"] == "component"
+    assert kinds["Arrow"] == "component"
+    assert kinds["Rendered"] == "component"
+    assert kinds["helper"] == "function"
+    assert kinds["Plain"] == "function"
+
+
+
+def test_jsx_in_classes_and_anonymous_defaults_is_not_credited_to_the_const_above():
+    anonymous = "export const THEME = {\n  dark: true,\n};\nexport default function () {\n  return <div/>;\n}\n"
+    panel = (
+        "export const Config = {a: 1};\n"
+        "export class Panel extends React.Component {\n  render() {\n    return <div/>;\n  }\n}\n"
+    )
+    arrow = "export const Config = {a: 1};\nexport default () => <div/>;\n"
+    for source in (anonymous, panel, arrow):
+        assert gd._react_component_index(source) == set()
+    assert {i.name: i.kind for i in gd.extract_js_ts_exports(anonymous)}["THEME"] == "const"
+    assert {i.name: i.kind for i in gd.extract_js_ts_exports(panel)} == {"Config": "const", "Panel": "class"}
+
+
+# --- Re-export linking ---
+
+BARREL_TREE = {
+    "packages/ui/src/button.ts": "/** A button. */\nexport function Button() { return 1; }\nexport const SIZE = 3;\n",
+    "packages/ui/src/card.ts": "export class Card {}\nexport default function makeCard() {}\n",
+    "packages/ui/src/index.ts": "export * from './button';\nexport { Card, default as makeCard } from './card';\n",
+    "packages/core/src/a.ts": "export * from './b';\nexport function fromA() {}\n",
+    "packages/core/src/b.ts": "export * from './a';\nexport function fromB() {}\n",
+    "index.ts": "export * from './packages/ui/src/index';\nexport { fromA as aliasA } from './packages/core/src/a';\n",
+}
+
+
+def run_cli(monkeypatch, root: Path, *args: str) -> Dict:
+    stats = root.parent / "stats.json"
+    argv = ["generate_docs.py", "--root", str(root), "--output-dir", str(root.parent / "docs"), "--stats-json", str(stats)]
+    monkeypatch.setattr(gd.sys, "argv", [*argv, *args])
+    assert gd.main() == 0
+    return gd.json.loads(stats.read_text(encoding="utf-8"))["counters"]
+
+
+def snapshot(directory: Path) -> Dict[str, str]:
+    return {p.relative_to(directory).as_posix(): p.read_text(encoding="utf-8") for p in sorted(directory.rglob("*.md"))}
+
+
+def test_link_reexports_follows_chains_and_cycles(tmp_path):
+    write_tree(tmp_path, BARREL_TREE)
+    gen = gd.DocGenerator(tmp_path, tmp_path / "docs", {"cache_dir": None})
+    modules = {m.file_path.relative_to(tmp_path).as_posix(): m for m in gen.scan()}
+    button = modules["packages/ui/src/button.ts"]
+    assert [b.relative_to(tmp_path).as_posix() for b, _ in button.also_exported["Button"]] == [
+        "index.ts", "packages/ui/src/index.ts"
+    ]
+    # a.ts and b.ts re-export each other; the cycle resolves to each definition
+    assert modules["packages/core/src/a.ts"].also_exported["fromA"] == [
+        (tmp_path / "index.ts", "aliasA"), (tmp_path / "packages/core/src/b.ts", "fromA")
+    ]
+    assert modules["packages/core/src/b.ts"].also_exported["fromB"] == [(tmp_path / "packages/core/src/a.ts", "fromB")]
+    barrel = modules["packages/ui/src/index.ts"]
+    assert barrel.items == []
+    assert [name for name, _ in barrel.reexported] == ["Card", "makeCard", "*"]
+
+
+
+def test_default_exported_component_links_through_barrel(tmp_path):
+    write_tree(tmp_path, {
+        "src/Button.tsx": "export default function Button() {\n  return <button />;\n}\n",
+        "src/util.ts": "export default function util() {}\n",
+        "src/index.ts": "export { default as Button } from './Button';\nexport { default as util } from './util';\n",
+    })
+    gen = gd.DocGenerator(tmp_path, tmp_path / "docs", {"cache_dir": None})
+    modules = {m.file_path.relative_to(tmp_path).as_posix(): m for m in gen.scan()}
+    (button,) = modules["src/Button.tsx"].items
+    assert button.kind == "component" and button.default
+    assert modules["src/Button.tsx"].also_exported == {"Button": [(tmp_path / "src/index.ts", "Button")]}
+    assert modules["src/util.ts"].also_exported == {"util": [(tmp_path / "src/index.ts", "util")]}
+    assert modules["src/index.ts"].items == []
+
+
+def test_pipeline_after_phased_run_rewrites_nothing(tmp_path, monkeypatch):
+    root = tmp_path / "repo"
+    write_tree(root, BARREL_TREE)
+    assert run_cli(monkeypatch, root)["files_written"] > 0
+    phased = snapshot(tmp_path / "docs")
+    counters = run_cli(monkeypatch, root, "--pipeline")
+    assert counters["files_written"] == 0
+    assert snapshot(tmp_path / "docs") == phased
+    assert run_cli(monkeypatch, root, "--pipeline")["files_written"] == 0
+
+
+def test_pipeline_without_manifest_matches_phased_run(tmp_path, monkeypatch):
+    root = tmp_path / "repo"
+    write_tree(root, BARREL_TREE)
+    run_cli(monkeypatch, root, "--no-cache")
+    phased = snapshot(tmp_path / "docs")
+    (tmp_path / "docs").rename(tmp_path / "phased")
+    run_cli(monkeypatch, root, "--pipeline", "--cache-dir", str(tmp_path / "fresh-cache"))
+    assert snapshot(tmp_path / "docs") == phased
+
+
+# --- Changed-files mode ---
+
+def test_since_manifest_drops_unlisted_deletions(tmp_path, monkeypatch):
+    root = tmp_path / "repo"
+    write_tree(root, {"src/a.ts": "export function a() {}\n", "src/b.ts": "export function b() {}\n"})
+    run_cli(monkeypatch, root, "--format", "both")
+    (root / "src/b.ts").unlink()
+    (root / "src/a.ts").write_text("export function a2() {}\n", encoding="utf-8")
+    listed = tmp_path / "changed.txt"
+    listed.write_text("src/a.ts\n", encoding="utf-8")
+    counters = run_cli(monkeypatch, root, "--format", "both", "--changed-files-from", str(listed))
+    assert counters["files_changed"] == 1
+    docs = tmp_path / "docs"
+    index = (docs / "API.md").read_text(encoding="utf-8")
+    assert "src/b.ts" not in index and "src/a.ts" in index
+    assert not (docs / "api/typescript/src/b.md").exists()
+    assert "a2" in (docs / "api/typescript/src/a.md").read_text(encoding="utf-8")
+
+
+def test_since_manifest_replays_unchanged_modules(tmp_path, monkeypatch):
+    root = tmp_path / "repo"
+    write_tree(root, {"src/a.ts": "export function a() {}\n", "src/b.ts": "export function b() {}\n"})
+    run_cli(monkeypatch, root, "--format", "both")
+    full = (tmp_path / "docs/API_FULL.md").read_text(encoding="utf-8")
+    listed = tmp_path / "changed.txt"
+    listed.write_text("", encoding="utf-8")
+    counters = run_cli(monkeypatch, root, "--format", "both", "--changed-files-from", str(listed))
+    assert counters["files_changed"] == 0 and counters["files_written"] == 0
+    assert (tmp_path / "docs/API_FULL.md").read_text(encoding="utf-8") == full
+
+
+def test_since_manifest_is_keyed_by_format(tmp_path, monkeypatch):
+    root = tmp_path / "repo"
+    write_tree(root, {"src/a.ts": "export function a() {}\n"})
+    run_cli(monkeypatch, root, "--format", "single")
+    listed = tmp_path / "changed.txt"
+    listed.write_text("", encoding="utf-8")
+    counters = run_cli(monkeypatch, root, "--format", "split", "--changed-files-from", str(listed))
+    assert "files_changed" not in counters
+    assert (tmp_path / "docs/api/typescript/src/a.md").is_file()
+
+
+
+def test_since_manifest_is_keyed_by_output_dir(tmp_path, monkeypatch):
+    root = tmp_path / "repo"
+    write_tree(root, {"src/a.ts": "export function a() {}\n", "src/b.ts": "export function b() {}\n"})
+    run_cli(monkeypatch, root, "--format", "split")
+    listed = tmp_path / "changed.txt"
+    listed.write_text("src/a.ts\n", encoding="utf-8")
+    other = tmp_path / "other"
+    counters = run_cli(monkeypatch, root, "--format", "split", "--changed-files-from", str(listed), "--output-dir", str(other))
+    assert "files_changed" not in counters
+    assert snapshot(other) == snapshot(tmp_path / "docs")
+
+
+
+# --- Library API ---
+
+class KotlinBackend(gd.LanguageBackend):
+    name = "kotlin"
+    extensions = (".kt",)
+
+    def extract(self, index: gd.SourceIndex) -> List[gd.ApiItem]:
+        return [
+            gd.ApiItem("fun", m.group(1), m.group(0), index.line_number(m.start()))
+            for m in re.finditer(r"^fun (\w+)\(\)", index.source, re.MULTILINE)
+        ]
+
+
+def test_language_backends_stay_in_their_session(tmp_path):
+    write_tree(tmp_path, {"src/a.kt": "fun hello() {}\n", "src/b.ts": "export const b = 1;\n"})
+    backends = {"kotlin": {"backend": f"{__name__}:KotlinBackend", "extensions": [".kt"]}}
+    with_kotlin = gd.DocGenerator(tmp_path, tmp_path / "kt-docs", {"cache_dir": None, "language_backends": backends})
+    plain = gd.DocGenerator(tmp_path, tmp_path / "docs", {"cache_dir": None})
+    assert {m.language for m in with_kotlin.scan()} == {"kotlin", "typescript"}
+    assert {m.language for m in plain.scan()} == {"typescript"}
+    assert "kotlin" not in gd.LANGUAGES and ".kt" not in gd.LANGUAGES.extensions
+
+
+# --- Rendering ---
+
+def test_rendering_does_not_reopen_sources(tmp_path):
+    write_tree(tmp_path, {"src/a.ts": "export function first(x: number) {}\n"})
+    gen = gd.DocGenerator(tmp_path, tmp_path / "docs", {"format": "split", "cache_dir": None})
+    gen.scan()
+    (tmp_path / "src/a.ts").write_text("// replaced\n", encoding="utf-8")
+    gen.render()
+    page = (tmp_path / "docs/api/typescript/src/a.md").read_text(encoding="utf-8")
+    assert "export function first(x: number) {}" in page